@@ -121,3 +121,15 @@ def test(session):
     else:
         session.run("coverage", "run", "-m", "unittest", "discover", "-v")
         session.run("coverage", "report", "-m", "--fail-under=100")
+
+
+@nox.session
+def benchmark(session):
+    """
+    Benchmark the meta-interpreters on the paper instances.
+
+    Accepts the arguments of `python -m apperception_clingo.benchmark`, for example `-b <baseline>` to check for
+    regressions against a stored report.
+    """
+    session.install("-e", ".")
+    session.run("python", "-m", "apperception_clingo.benchmark", *session.posargs)
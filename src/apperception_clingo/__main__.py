@@ -2,23 +2,43 @@
 The main entry point for the application.
 """
 
-import json
+import math
+import multiprocessing
+import queue
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
 
-from clingo.application import Application, ApplicationOptions, clingo_main
+from clingo.application import Application, ApplicationOptions, Flag, clingo_main
 from clingo.control import Control
 from clingo.solving import Model
-from clingo.symbol import Symbol
+from clingo.symbol import Symbol, parse_term
 
-Frame = Dict[str, int]
-Interpretation = Dict[str, Dict[int, List[Symbol]]]
-SerializedInterpretation = Dict[str, Dict[int, List[str]]]
-Stat = Dict[str, Union[Frame, float, List[SerializedInterpretation]]]
+from .analysis import InstanceAnalysis
+from .bounds import LowerBound, lower_bound
+from .budget import POLL_INTERVAL, Budget, peak_memory_usage, reset_peak_memory, solve
+from .checkpoint import Checkpoint, read_checkpoint
+from .frames import FrameJobs, FrameSchedule, default_init_frame, strategies
+from .grounding import Frame, GroundCacheOptions, asp_files_dir, ground, meta_interpreters
+from .incremental import IncrementalGrounding
+from .interpretation import deserialize
+from .parallel import FrameTask, ModelMessage, init_worker, solve_frame
+from .profiling import GroundingProfiler
+from .racing import Racing, race_frame
+from .reporting import ModelReporter, model_outputs
+from .stats import SerializedInterpretation, Stat, Statistics, StatsLog, solver_statistics
+from .stream import open_stream, time_steps
+from .warmstart import add_sign_hints
+from .window import TimedInstance, Window, Windowing, read_instance, validate
 
-asp_files_dir = Path("src", "apperception_clingo", "asp")
+solver_options = {
+    "parallel-mode": "number of threads and parallel mode, e.g. 4 or 4,split",
+    "configuration": "solver configuration portfolio, e.g. crafty, trendy, handy or many",
+    "opt-strategy": "optimization strategy, e.g. bb or usc",
+}
 
 search_const_keys = [
     "gen_types",
@@ -31,6 +51,26 @@ search_const_keys = [
     "rule_body_size_max",
 ]
 
+NumberT = TypeVar("NumberT", int, float)
+
+
+def parse_number(
+    value: str, option: str, number_type: Callable[[str], NumberT], minimum: NumberT, strict: bool = False
+) -> NumberT:
+    """
+    Parse the value of a numeric command line option, which must be at least the given minimum, or above it if strict.
+    """
+    error_msg = (
+        f"Value of command line option --{option} must be a number {'above' if strict else 'of at least'} {minimum}."
+    )
+    try:
+        number = number_type(value)
+    except ValueError as e:
+        raise ValueError(error_msg) from e
+    if number < minimum or (strict and number == minimum):
+        raise ValueError(error_msg)
+    return number
+
 
 class ApperceptionApp(Application):
     """Impementation of Apperception Engine using the clingo python API."""
@@ -40,55 +80,93 @@ class ApperceptionApp(Application):
 
     def __init__(self) -> None:
         """Initializes the application"""
-        self._meta_interpreter = asp_files_dir / "meta-int" / "standard" / "meta.lp"
-        self._init_frame: Frame = {
-            "gen_types": 0,
-            "gen_objs": 0,
-            "gen_unary_preds": 0,
-            "gen_binary_preds": 0,
-            "causal_max": 1,
-            "static_max": 1,
-            "rule_body_size_max": 1,
-            "gen_vars": 2,
-        }
-        self._frame_deltas: Frame = {
-            "gen_objs": 2,
-            "gen_unary_preds": 1,
-            "gen_binary_preds": 1,
-            "causal_max": 1,
-            "static_max": 1,
-            "rule_body_size_max": 1,
-            "gen_vars": 1,
-        }
-        self._switch_frame_at_iter = 5
-        self._max_iterations = 20
+        self._meta_interpreter = "std"
+        # clingo options for solving frames, by option and meta-interpreter, where "" applies to all
+        self._solver_options: Dict[str, Dict[str, str]] = {option: {} for option in solver_options}
+        self._schedule = FrameSchedule(
+            default_init_frame.copy(),
+            {
+                "gen_objs": 2,
+                "gen_unary_preds": 1,
+                "gen_binary_preds": 1,
+                "causal_max": 1,
+                "static_max": 1,
+                "rule_body_size_max": 1,
+                "gen_vars": 1,
+            },
+        )
         self.upper_bound: Optional[int] = None
+        self._lower_bound = LowerBound(0, 0)
         self.opt_model: Sequence[Symbol] = []
+        self._warm_start = Flag(False)
+        self._profile_grounding = Flag(False)
+        self._analysis = InstanceAnalysis()
+        self._windowing = Windowing()
+        self._opt_index: Optional[int] = None
         self.start_time = time.time()
         self.stats: List[Stat] = []
-        self._json_path: Optional[Path] = None
+        self._log = StatsLog()
+        self._reporter = ModelReporter(self._record_model)
+        self._incremental: Optional[IncrementalGrounding] = None
+        self._frame_workers: Optional[int] = None
+        self._jobs = FrameJobs()
+        # state of the search restored from the stats log of an earlier run
+        self._checkpoint: Optional[Checkpoint] = None
+        self._ground_cache = GroundCacheOptions()
+        self._racing = Racing()
 
-    def _write_stats(self) -> None:
-        if self._json_path is not None:
-            with self._json_path.open("w", encoding="utf-8") as f:
-                json.dump(self.stats, f)
+    def _start_frame(self, frame: Frame) -> Stat:
+        """
+        Add and log the stats of a frame that is started now.
+        """
+        frame_start_time = time.time() - self.start_time
+        stat: Stat = {
+            "frame": frame,
+            "unified_interpretations": [],
+            "frame_start": frame_start_time,
+            "solver_args": self._solver_args(),  # type: ignore[dict-item]
+            "lower_bound": self._lower_bound.frame(frame),
+        }
+        self.stats.append(stat)
+        self._log.write(
+            "frame_start",
+            len(self.stats) - 1,
+            frame=frame,
+            time=frame_start_time,
+            solver_args=self._solver_args(),
+            lower_bound=stat["lower_bound"],
+        )
+        return stat
 
     def _parse_meta_interpreter(self, value: str) -> bool:
         meta_interpreter_name = value.strip()
-        if meta_interpreter_name == "std":
-            self._meta_interpreter = asp_files_dir / "meta-int" / "standard" / "meta.lp"
-        elif meta_interpreter_name == "bd":
-            self._meta_interpreter = asp_files_dir / "meta-int" / "body-decoupled" / "meta.lp"
-        elif meta_interpreter_name == "bd-reach":
-            self._meta_interpreter = asp_files_dir / "meta-int" / "body-decoupled" / "meta-reach.lp"
-        elif meta_interpreter_name == "bd-tight":
-            self._meta_interpreter = asp_files_dir / "meta-int" / "body-decoupled" / "meta-tight.lp"
-        elif meta_interpreter_name == "bd-tight-reach":
-            self._meta_interpreter = asp_files_dir / "meta-int" / "body-decoupled" / "meta-tight-reach.lp"
-        else:
+        if meta_interpreter_name not in meta_interpreters:
             raise ValueError(f"Invalid value for command line option --meta-interpreter/-m '{meta_interpreter_name}'")
+        self._meta_interpreter = meta_interpreter_name
         return True
 
+    def _parse_solver_option(self, option: str, value: str) -> bool:
+        interpreter, _, option_value = value.strip().rpartition(":")
+        if interpreter and interpreter not in meta_interpreters:
+            raise ValueError(f"Invalid meta-interpreter for command line option --frame-{option} '{interpreter}'")
+        try:
+            Control([f"--{option}={option_value}"])
+        except RuntimeError as e:
+            raise ValueError(f"Invalid value for command line option --frame-{option} '{option_value}'") from e
+        self._solver_options[option][interpreter] = option_value
+        return True
+
+    def _solver_args(self, interpreter: Optional[str] = None) -> List[str]:
+        """
+        Return the clingo options for solving frames with the given meta-interpreter, by default the selected one.
+        """
+        args = ["--heuristic=Domain"] if self._warm_start.flag else []
+        for option, values in self._solver_options.items():
+            value = values.get(interpreter or self._meta_interpreter, values.get(""))
+            if value is not None:
+                args.append(f"--{option}={value}")
+        return args
+
     def _parse_search_const(self, value: str) -> bool:
         split_val = [val.strip() for val in value.split("=")]
         error_msg = (
@@ -102,11 +180,91 @@ class ApperceptionApp(Application):
             int_val = int(split_val[1])
         except ValueError as e:
             raise ValueError(error_msg) from e
-        self._init_frame.update({const_name: int_val})
+        self._schedule.init_frame.update({const_name: int_val})
         return True
 
     def _parse_file_string(self, value: str) -> bool:
-        self._json_path = Path(value)
+        self._log.path = Path(value)
+        return True
+
+    def _parse_incremental(self, value: str) -> bool:
+        self._incremental = IncrementalGrounding(
+            parse_number(value, "incremental", int, 0), self._schedule.frame_deltas
+        )
+        return True
+
+    def _parse_frame_workers(self, value: str) -> bool:
+        self._frame_workers = parse_number(value, "frame-workers", int, 1)
+        return True
+
+    def _parse_frame_time_limit(self, value: str) -> bool:
+        self._jobs.budget = self._jobs.budget._replace(time=parse_number(value, "frame-time-limit", float, 0.0, True))
+        return True
+
+    def _parse_frame_conflict_limit(self, value: str) -> bool:
+        self._jobs.budget = self._jobs.budget._replace(conflicts=parse_number(value, "frame-conflict-limit", int, 1))
+        return True
+
+    def _parse_frame_memory_limit(self, value: str) -> bool:
+        self._jobs.budget = self._jobs.budget._replace(memory=parse_number(value, "frame-memory-limit", int, 1))
+        return True
+
+    def _parse_budget_growth(self, value: str) -> bool:
+        self._jobs.growth = parse_number(value, "budget-growth", float, 1.0, True)
+        return True
+
+    def _parse_ground_cache(self, value: str) -> bool:
+        self._ground_cache.directory = Path(value)
+        return True
+
+    def _parse_ground_cache_size(self, value: str) -> bool:
+        self._ground_cache.size = parse_number(value, "ground-cache-size", int, 0)
+        return True
+
+    def _parse_model_output(self, value: str) -> bool:
+        model_output = value.strip()
+        if model_output not in model_outputs:
+            raise ValueError(f"Invalid value for command line option --model-output '{model_output}'")
+        self._reporter.output = model_output
+        return True
+
+    def _parse_frame_strategy(self, value: str) -> bool:
+        strategy = value.strip()
+        if strategy not in strategies:
+            raise ValueError(f"Invalid value for command line option --frame-strategy '{strategy}'")
+        self._schedule.strategy = strategy
+        return True
+
+    def _parse_max_frames(self, value: str) -> bool:
+        self._schedule.max_frames = parse_number(value, "max-frames", int, 1)
+        return True
+
+    def _parse_time_window(self, value: str) -> bool:
+        self._windowing.size = parse_number(value, "time-window", int, 2)
+        return True
+
+    def _parse_resume(self, value: str) -> bool:
+        # the checkpoint is read before the log is opened, which may be the same file
+        try:
+            self._checkpoint = read_checkpoint(Path(value))
+        except OSError as e:
+            raise ValueError(f"Cannot read the stats log of command line option --resume '{value}'") from e
+        return True
+
+    def _parse_stream(self, value: str) -> bool:
+        self._windowing.stream = value
+        return True
+
+    def _parse_race(self, value: str) -> bool:
+        race = [name.strip() for name in value.split(",")]
+        for name in race:
+            if name not in meta_interpreters:
+                raise ValueError(f"Invalid meta-interpreter for command line option --race '{name}'")
+        self._racing.interpreters = race
+        return True
+
+    def _parse_race_table(self, value: str) -> bool:
+        self._racing.table_path = Path(value)
         return True
 
     def register_options(self, options: ApplicationOptions):
@@ -121,7 +279,11 @@ class ApperceptionApp(Application):
             "based on variable reachability\n"
             "bd-tight : body-decoupled meta-interpreter for tight programs\n"
             "bd-tight-reach : body-decoupled meta-interpreter for tight programs with "
-            "unfoundedness check optimization based on variable reachability.",
+            "unfoundedness check optimization based on variable reachability\n"
+            "lazy : meta-interpreter checking rules lazily with a propagator, which cannot be combined with "
+            "--ground-cache. Rules are only checked once all of them are chosen, so proving that a frame has no "
+            "unified interpretation tries every choice of rules, which is much slower than with the other "
+            "meta-interpreters.",
             self._parse_meta_interpreter,
         )
         options.add(
@@ -150,122 +312,622 @@ class ApperceptionApp(Application):
             multi=True,
         )
         options.add(
-            group, "json-log-file,j", "Save information about solving in given json file.", self._parse_file_string
+            group,
+            "json-log-file,j",
+            "Log information about solving to the given file in JSON Lines format, with one record per event. The "
+            "nested stats can be rebuilt with: python -m apperception_clingo.stats <file>",
+            self._parse_file_string,
+        )
+        options.add(
+            group,
+            "resume",
+            "Resume the search from the JSON Lines log of an earlier run. Frames whose solving ended are not searched "
+            "again, and with --budget-growth interrupted frames are searched again with a grown budget. The best "
+            "unified interpretation bounds the cost and is used for warm starting. The log may also be the one "
+            "written by this run, it is only replaced once the records of the earlier run are copied.",
+            self._parse_resume,
+        )
+        options.add(
+            group,
+            "incremental",
+            "Solve frames incrementally on one long-lived control, where the frame constants are turned into "
+            "externals. The domains are grounded ahead by the given number of frame increments, and the control is "
+            "only reground once a frame exceeds this ceiling.",
+            self._parse_incremental,
+        )
+        options.add(
+            group,
+            "frame-workers",
+            "Solve up to the given number of frames concurrently in worker processes. The cost of the best unified "
+            "interpretation found is shared between the workers, and tightens the optimization bound of each.",
+            self._parse_frame_workers,
+        )
+        options.add(
+            group,
+            "race",
+            "Race the given comma-separated meta-interpreters on each frame in separate processes, e.g. std,bd-tight. "
+            "The result of the first to search the frame completely is kept and the others are stopped. The winners "
+            "are recorded by the number of objects, variables and the maximum rule body size of the frame, and a "
+            "frame similar to ones raced before is solved by the meta-interpreter that won most of their races.",
+            self._parse_race,
+        )
+        options.add(
+            group,
+            "race-table",
+            "Read and update the winners of races in the given JSON file, so that they carry over to later runs.",
+            self._parse_race_table,
+        )
+        options.add(
+            group,
+            "frame-time-limit",
+            "Interrupt solving of a frame after the given number of seconds, and continue with the next frame.",
+            self._parse_frame_time_limit,
+        )
+        options.add(
+            group,
+            "frame-conflict-limit",
+            "Interrupt solving of a frame after the given number of conflicts, and continue with the next frame.",
+            self._parse_frame_conflict_limit,
+        )
+        options.add(
+            group,
+            "frame-memory-limit",
+            "Interrupt solving of a frame once the resident memory of the solving process exceeds the given number "
+            "of MB, and continue with the next frame. Memory is only checked while solving, not while grounding.",
+            self._parse_frame_memory_limit,
+        )
+        options.add(
+            group,
+            "budget-growth",
+            "Once all frames have been searched, search the interrupted frames again with their limits multiplied "
+            "by the given factor above 1, until no frame is interrupted. With --frame-workers, this waits until all "
+            "frames being searched are done.",
+            self._parse_budget_growth,
+        )
+        options.add(
+            group,
+            "frame-strategy",
+            "Set the order in which frames are searched. Frames dominated by a frame that was searched completely "
+            "are skipped. Valid values are:\n"
+            "round-robin : grow families of frames with increasing number of generated types in turns, which is the "
+            "original order and searches 204 frames\n"
+            "breadth-first : search frames in order of the number of increments needed to reach them\n"
+            "cheapest : search the frame with the least search time estimated from the frames searched so far\n"
+            "The breadth-first and cheapest strategies never run out of frames, so unless --max-frames is given, they "
+            "stop after as many frames as round-robin searches.",
+            self._parse_frame_strategy,
+        )
+        options.add(
+            group,
+            "max-frames",
+            "Stop after searching the given number of frames, not counting frames searched again with a grown "
+            "budget.",
+            self._parse_max_frames,
+        )
+        options.add(
+            group,
+            "time-window",
+            "Learn the theory on the given number of time steps at the start of the sequence, and validate it on "
+            "chunks of the same length over the whole sequence. A theory failing on a chunk is repaired by learning "
+            "on that chunk.",
+            self._parse_time_window,
+        )
+        options.add(
+            group,
+            "stream",
+            "Read the sensed and hidden atoms of the sequence from the given source as they arrive, where - is the "
+            "standard input and any other value the path of a Unix socket to listen on. Each line is a JSON object "
+            'like {"senses": "s(pred(on,1),obj(a))", "time": 3} or an ASP fact. The theory is validated on every '
+            "new time step, and learned again on the last --time-window time steps, or on all time steps, if it "
+            "fails or predicts a hidden atom incorrectly.",
+            self._parse_stream,
+        )
+        for option, description in solver_options.items():
+            options.add(
+                group,
+                f"frame-{option}",
+                f"Set the {description} for solving frames, for all meta-interpreters or, given as "
+                "<meta-interpreter>:<value>, for the given meta-interpreter only.",
+                partial(self._parse_solver_option, option),
+                multi=True,
+            )
+        options.add_flag(
+            group,
+            "warm-start",
+            "Warm start each frame with the best unified interpretation found so far, by preferring its atoms via "
+            "sign hints of the domain heuristic. Enables --heuristic=Domain for solving frames.",
+            self._warm_start,
+        )
+        options.add_flag(
+            group,
+            "fix-declared-types",
+            "Fix the types of the objects and predicates declared by the instance, and of undeclared objects whose "
+            "type follows from the sensed atoms, instead of letting the solver choose them. Shrinks the ground program "
+            "of instances with many objects.",
+            self._analysis.fix_declared_types,
+        )
+        options.add_flag(
+            group,
+            "break-instance-symmetries",
+            "Detect permutations of the objects and predicates of the instance that map its facts onto themselves, "
+            "and add lex-leader constraints so that only one of the interpretations they map onto each other is "
+            "searched.",
+            self._analysis.break_symmetries,
+        )
+        options.add_flag(
+            group,
+            "profile-grounding",
+            "Count the ground atoms and rules of each predicate of the program of every frame, and record them ranked "
+            "along with the encoding files defining the predicates in the stats of the frame.",
+            self._profile_grounding,
+        )
+        options.add(
+            group,
+            "model-output",
+            "Set which unified interpretations are printed. Unless all are printed, only the last model of a frame "
+            "is decoded and recorded once the frame is finished. Valid values are:\n"
+            "all : print every model as it is found\n"
+            "final-per-frame : print the last model of each frame\n"
+            "final-overall : print the best model once the search is over\n"
+            "none : print no models",
+            self._parse_model_output,
         )
+        options.add(
+            group,
+            "ground-cache",
+            "Cache the ground programs of frames in aspif form in the given directory. Frames whose instance, "
+            "encoding and constants match a cached program are loaded instead of grounded.",
+            self._parse_ground_cache,
+        )
+        options.add(
+            group,
+            "ground-cache-size",
+            "Limit the ground cache to the given number of MB by evicting the least recently used programs.",
+            self._parse_ground_cache_size,
+        )
+
+    def validate_options(self) -> bool:
+        if self._frame_workers is not None and self._incremental is not None:
+            raise ValueError("Command line options --frame-workers and --incremental cannot be combined.")
+        if self._racing.interpreters and (self._frame_workers is not None or self._incremental is not None):
+            raise ValueError("Command line option --race cannot be combined with --frame-workers or --incremental.")
+        if self._racing.table_path is not None and not self._racing.interpreters:
+            raise ValueError("Command line option --race-table requires --race.")
+        if self._profile_grounding.flag and (
+            self._frame_workers is not None
+            or self._racing.interpreters
+            or self._incremental is not None
+            or self._ground_cache.directory is not None
+        ):
+            raise ValueError(
+                "Command line option --profile-grounding cannot be combined with --frame-workers, --race, "
+                "--incremental or --ground-cache."
+            )
+        if self._ground_cache.directory is not None and self._incremental is not None:
+            raise ValueError("Command line options --ground-cache and --incremental cannot be combined.")
+        if self._ground_cache.directory is not None and "lazy" in (self._meta_interpreter, *self._racing.interpreters):
+            raise ValueError("Command line option --ground-cache cannot be used with the lazy meta-interpreter.")
+        if self._ground_cache.size is not None and self._ground_cache.directory is None:
+            raise ValueError("Command line option --ground-cache-size requires --ground-cache.")
+        if self._checkpoint is not None and self._windowing.enabled:
+            raise ValueError("Command line option --resume cannot be combined with --time-window or --stream.")
+        if self._analysis.break_symmetries.flag and self._windowing.enabled:
+            raise ValueError(
+                "Command line option --break-instance-symmetries cannot be combined with --time-window or --stream."
+            )
+        return True
 
     def on_model(self, model: Model):
         model_found_time = time.time()
         self.upper_bound = model.cost[0] - 1
-        opt_model = model.symbols(shown=True)
-        signatures = [
-            ("type", 1),
-            ("obj", 1),
-            ("var", 1),
-            ("pred", 2),
-            ("isa", 2),
-            ("xor", 2),
-            ("exist", 1),
-            ("rule_head", 2),
-            ("rule_body", 2),
-            ("init", 1),
-            ("num_incorrect", 1),
-        ]
-        sig_dict: Interpretation = {name: {arity: []} for name, arity in signatures}
-        for symb in opt_model:
-            for name, arity in signatures:
-                if symb.match(name, arity):
-                    sig_dict[name][arity].append(symb)
-        num_incorrect = sig_dict["num_incorrect"][1][0].arguments[0]
-        isa_dict = {isa.arguments[1]: isa.arguments[0] for isa in sig_dict["isa"][2]}
-        separator = " "
-        rules = []
-        for rule_head in sig_dict["rule_head"][2]:
-            rule_id = rule_head.arguments[0]
-            rule_head_str = str(rule_head.arguments[1])
-            rule_body = []
-            arrow = " ::- " if rule_id.match("causal", 1) else " :- "
-            rule = rule_head_str + arrow
-            for body in sig_dict["rule_body"][2]:
-                if body.arguments[0] == rule_id:
-                    rule_body.append(body)
-            rule += ", ".join([str(s.arguments[1]) for s in rule_body])
-            rules.append(rule)
-        print(
-            "-----------------------------------------------------------\n"
-            f"Found unified interpretation with cost {model.cost[0]}. "
-            f"Number of incorrectly predicted hidden states: {num_incorrect}."
-        )
-        print("Types:")
-        print(separator.join([str(s) for s in sig_dict["type"][1]]))
-        print("Objects:")
-        print(separator.join([f"{symb}:{isa_dict[symb]}" for symb in sig_dict["obj"][1]]))
-        print("Variables:")
-        print(separator.join([f"{symb}:{isa_dict[symb]}" for symb in sig_dict["var"][1]]))
-        print("Predicates:")
-        print(separator.join([f"{symb}:{isa_dict[symb]}" for symb in sig_dict["pred"][2]]))
-        print("Constraints:")
-        print(separator.join([str(s) for s in sig_dict["xor"][2]]))
-        print(separator.join([str(s) for s in sig_dict["exist"][1]]))
-        print("Initial State:")
-        print(separator.join([str(s.arguments[0]) for s in sig_dict["init"][1]]))
-        print("Rules:")
-        print("\n".join(rules))
-        print("----------------------------------------------------------")
-        # serialize model to file
-        serialized = {
-            name: {arity: [str(symb) for symb in symbs] for arity, symbs in arity2symb.items()}
-            for name, arity2symb in sig_dict.items()
-        }
-        serialized["rules"] = rules
-        serialized["cost"] = model.cost[0]
-        serialized["time"] = model_found_time - self.start_time
-        self.stats[-1]["unified_interpretations"].append(serialized)
-        self._write_stats()
+        self._opt_index = len(self.stats) - 1
+        # only copy the symbols here, decoding and printing happens on the main thread while the solver continues
+        self.opt_model = model.symbols(shown=True)
+        self._reporter.add((self.opt_model, model.cost[0], model_found_time - self.start_time, len(self.stats) - 1))
+
+    def _record_model(self, index: int, serialized: SerializedInterpretation) -> None:
+        self.stats[index]["unified_interpretations"].append(serialized)  # type: ignore[union-attr]
+        self._log.write("model", index, interpretation=serialized)
 
-    def run_engine(self, files: Sequence[str], frame: Frame):
+    def _frame_program(self, frame: Frame) -> str:
+        """
+        Return the program added to the encodings of the frame.
+        """
+        return self._analysis.frame_program(frame) + self._windowing.program
+
+    def run_engine(self, files: Sequence[str], frame: Frame, budget: Budget = Budget()):
         frame_cpy = frame.copy()
-        stat: Stat = {"frame": frame_cpy, "unified_interpretations": []}
-        self.stats.append(stat)
+        stat = self._start_frame(frame_cpy)
         bound_str = f",{self.upper_bound}" if self.upper_bound is not None else ""
-        ctl = Control(["--opt-mode=opt" + bound_str])
-        for f in files:
-            ctl.load(f)
-        const_str = ""
-        for const, val in frame.items():
-            const_str += f"#const {const} = {val}. [override]\n"
-        ctl.add(const_str)
-        ctl.ground()
+        reset_peak_memory()
+        profiler = GroundingProfiler() if self._profile_grounding.flag else None
+        if self._incremental is None:
+            ctl = ground(
+                files,
+                frame,
+                ["--opt-mode=opt" + bound_str] + self._solver_args(),
+                cache=self._ground_cache.cache,
+                program=self._frame_program(frame),
+                observer=profiler,
+            )
+        else:
+            args = ["--opt-mode=opt" + bound_str] + self._solver_args()
+            ctl = self._incremental.control(files, frame, args, self._frame_program)
+            ctl.configuration.solve.opt_mode = "opt" + bound_str  # type: ignore[union-attr]
         ground_end_time = time.time() - self.start_time
         stat["ground_end"] = ground_end_time
+        statistics: Statistics = {"ground_memory": peak_memory_usage()}
+        stat["statistics"] = statistics  # type: ignore[assignment]
+        reset_peak_memory()
         print(f"Grounding of frame finished at {ground_end_time:.4f}s")
-        self._write_stats()
-        ctl.solve(on_model=self.on_model)
+        profile = {}
+        if profiler is not None:
+            stat["grounding_profile"] = profile["grounding_profile"] = profiler.profile(ctl, files)
+            for row in profile["grounding_profile"][:5]:
+                defined = f" defined in {', '.join(row['files'])}" if row["files"] else ""
+                print(f"{row['predicate']}: {row['rules']} rules, {row['atoms']} atoms{defined}")
+        self._log.write("ground_end", len(self.stats) - 1, time=ground_end_time, statistics=statistics, **profile)
+        if self._warm_start.flag and self.opt_model:
+            hinted = add_sign_hints(ctl, self.opt_model, len(self.stats))
+            print(f"Warm starting frame with {hinted} atoms of the best unified interpretation")
+        bound = self.upper_bound
+        frame_bound = self._lower_bound.frame(frame)
+        status = solve(
+            ctl,
+            self.on_model,
+            budget,
+            cancel=lambda: self.upper_bound is not None and self.upper_bound < frame_bound,
+            on_poll=self._reporter.report,
+        )
+        if status == "cancelled":
+            print("Solving of frame stopped, the best cost meets the lower bound of the frame")
+            status = "complete"
         solve_end_time = time.time() - self.start_time
         stat["solve_end"] = solve_end_time
+        solve_statistics = {**solver_statistics(ctl), "solve_memory": peak_memory_usage()}
+        statistics.update(solve_statistics)
+        best_cost = self.upper_bound + 1 if self.upper_bound is not None and self.upper_bound != bound else None
+        self._record_status(
+            len(self.stats) - 1,
+            frame_cpy,
+            status=status,
+            best_cost=best_cost,
+            budget=budget,
+            statistics=solve_statistics,
+        )
         print(f"Solving of frame finished in {solve_end_time:.4f}s")
-        self._write_stats()
+
+    def _record_status(
+        self,
+        index: int,
+        frame: Frame,
+        *,
+        status: str,
+        best_cost: Optional[int],
+        budget: Budget,
+        statistics: Statistics,
+        interpreter: Optional[str] = None,
+    ) -> None:
+        """
+        Record the status of a solved frame, queueing it for another search if it was interrupted. The meta-interpreter
+        along with its solver arguments is recorded if the frame was raced.
+        """
+        self._reporter.finish(index)
+        stat = self.stats[index]
+        if interpreter is not None:
+            stat["interpreter"] = interpreter  # type: ignore[assignment]
+        if status == "complete":
+            status = "optimal" if best_cost is not None else "unsatisfiable"
+        elif status == "interrupted":
+            print(f"Solving of frame interrupted, best cost found: {best_cost}")
+            self._jobs.interrupted.append((frame, budget))
+        stat["status"] = status  # type: ignore[assignment]
+        stat["best_cost"] = best_cost  # type: ignore[assignment]
+        stat["budget"] = budget._asdict()
+        self._log.write(
+            "solve_end",
+            index,
+            time=stat["solve_end"],
+            status=status,
+            best_cost=best_cost,
+            budget=stat["budget"],
+            statistics=statistics,
+            **({} if interpreter is None else {"interpreter": interpreter, "solver_args": stat["solver_args"]}),
+        )
+        if self._jobs.scheduler is not None:
+            self._jobs.scheduler.incumbent = None if self.upper_bound is None else self.upper_bound + 1
+            self._jobs.scheduler.report(frame, status, stat["solve_end"] - stat["frame_start"])  # type: ignore[operator]
+
+    def _start_jobs(self) -> FrameJobs:
+        """
+        Start taking the frames of a new schedule, which skips the frames searched by the resumed run if any.
+        """
+        scheduler = self._schedule.scheduler()
+        scheduler.lower_bound = self._lower_bound
+        if self._checkpoint is not None:
+            self._checkpoint.restore(scheduler)
+        self._jobs.start(scheduler)
+        return self._jobs
+
+    def _submit_frame(
+        self, pool: ProcessPoolExecutor, files: Sequence[str], frame: Frame, budget: Budget
+    ) -> "Future[Any]":
+        print(f"Processing Frame:\n{frame}")
+        self._start_frame(frame)
+        hints = [str(symb) for symb in self.opt_model] if self._warm_start.flag else []
+        task = FrameTask(
+            len(self.stats) - 1,
+            files,
+            frame,
+            budget,
+            self._ground_cache.cache,
+            self._solver_args(),
+            hints,
+            self._frame_program(frame),
+        )
+        return pool.submit(solve_frame, task)
+
+    def _receive_model(self, message: ModelMessage) -> None:
+        index, symbols, cost, found_time = message
+        self.upper_bound = cost - 1
+        self._opt_index = index
+        self.opt_model = [parse_term(s) for s in symbols]
+        self._reporter.add((self.opt_model, cost, found_time, index))
+        self._reporter.report()
+
+    def _receive_models(self, models: "multiprocessing.Queue[ModelMessage]") -> None:
+        while True:
+            try:
+                message = models.get_nowait()
+            except queue.Empty:
+                return
+            self._receive_model(message)
+
+    def run_parallel(self, files: Sequence[str], workers: int) -> None:
+        """
+        Search the frames of the schedule with the given number of worker processes.
+        """
+        best_cost = multiprocessing.Value("d", math.inf if self.upper_bound is None else self.upper_bound + 1)
+        models: "multiprocessing.Queue[ModelMessage]" = multiprocessing.Queue()
+        jobs = self._start_jobs()
+        with ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(best_cost, models, self.start_time)
+        ) as pool:
+            pending: Dict["Future[Tuple[int, Dict[str, Any]]]", Tuple[Frame, Budget]] = {}
+            while True:
+                # interrupted frames are only searched again once all pending frames are done
+                for frame, budget in jobs.take(workers - len(pending), idle=not pending):
+                    pending[self._submit_frame(pool, files, frame, budget)] = (frame, budget)
+                if not pending:
+                    break
+                done, _ = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                self._receive_models(models)
+                for future in done:
+                    frame, budget = pending.pop(future)
+                    index, result = future.result()
+                    stat = self.stats[index]
+                    stat["ground_end"] = result["ground_end"]
+                    stat["solve_end"] = result["solve_end"]
+                    stat["statistics"] = result["statistics"]
+                    self._log.write("ground_end", index, time=result["ground_end"])
+                    self._record_status(
+                        index,
+                        frame,
+                        status=result["status"],
+                        best_cost=result["best_cost"],
+                        budget=budget,
+                        statistics=result["statistics"],
+                    )
+                    print(f"Solving of frame {stat['frame']} finished in {result['solve_end']:.4f}s")
+        self._receive_models(models)
+        # models whose message arrived after their frame finished
+        self._reporter.finish_all()
+
+    def run_race(self, files: Sequence[str], frame: Frame, budget: Budget) -> None:
+        """
+        Search the frame by racing the meta-interpreters, or with the one that won most races on similar frames.
+        """
+        base_files = [file for file in files if file != str(meta_interpreters[self._meta_interpreter])]
+        features, racers = self._racing.racers(frame)
+        if len(racers) < len(self._racing.interpreters):
+            print(f"Solving frame with meta-interpreter {racers[0]}, the winner of races on similar frames")
+        else:
+            print(f"Racing meta-interpreters {', '.join(racers)}")
+        stat = self._start_frame(frame)
+        index = len(self.stats) - 1
+        task = FrameTask(
+            index,
+            base_files,
+            frame,
+            budget,
+            self._ground_cache.cache,
+            hints=[str(symb) for symb in self.opt_model] if self._warm_start.flag else [],
+            program=self._frame_program(frame),
+        )
+        racer_args = {
+            racer: ([*base_files, str(meta_interpreters[racer])], self._solver_args(racer)) for racer in racers
+        }
+        name, result = race_frame(
+            task,
+            racer_args,
+            self._receive_model,
+            self.start_time,
+            None if self.upper_bound is None else self.upper_bound + 1,
+        )
+        stat["solver_args"] = racer_args[name][1]  # type: ignore[assignment]
+        stat["ground_end"] = result["ground_end"]
+        stat["solve_end"] = result["solve_end"]
+        stat["statistics"] = result["statistics"]
+        self._log.write("ground_end", index, time=result["ground_end"])
+        if len(racers) > 1 and result["status"] in ("optimal", "unsatisfiable"):
+            print(f"Meta-interpreter {name} won the race")
+            self._racing.table.record(features, name)
+        self._record_status(
+            index,
+            frame,
+            status=result["status"],
+            best_cost=result["best_cost"],
+            budget=budget,
+            statistics=result["statistics"],
+            interpreter=name,
+        )
+        print(f"Solving of frame finished in {result['solve_end']:.4f}s")
+
+    def _resume(self, checkpoint: Checkpoint) -> None:
+        """
+        Restore the stats, the best unified interpretation and the interrupted frames of an earlier run.
+        """
+        self.stats = checkpoint.stats
+        self._jobs.interrupted = list(checkpoint.interrupted)
+        finished = sum("status" in stat for stat in self.stats)
+        if checkpoint.incumbent is None:
+            print(f"Resumed search after {finished} frames, no unified interpretation found yet")
+            return
+        self._opt_index, interpretation = checkpoint.incumbent
+        cost: int = interpretation["cost"]
+        self.upper_bound = cost - 1
+        self.opt_model = deserialize(interpretation)
+        self._reporter.restore(interpretation)
+        print(f"Resumed search after {finished} frames, best cost found: {cost}")
+
+    def _search(self, files: Sequence[str]) -> None:
+        """
+        Search the frames of the schedule for the program of the files.
+        """
+        if self._frame_workers is not None:
+            self.run_parallel(files, self._frame_workers)
+        elif self._racing.interpreters:
+            for idx, (frame, budget) in enumerate(self._start_jobs()):
+                if idx > 0:
+                    print(f"Processing Frame:\n{frame}")
+                self.run_race(files, frame, budget)
+        else:
+            for idx, (frame, budget) in enumerate(self._start_jobs()):
+                if idx > 0:
+                    print(f"Processing Frame:\n{frame}")
+                self.run_engine(files, frame, budget)
+        if self._jobs.scheduler is not None and self._jobs.scheduler.optimal():
+            print("Search stopped, the best cost meets the lower bound")
+
+    def _opt_frame(self) -> Frame:
+        """
+        Return the frame the best theory was found in.
+        """
+        assert self._opt_index is not None
+        frame: Frame = self.stats[self._opt_index]["frame"]  # type: ignore[assignment]
+        return frame
+
+    def _validate(self, files: Sequence[str], instance: TimedInstance, chunks: Sequence[Window]) -> Optional[int]:
+        """
+        Validate the best theory chunk by chunk, and return the index of the first chunk it fails on.
+        """
+        frame = self._opt_frame()
+        state = None
+        for index, (start, end) in enumerate(chunks):
+            validation = validate(files, frame, instance, (start, end), self.opt_model, state=state)
+            if validation is None:
+                print(f"Theory fails on time steps {start} to {end}")
+                return index
+            print(
+                f"Theory validated on time steps {start} to {end}, "
+                f"number of incorrectly predicted hidden states: {validation.num_incorrect}"
+            )
+            state = validation.state
+        return None
+
+    def _learn(self, files: Sequence[str], instance: TimedInstance, window: Window) -> bool:
+        """
+        Search a theory on the window of the instance, and return whether one was found.
+        """
+        print(f"Learning theory on time steps {window[0]} to {window[1]}")
+        self._windowing.program = instance.program(window)
+        self._lower_bound = lower_bound([], self._windowing.program)
+        self.upper_bound = None
+        self._opt_index = None
+        if self._incremental is not None:
+            self._incremental.reset()
+        self._jobs.interrupted = []
+        self._search(files)
+        if self._opt_index is None:
+            print("No theory found")
+            return False
+        return True
+
+    def run_windowed(self, instance_files: Sequence[str], files: Sequence[str]) -> None:
+        """
+        Learn a theory on the first window of the sequence and validate it on the whole time horizon, repairing it
+        by learning on the first chunk it fails on.
+
+        The cost of a theory on the sequence is the number of chunks from the first one it fails on, and repairing
+        stops once a repaired theory does not lower it, so that repairs cannot alternate between two chunks.
+        """
+        assert self._windowing.size is not None
+        instance = read_instance(instance_files)
+        chunks = instance.chunks(self._windowing.size)
+        failed = 0
+        while True:
+            if not self._learn(files, instance, chunks[failed]):
+                return
+            repaired = self._validate(files, instance, chunks)
+            if repaired is None:
+                print(f"Theory validated on all {instance.horizon} time steps")
+                return
+            if repaired <= failed:
+                print("Repairing the theory did not lower the number of chunks it fails on")
+                break
+            failed = repaired
+        print("No theory found that explains all time steps")
+
+    def run_stream(self, instance_files: Sequence[str], files: Sequence[str], lines: Iterable[str]) -> None:
+        """
+        Learn a theory on the sequence read from the lines as its time steps arrive. The theory is validated on every
+        new time step, and learned again on the last window of time steps if it fails or predicts a hidden atom
+        incorrectly.
+        """
+        instance = read_instance(instance_files)
+        size = self._windowing.size
+        state: Optional[List[Symbol]] = None
+        for step in time_steps(instance, lines):
+            if state is not None:
+                validation = validate(files, self._opt_frame(), instance, (step - 1, step), self.opt_model, state=state)
+                if validation is not None and validation.num_incorrect == 0:
+                    print(f"Theory validated on time step {step}")
+                    state = validation.state
+                    continue
+                print(f"Theory fails on time step {step}")
+            elif step < (size or 2):
+                continue
+            window = (1 if size is None else max(1, step - size + 1), step)
+            state = None
+            if self._learn(files, instance, window):
+                validation = validate(files, self._opt_frame(), instance, window, self.opt_model)
+                if validation is not None:
+                    state = validation.state
+        print(f"Stream ended after {instance.horizon} time steps")
 
     def main(self, control: Control, files: Sequence[str]):
-        interp_files = [asp_files_dir / "search" / "core.lp", self._meta_interpreter]
-        all_files = list(files) + [str(f) for f in interp_files]
-        i = 1
-        new_type = 1
-        frames = [self._init_frame.copy()]
-        self.run_engine(all_files, frames[0])
-        while i < self._max_iterations:
-            for frame in frames:
-                while True:
-                    for key, val in self._frame_deltas.items():
-                        frame[key] += val
-                        print(f"Processing Frame:\n{frame}")
-                        self.run_engine(all_files, frame)
-                    i += 1
-                    if i % self._switch_frame_at_iter == 0:
-                        break
-            new_frame = self._init_frame.copy()
-            new_frame["gen_types"] = new_type
-            new_type += 1
-            frames.append(new_frame)
+        core = "core.lp" if self._incremental is None else "core-incremental.lp"
+        interp_files = [str(asp_files_dir / "search" / core), str(meta_interpreters[self._meta_interpreter])]
+        self._lower_bound = lower_bound(files)
+        print(f"Lower bound on the cost: {self._lower_bound.value}")
+        if self._racing.interpreters:
+            self._racing.load(files)
+        interp_files.extend(self._analysis.analyse(files))
+        self._log.open(() if self._checkpoint is None else self._checkpoint.stats)
+        if self._checkpoint is not None:
+            self._resume(self._checkpoint)
+        try:
+            if self._windowing.stream is not None:
+                with open_stream(self._windowing.stream) as lines:
+                    self.run_stream(files, interp_files, lines)
+            elif self._windowing.size is None:
+                self._search(list(files) + interp_files)
+            else:
+                self.run_windowed(files, interp_files)
+        finally:
+            if self._reporter.final_output is not None:
+                print(self._reporter.final_output)
+            self._log.close()
 
 
 def main() -> None:
@@ -0,0 +1,122 @@
+"""
+Analysis of an instance before grounding.
+
+The search encodings let the solver choose the type of every object and predicate, including the ones whose type is
+declared by the instance, so that the ground program covers every object under every type. The analysis fixes the
+types of the objects and predicates declared by isa/2 facts, and infers the type of an undeclared object from the
+sensed and hidden atoms of declared predicates if it is unambiguous. Its facts restrict the choices of generate.lp
+and let the grounder skip substitutions of objects of other types.
+"""
+
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from clingo.application import Flag
+from clingo.control import Control
+from clingo.symbol import Function, Symbol, SymbolType, Tuple_
+
+from .grounding import Frame, add_files, asp_files_dir
+from .symmetry import Permutation, instance_facts, lex_leader_program, symmetries
+
+TypeMap = Dict[Symbol, Symbol]
+
+
+def _is_tuple(signature: Symbol) -> bool:
+    """
+    Return true if the type signature is a tuple of types, as for binary predicates.
+    """
+    return signature.type == SymbolType.Function and signature.name == "" and len(signature.arguments) > 1
+
+
+def _sorts(signature: Symbol) -> List[Symbol]:
+    """
+    Return the types of the arguments of a type signature.
+    """
+    return list(signature.arguments) if _is_tuple(signature) else [signature]
+
+
+def _wrap(signature: Symbol) -> Symbol:
+    """
+    Return the type signature of the search encodings for a declared type signature.
+    """
+    if _is_tuple(signature):
+        return Tuple_([Function("type", [sort]) for sort in signature.arguments])
+    return Function("type", [signature])
+
+
+def fixed_types(files: Sequence[str]) -> TypeMap:
+    """
+    Return the types of the objects and predicates of the instance given by the files that are fixed by the analysis.
+    """
+    ctl = Control()
+    add_files(ctl, files)
+    ctl.ground()
+    sorts = {atom.symbol.arguments[0] for atom in ctl.symbolic_atoms.by_signature("type", 1)}
+    entities = {atom.symbol for atom in ctl.symbolic_atoms.by_signature("obj", 1)}
+    entities.update(Function("pred", atom.symbol.arguments) for atom in ctl.symbolic_atoms.by_signature("pred", 2))
+    declared: Dict[Symbol, Set[Symbol]] = {}
+    for atom in ctl.symbolic_atoms.by_signature("isa", 2):
+        signature, entity = atom.symbol.arguments
+        if entity.match("obj", 1) or entity.match("pred", 2):
+            declared.setdefault(entity, set()).add(signature)
+    types = {entity: signatures.pop() for entity, signatures in declared.items() if len(signatures) == 1}
+    inferred: Dict[Symbol, Set[Symbol]] = {}
+    for name in ("senses", "hidden"):
+        for atom in ctl.symbolic_atoms.by_signature(name, 2):
+            ground_atom = atom.symbol.arguments[0]
+            pred_signature = types.get(ground_atom.arguments[0])
+            if pred_signature is None:
+                continue
+            for obj, sort in zip(ground_atom.arguments[1:], _sorts(pred_signature)):
+                if obj not in declared:
+                    inferred.setdefault(obj, set()).add(sort)
+    types.update((obj, candidates.pop()) for obj, candidates in inferred.items() if len(candidates) == 1)
+    return {
+        entity: _wrap(signature)
+        for entity, signature in types.items()
+        if entity in entities and all(sort in sorts for sort in _sorts(signature))
+    }
+
+
+def fixed_types_program(types: TypeMap) -> str:
+    """
+    Return the facts fixing the given types of objects and predicates.
+    """
+    return "".join(f"fixed_isa({signature},{entity}).\n" for entity, signature in sorted(types.items()))
+
+
+class InstanceAnalysis:
+    """
+    Analyses of the instance enabled by the flags for fixing the declared types and breaking the symmetries of the
+    instance, whose results are added to the program of every frame.
+    """
+
+    def __init__(self) -> None:
+        self.fix_declared_types = Flag(False)
+        self.break_symmetries = Flag(False)
+        self.program = ""
+        # facts of the instance along with the permutations generating its symmetries, if they are broken
+        self.symmetries: Optional[Tuple[List[Symbol], List[Permutation]]] = None
+
+    def analyse(self, files: Sequence[str]) -> List[str]:
+        """
+        Analyse the instance given by the files, and return the encoding files the analyses add to the search.
+        """
+        encodings = []
+        if self.fix_declared_types.flag:
+            types = fixed_types(files)
+            self.program = fixed_types_program(types)
+            print(f"Fixed the types of {len(types)} objects and predicates")
+        if self.break_symmetries.flag:
+            facts = instance_facts(files)
+            self.symmetries = (facts, symmetries(facts))
+            print(f"Breaking {len(self.symmetries[1])} symmetries of the instance")
+            encodings.append(str(asp_files_dir / "search" / "lex-leader.lp"))
+        return encodings
+
+    def frame_program(self, frame: Frame) -> str:
+        """
+        Return the program added to the encodings of the frame by the analyses.
+        """
+        if self.symmetries is None:
+            return self.program
+        return self.program + lex_leader_program(*self.symmetries, frame)
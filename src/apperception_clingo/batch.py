@@ -0,0 +1,129 @@
+"""
+Batch runs of the engine over many instances.
+
+A manifest lists one instance per line as a JSON object with the instance files, the command line options of the
+engine for the instance, like the meta-interpreter, initial frame or budgets, and an optional name:
+
+    {"name": "eca-110", "files": ["eca/110.lp"], "args": ["-m", "bd-tight", "--frame-time-limit=60"]}
+
+Relative files are resolved against the directory of the manifest. The instances are run by a pool of worker
+processes, each running the engine once per instance in process, so that the encodings parsed by a worker are reused
+for all its instances. Each result is written to a results file in JSON Lines format as soon as its instance is done.
+The exit code of the engine is part of the result, so instances failing on invalid input do not stop the batch.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from clingo.application import clingo_main
+
+from .__main__ import ApperceptionApp
+
+Result = Dict[str, Any]
+
+
+class Entry(NamedTuple):
+    """
+    Instance of a manifest with the command line options of the engine.
+    """
+
+    name: str
+    files: List[str]
+    args: List[str]
+
+
+def read_manifest(path: Path) -> List[Entry]:
+    """
+    Return the instances listed by the manifest.
+    """
+    entries = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            files = [str(path.parent / file) for file in record["files"]]
+            entries.append(Entry(record.get("name", files[0]), files, list(record.get("args", []))))
+    return entries
+
+
+def check_args(args: Sequence[str]) -> Optional[str]:
+    """
+    Return the error message for invalid command line options of the engine, or None if they are valid.
+
+    Invalid values of options of the engine abort the process parsing them, so the options are checked in a separate
+    process instead of a worker of the pool.
+    """
+    process = subprocess.run(
+        [sys.executable, "-m", "apperception_clingo", *args, "--version"], capture_output=True, text=True, check=False
+    )
+    return None if process.returncode == 0 else process.stderr.strip()
+
+
+def run_instance(entry: Entry) -> Result:
+    """
+    Run the engine on the instance, and return its result with the stats of its frames.
+
+    The output of the engine is discarded, as the stats contain the unified interpretations found.
+    """
+    app = ApperceptionApp()
+    start = time.time()
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        exit_code = clingo_main(app, [*entry.files, *entry.args, "--outf=3"])
+    return {
+        "name": entry.name,
+        "files": entry.files,
+        "args": entry.args,
+        "exit_code": exit_code,
+        "time": time.time() - start,
+        "best_cost": None if app.upper_bound is None else app.upper_bound + 1,
+        "opt_model": [str(symb) for symb in app.opt_model],
+        "stats": app.stats,
+    }
+
+
+def run_batch(entries: Sequence[Entry], results: Path, workers: int) -> None:
+    """
+    Run the instances with the given number of worker processes, and write their results in the order they finish.
+
+    Instances with invalid command line options are not run, and recorded with the error message instead.
+    """
+    errors = {args: check_args(args) for args in {tuple(entry.args) for entry in entries}}
+    with ProcessPoolExecutor(workers) as pool, results.open("w", encoding="utf-8") as f:
+        futures = []
+        for entry in entries:
+            error = errors[tuple(entry.args)]
+            if error is None:
+                futures.append(pool.submit(run_instance, entry))
+            else:
+                f.write(json.dumps({"name": entry.name, "files": entry.files, "args": entry.args, "error": error}))
+                f.write("\n")
+                print(f"Skipped {entry.name}: invalid options")
+        for future in as_completed(futures):
+            result = future.result()
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            print(f"Finished {result['name']}")
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    """
+    Run the instances of the manifest given as first argument, and write their results to the file given as second
+    argument, using the number of worker processes given as optional third argument or one per CPU.
+    """
+    args = sys.argv[1:] if args is None else args
+    if len(args) not in (2, 3):
+        raise ValueError("Usage: python -m apperception_clingo.batch <manifest> <results> [<workers>]")
+    workers = int(args[2]) if len(args) == 3 else os.cpu_count() or 1
+    run_batch(read_manifest(Path(args[0])), Path(args[1]), workers)
+
+
+if __name__ == "__main__":
+    main()  # nocoverage
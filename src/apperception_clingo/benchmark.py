@@ -0,0 +1,204 @@
+"""
+Benchmark of the meta-interpreters on a matrix of instances, meta-interpreters and frames.
+
+Each frame of each instance is grounded and solved to optimality once with every meta-interpreter, and the times
+and solver statistics are written to a JSON report. A report can be compared against a stored baseline report, in
+which case runs that became slower or worse are flagged as regressions.
+
+Run with: python -m apperception_clingo.benchmark --help
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import clingo
+from clingo.solving import Model
+
+from .budget import Budget, solve
+from .frames import default_init_frame
+from .grounding import Frame, asp_files_dir, ground, meta_interpreters
+
+Result = Dict[str, Any]
+
+# root of the source checkout, which the paper instances are relative to since they are not installed with the package
+repo_dir = Path(__file__).resolve().parents[2]
+
+default_instances = [
+    Path("tests", "data", "predict_paper_simple_example.lp"),
+    Path("tests", "data", "predict_paper_eca.lp"),
+    Path("tests", "data", "predict_paper_seekwhence_theme_song.lp"),
+]
+
+# timings compared against the baseline, and the absolute slack in seconds below which differences are noise
+timed_metrics = ["ground_time", "solve_time", "first_model_time", "optimal_model_time"]
+TIME_SLACK = 0.1
+
+
+def run(instance: Path, interpreter: str, frame: Frame, budget: Budget, *, root: Path = Path()) -> Result:
+    """
+    Ground and solve the frame of the instance relative to the root directory with the given meta-interpreter and
+    return the measurements.
+    """
+    files = [str(root / instance), str(asp_files_dir / "search" / "core.lp"), str(meta_interpreters[interpreter])]
+    start = time.time()
+    ctl = ground(files, frame, ["--opt-mode=opt"])
+    ground_end = time.time()
+    model_times: List[float] = []
+    costs: List[int] = []
+
+    def on_model(model: Model) -> None:  # nocoverage, called on the solver thread
+        model_times.append(time.time() - ground_end)
+        costs.append(model.cost[0])
+
+    status = solve(ctl, on_model, budget)
+    solve_end = time.time()
+    if status == "complete":
+        status = "optimal" if costs else "unsatisfiable"
+    problem, solvers = ctl.statistics["problem"]["lp"], ctl.statistics["solving"]["solvers"]
+    return {
+        "instance": str(instance),
+        "interpreter": interpreter,
+        "frame": frame,
+        "status": status,
+        "cost": costs[-1] if costs else None,
+        "ground_time": ground_end - start,
+        "solve_time": solve_end - ground_end,
+        "atoms": int(problem["atoms"]),
+        "rules": int(problem["rules"]),
+        "choices": int(solvers["choices"]),
+        "conflicts": int(solvers["conflicts"]),
+        "first_model_time": model_times[0] if model_times else None,
+        "optimal_model_time": model_times[-1] if status == "optimal" else None,
+    }
+
+
+def run_matrix(
+    instances: Sequence[Path],
+    interpreters: Sequence[str],
+    frames: Sequence[Frame],
+    budget: Budget,
+    *,
+    root: Path = Path(),
+) -> Dict[str, Any]:
+    """
+    Run every combination of instance, meta-interpreter and frame, and return the report. The instances are relative
+    to the root directory, and recorded as given.
+    """
+    results = []
+    for instance in instances:
+        for frame in frames:
+            for interpreter in interpreters:
+                result = run(instance, interpreter, frame, budget, root=root)
+                print(
+                    f"{instance.name} {interpreter} {frame}: {result['status']}, cost {result['cost']}, "
+                    f"ground {result['ground_time']:.3f}s, solve {result['solve_time']:.3f}s",
+                    file=sys.stderr,
+                )
+                results.append(result)
+    return {"clingo": clingo.__version__, "time_limit": budget.time, "results": results}
+
+
+def result_key(result: Result) -> Tuple[str, str, str]:
+    """
+    Return the key identifying the run of a result.
+    """
+    return result["instance"], result["interpreter"], json.dumps(result["frame"], sort_keys=True)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Return a description of each regression of the report against the baseline.
+
+    A run regresses if it found a worse cost, no longer finished, or took more than the tolerated relative increase
+    of one of its timings.
+    """
+    baseline_results = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        base = baseline_results.get(result_key(result))
+        if base is None:
+            continue
+        name = " ".join(result_key(result))
+        if base["status"] in ("optimal", "unsatisfiable") and result["status"] not in ("optimal", "unsatisfiable"):
+            regressions.append(f"{name}: status {base['status']} -> {result['status']}")
+        if base["cost"] is not None and (result["cost"] is None or result["cost"] > base["cost"]):
+            regressions.append(f"{name}: cost {base['cost']} -> {result['cost']}")
+        for metric in timed_metrics:
+            old, new = base[metric], result[metric]
+            if old is not None and new is not None and new > old * (1 + tolerance) + TIME_SLACK:
+                regressions.append(f"{name}: {metric} {old:.3f}s -> {new:.3f}s")
+    return regressions
+
+
+def parse_frame(value: str) -> Frame:
+    """
+    Parse a frame given as JSON object of constants, which override the default initial frame.
+    """
+    frame = default_init_frame.copy()
+    frame.update(json.loads(value))
+    return frame
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the benchmark with the given command line arguments, and return the exit code.
+    """
+    parser = argparse.ArgumentParser(prog="python -m apperception_clingo.benchmark", description=__doc__)
+    parser.add_argument(
+        "-i",
+        "--instance",
+        type=Path,
+        action="append",
+        help="instance file, defaults to the paper instances of the source checkout",
+    )
+    parser.add_argument(
+        "-m",
+        "--meta-interpreter",
+        choices=list(meta_interpreters),
+        action="append",
+        help="meta-interpreter, defaults to all",
+    )
+    parser.add_argument(
+        "-f",
+        "--frame",
+        type=parse_frame,
+        action="append",
+        help="frame as JSON object overriding the initial frame, e.g. '{\"causal_max\": 2}'",
+    )
+    parser.add_argument("-t", "--time-limit", type=float, default=60.0, help="time limit per run in seconds")
+    parser.add_argument("-o", "--output", type=Path, help="file to write the report to, defaults to standard output")
+    parser.add_argument("-b", "--baseline", type=Path, help="baseline report to check for regressions")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="tolerated relative increase of timings over the baseline"
+    )
+    options = parser.parse_args(args)
+    if options.instance is None and not all((repo_dir / instance).exists() for instance in default_instances):
+        parser.error("the paper instances are only available in a source checkout, give the instances with -i")
+    report = run_matrix(
+        options.instance or default_instances,
+        options.meta_interpreter or list(meta_interpreters),
+        options.frame or [default_init_frame.copy()],
+        Budget(time=options.time_limit),
+        root=Path() if options.instance else repo_dir,
+    )
+    if options.output is not None:
+        with options.output.open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    if options.baseline is None:
+        return 0
+    with options.baseline.open(encoding="utf-8") as f:
+        regressions = compare(report, json.load(f), options.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # nocoverage
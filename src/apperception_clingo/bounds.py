@@ -0,0 +1,62 @@
+"""
+Lower bounds on the cost of the unified interpretations of an instance.
+
+The cost minimized in optimize.lp counts the initial atoms, the rules and the body atoms of the rules. Every atom
+sensed at the initial time step is forced to be an initial atom. Without rules, the state never changes, so every
+atom sensed at any time step has to be an initial atom. Otherwise, there is at least one rule with at least one body
+atom.
+"""
+
+from typing import NamedTuple, Sequence, Set
+
+from clingo.control import Control
+from clingo.symbol import Symbol
+
+from .grounding import Frame, add_files
+
+# program deriving the initial time step, as in the meta-interpreters
+INIT_TIME_PROGRAM = "#const first_time_point = 1. init_time(first_time_point)."
+
+
+class LowerBound(NamedTuple):
+    """
+    Lower bound on the cost of an instance, given by the number of distinct atoms sensed at the initial time step
+    and at any time step.
+    """
+
+    init_atoms: int
+    sensed_atoms: int
+
+    @property
+    def value(self) -> int:
+        """
+        Return the lower bound on the cost of the unified interpretations in any frame.
+        """
+        return min(self.sensed_atoms, self.init_atoms + 2)
+
+    def frame(self, frame: Frame) -> int:
+        """
+        Return the lower bound on the cost of the unified interpretations in the frame.
+        """
+        if frame.get("causal_max", 1) + frame.get("static_max", 1) == 0:
+            return self.sensed_atoms
+        return self.value
+
+
+def lower_bound(files: Sequence[str], program: str = "") -> LowerBound:
+    """
+    Return the lower bound on the cost of the instance given by the files and the additional program.
+    """
+    ctl = Control()
+    add_files(ctl, files)
+    ctl.add(program + INIT_TIME_PROGRAM)
+    ctl.ground()
+    init_times = {atom.symbol.arguments[0] for atom in ctl.symbolic_atoms.by_signature("init_time", 1)}
+    init_atoms: Set[Symbol] = set()
+    sensed_atoms: Set[Symbol] = set()
+    for atom in ctl.symbolic_atoms.by_signature("senses", 2):
+        sensed, sensed_time = atom.symbol.arguments
+        sensed_atoms.add(sensed)
+        if sensed_time in init_times:
+            init_atoms.add(sensed)
+    return LowerBound(len(init_atoms), len(sensed_atoms))
@@ -0,0 +1,106 @@
+"""
+Budgets limiting the resources spent on solving a single frame.
+"""
+
+import os
+import time
+from typing import Callable, NamedTuple, Optional
+
+from clingo.control import Control
+from clingo.solving import Model
+
+# time in seconds between checks of the budget while solving
+POLL_INTERVAL = 0.1
+
+
+class Budget(NamedTuple):
+    """
+    Limits on the wall time in seconds, the number of conflicts and the resident memory in MB spent on solving a
+    frame. A limit of None means that the resource is not limited.
+    """
+
+    time: Optional[float] = None
+    conflicts: Optional[int] = None
+    memory: Optional[int] = None
+
+    def scaled(self, factor: float) -> "Budget":
+        """
+        Return the budget with all limits multiplied by the given factor.
+        """
+        return Budget(
+            None if self.time is None else self.time * factor,
+            None if self.conflicts is None else int(self.conflicts * factor),
+            None if self.memory is None else int(self.memory * factor),
+        )
+
+
+def memory_usage() -> Optional[int]:
+    """
+    Return the resident memory of the process in MB, or None if it cannot be determined on this platform.
+    """
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 2**20
+    except (OSError, ValueError, AttributeError):  # nocoverage
+        return None
+
+
+def peak_memory_usage() -> Optional[int]:
+    """
+    Return the peak resident memory of the process in MB since it started or since the last reset, or None if it
+    cannot be determined on this platform.
+    """
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) // 2**10
+    except (OSError, ValueError):  # nocoverage
+        pass
+    return None  # nocoverage
+
+
+def reset_peak_memory() -> None:
+    """
+    Reset the peak resident memory of the process to its current resident memory, if supported by the platform.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as f:
+            f.write("5")
+    except OSError:  # nocoverage
+        pass
+
+
+def solve(
+    ctl: Control,
+    on_model: Callable[[Model], None],
+    budget: Budget,
+    cancel: Optional[Callable[[], bool]] = None,
+    on_poll: Optional[Callable[[], None]] = None,
+) -> str:
+    """
+    Solve the program grounded in the control within the given budget.
+
+    Solving is additionally cancelled as soon as the optional cancel callback returns true. The optional on_poll
+    callback is called on the calling thread on every check of the budget while the solver runs. Returns "complete"
+    if the search space was exhausted, "interrupted" if the budget ran out and "cancelled" if solving was cancelled.
+    """
+    deadline = None if budget.time is None else time.time() + budget.time
+    solve_limit = "umax" if budget.conflicts is None else str(budget.conflicts)
+    ctl.configuration.solve.solve_limit = solve_limit  # type: ignore[union-attr]
+    with ctl.solve(on_model=on_model, async_=True) as handle:
+        while not handle.wait(POLL_INTERVAL):
+            if on_poll is not None:
+                on_poll()
+            if cancel is not None and cancel():
+                handle.cancel()
+                return "cancelled"
+            if deadline is not None and time.time() > deadline:
+                handle.cancel()
+                return "interrupted"
+            memory = memory_usage() if budget.memory is not None else None
+            if memory is not None and budget.memory is not None and memory > budget.memory:
+                handle.cancel()
+                return "interrupted"
+        result = handle.get()
+    return "complete" if result.exhausted else "interrupted"
@@ -0,0 +1,57 @@
+"""
+Resuming the frame search from the stats log of an earlier run.
+
+The stats log is synced to disk whenever solving a frame ends, so it is a checkpoint of the search: it records the
+frames searched with their status and budget, and the unified interpretations found. Frames whose solving did not
+end are searched again, but the unified interpretations found in them are kept.
+"""
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .budget import Budget
+from .frames import FrameKey, FrameScheduler, frame_key
+from .grounding import Frame
+from .stats import SerializedInterpretation, Stat, read_stats
+
+
+class Checkpoint(NamedTuple):
+    """
+    State of the search restored from a stats log: the stats of the frames, the index of the frame of the best
+    unified interpretation along with the interpretation, and the interrupted frames with their budgets.
+    """
+
+    stats: List[Stat]
+    incumbent: Optional[Tuple[int, SerializedInterpretation]]
+    interrupted: List[Tuple[Frame, Budget]]
+
+    def restore(self, scheduler: FrameScheduler) -> None:
+        """
+        Inform the scheduler about the frames whose solving ended, along with the best cost found.
+        """
+        for stat in self.stats:
+            if "status" in stat:
+                duration = stat["solve_end"] - stat["frame_start"]  # type: ignore[operator]
+                scheduler.restore(stat["frame"], stat["status"], duration)  # type: ignore[arg-type]
+        scheduler.incumbent = None if self.incumbent is None else self.incumbent[1]["cost"]
+
+
+def read_checkpoint(path: Path) -> Checkpoint:
+    """
+    Return the state of the search recorded by the stats log.
+    """
+    stats = read_stats(path)
+    models: List[Tuple[int, SerializedInterpretation]] = []
+    interrupted: Dict[FrameKey, Tuple[Frame, Budget]] = {}
+    for index, stat in enumerate(stats):
+        interpretations: List[SerializedInterpretation] = stat["unified_interpretations"]  # type: ignore[assignment]
+        models.extend((index, interpretation) for interpretation in interpretations)
+        frame: Frame = stat["frame"]  # type: ignore[assignment]
+        status: Optional[str] = stat.get("status")  # type: ignore[assignment]
+        if status == "interrupted":
+            interrupted[frame_key(frame)] = (frame, Budget(**stat.get("budget", {})))  # type: ignore[arg-type]
+        elif status is not None:
+            interrupted.pop(frame_key(frame), None)
+    # the last one found among the models of the lowest cost
+    incumbent = min(reversed(models), key=lambda model: model[1]["cost"], default=None)
+    return Checkpoint(stats, incumbent, list(interrupted.values()))
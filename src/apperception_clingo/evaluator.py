@@ -0,0 +1,281 @@
+"""
+Evaluation of learned theories on sequences without the solver.
+
+A unified interpretation fixes the objects, types, constraints, rules and initial atoms of a theory. The evaluator
+forward-simulates the theory over the time steps of a sequence like the meta-interpreters: the initial atoms hold at
+the first time step, causal rules derive atoms from the previous time step, atoms of the previous time step persist
+unless they are incompossible with an atom that holds, and static rules are applied up to a fixpoint. Rules are
+matched against the atoms holding at a time step indexed by predicate.
+
+As in the body-decoupled meta-interpreters, an xor constraint makes atoms of binary predicates incompossible, too.
+"""
+
+import sys
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from clingo.symbol import Function, Symbol
+
+from .interpretation import Interpretation, decode, deserialize
+from .stats import SerializedInterpretation, Stat, read_stats
+from .window import TimedInstance, Window, read_instance
+
+Index = Dict[Symbol, List[Tuple[Symbol, ...]]]
+Substitution = Dict[Symbol, Symbol]
+
+
+class Rule(NamedTuple):
+    """
+    Rule of a theory given by its head atom and body atoms.
+    """
+
+    head: Symbol
+    body: List[Symbol]
+
+
+def _index(atoms: Set[Symbol]) -> Index:
+    """
+    Return the arguments of the atoms indexed by predicate.
+    """
+    index: Index = {}
+    for atom in atoms:
+        index.setdefault(atom.arguments[0], []).append(tuple(atom.arguments[1:]))
+    return index
+
+
+def _ground_atoms(interpretation: Interpretation, sorts: Dict[Symbol, Set[Symbol]]) -> List[Symbol]:
+    """
+    Return the ground atoms of the predicates and objects of the interpretation whose types match.
+    """
+    objects = interpretation["obj"][1]
+    ground_atoms: List[Symbol] = []
+    for pred in interpretation["pred"][2]:
+        pred_sorts = sorts.get(pred, set())
+        if pred.arguments[1].number == 1:
+            ground_atoms.extend(Function("s", [pred, obj]) for obj in objects if pred_sorts & sorts.get(obj, set()))
+        else:
+            ground_atoms.extend(
+                Function("s2", [pred, obj1, obj2])
+                for obj1, obj2 in product(objects, repeat=2)
+                if any(
+                    len(sig.arguments) == 2
+                    and sig.arguments[0] in sorts.get(obj1, set())
+                    and sig.arguments[1] in sorts.get(obj2, set())
+                    for sig in pred_sorts
+                )
+            )
+    return ground_atoms
+
+
+def _groups(interpretation: Interpretation, ground_atoms: Sequence[Symbol]) -> List[List[Symbol]]:
+    """
+    Return the sets of ground atoms made incompossible by the xor and exist constraints of the interpretation.
+    """
+    # xor constraints are closed under symmetry and transitivity, so the partners of a predicate form its class
+    partners: Dict[Symbol, Set[Symbol]] = {}
+    for xor in interpretation["xor"][2]:
+        for pred in xor.arguments:
+            partners.setdefault(pred, set()).update(xor.arguments)
+    exists = {symb.arguments[0] for symb in interpretation["exist"][1]}
+    groups: Dict[Tuple[Symbol, ...], List[Symbol]] = {}
+    for atom in ground_atoms:
+        pred, *args = atom.arguments
+        if pred in partners:
+            groups.setdefault((min(partners[pred]), *args), []).append(atom)
+        if pred in exists:
+            groups.setdefault((pred, args[0]), []).append(atom)
+    return list(groups.values())
+
+
+class Theory:
+    """
+    Theory of a unified interpretation with the incompossible sets of ground atoms it implies.
+    """
+
+    def __init__(self, interpretation: Interpretation) -> None:
+        sorts: Dict[Symbol, Set[Symbol]] = {}
+        for isa in interpretation["isa"][2]:
+            sorts.setdefault(isa.arguments[1], set()).add(isa.arguments[0])
+        self.objects = list(interpretation["obj"][1])
+        self.init = [symb.arguments[0] for symb in interpretation["init"][1]]
+        # objects each variable is substituted by
+        self.domains = {
+            var: {obj for obj in self.objects if sorts.get(var, set()) & sorts.get(obj, set())}
+            for var in interpretation["var"][1]
+        }
+        bodies: Dict[Symbol, List[Symbol]] = {}
+        for body in interpretation["rule_body"][2]:
+            bodies.setdefault(body.arguments[0], []).append(body.arguments[1])
+        self.static_rules: List[Rule] = []
+        self.causal_rules: List[Rule] = []
+        for rule_head in interpretation["rule_head"][2]:
+            rule_id, head = rule_head.arguments
+            rule = Rule(head, bodies.get(rule_id, []))
+            (self.causal_rules if rule_id.match("causal", 1) else self.static_rules).append(rule)
+        self.groups = _groups(interpretation, _ground_atoms(interpretation, sorts))
+        self.incompossible: Dict[Symbol, Set[Symbol]] = {}
+        for group in self.groups:
+            for atom in group:
+                self.incompossible.setdefault(atom, set()).update(other for other in group if other != atom)
+
+    def _substitutions(self, rule: Rule, index: Index) -> Iterator[Substitution]:
+        """
+        Return the substitutions of the variables of the rule whose body atoms are in the index.
+        """
+        substs: List[Substitution] = [{}]
+        for atom in rule.body:
+            pred, *variables = atom.arguments
+            extended = []
+            for subst in substs:
+                for args in index.get(pred, []):
+                    new = dict(subst)
+                    if all(
+                        new.setdefault(var, obj) == obj and obj in self.domains.get(var, set())
+                        for var, obj in zip(variables, args)
+                    ):
+                        extended.append(new)
+            substs = extended
+        body_vars = {var for atom in rule.body for var in atom.arguments[1:]}
+        free = list(dict.fromkeys(var for var in rule.head.arguments[1:] if var not in body_vars))
+        for subst in substs:
+            for objs in product(*(sorted(self.domains.get(var, set())) for var in free)):
+                yield {**subst, **dict(zip(free, objs))}
+
+    def _apply(self, rules: Sequence[Rule], atoms: Set[Symbol]) -> Set[Symbol]:
+        """
+        Return the head atoms of the rules derived from the atoms.
+        """
+        # every variable has to be substituted for a rule to fire
+        if not all(self.domains.values()):
+            return set()
+        index = _index(atoms)
+        return {
+            Function(rule.head.name, [rule.head.arguments[0], *(subst[var] for var in rule.head.arguments[1:])])
+            for rule in rules
+            for subst in self._substitutions(rule, index)
+        }
+
+    def _close(self, atoms: Set[Symbol]) -> Set[Symbol]:
+        """
+        Return the atoms closed under the static rules.
+        """
+        state = set(atoms)
+        while True:
+            derived = self._apply(self.static_rules, state) - state
+            if not derived:
+                return state
+            state |= derived
+
+    def initial_state(self) -> Set[Symbol]:
+        """
+        Return the atoms holding at the first time step.
+        """
+        return self._close(set(self.init))
+
+    def next_state(self, state: Set[Symbol]) -> Set[Symbol]:
+        """
+        Return the atoms holding at the time step following the one the given atoms hold at.
+        """
+        derived = self._apply(self.causal_rules, state)
+        blocked: Set[Symbol] = set()
+        while True:
+            current = self._close(derived | (state - blocked))
+            blocking = {atom for atom in state - blocked if self.incompossible.get(atom, set()) & current}
+            if not blocking:
+                return current
+            blocked |= blocking
+
+    def violations(self, state: Set[Symbol]) -> List[str]:
+        """
+        Return the constraints of the theory violated by the atoms holding at a time step.
+        """
+        violations = []
+        for group in self.groups:
+            holding = [atom for atom in group if atom in state]
+            if len(holding) != 1:
+                atoms = ", ".join(str(atom) for atom in group)
+                violations.append(f"{len(holding)} of the incompossible atoms {atoms} hold")
+        components = {obj: {obj} for obj in self.objects}
+        for atom in state:
+            if atom.match("s2", 3) and atom.arguments[1] in components and atom.arguments[2] in components:
+                merged = components[atom.arguments[1]] | components[atom.arguments[2]]
+                for obj in merged:
+                    components[obj] = merged
+        if len({id(component) for component in components.values()}) > 1:
+            violations.append("the objects are not related")
+        return violations
+
+
+class Evaluation(NamedTuple):
+    """
+    Result of evaluating a theory on a sequence: the atoms holding at each time step, the violated constraints by
+    time step, and the incorrectly predicted hidden facts.
+    """
+
+    states: Dict[int, Set[Symbol]]
+    violations: List[Tuple[int, str]]
+    incorrect: List[Symbol]
+
+    @property
+    def num_incorrect(self) -> int:
+        """
+        Return the number of incorrectly predicted hidden atoms.
+        """
+        return len(self.incorrect)
+
+
+def evaluate(theory: Theory, instance: TimedInstance, window: Optional[Window] = None) -> Evaluation:
+    """
+    Forward-simulate the theory over the time steps of the window of the instance, by default its whole time horizon.
+    """
+    start, end = (1, instance.horizon) if window is None else window
+    evaluation = Evaluation({}, [], [])
+    state = theory.initial_state()
+    for step in range(start, end + 1):
+        if step > start:
+            state = theory.next_state(state)
+        evaluation.states[step] = state
+        evaluation.violations.extend((step, violation) for violation in theory.violations(state))
+        for fact in instance.timed.get(step, []):
+            if fact.arguments[0] in state:
+                continue
+            if fact.match("senses", 2):
+                evaluation.violations.append((step, f"sensed atom {fact.arguments[0]} does not hold"))
+            else:
+                evaluation.incorrect.append(fact)
+    return evaluation
+
+
+def best_interpretation(stats: Sequence[Stat]) -> SerializedInterpretation:
+    """
+    Return the unified interpretation of the stats with the lowest cost, and among those the one found last.
+    """
+    interpretations: List[SerializedInterpretation] = []
+    for stat in stats:
+        interpretations.extend(stat["unified_interpretations"])  # type: ignore[arg-type]
+    if not interpretations:
+        raise ValueError("No unified interpretation in the stats")
+    return min(reversed(interpretations), key=lambda interpretation: interpretation["cost"])
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    """
+    Evaluate the best unified interpretation of the stats log given as first argument on the instance given by the
+    remaining arguments, and print the atoms holding at each time step, the violated constraints and the number of
+    incorrectly predicted hidden atoms.
+    """
+    args = sys.argv[1:] if args is None else args
+    if len(args) < 2:
+        raise ValueError("Usage: python -m apperception_clingo.evaluator <log> <instance>...")
+    theory = Theory(decode(deserialize(best_interpretation(read_stats(Path(args[0]))))))
+    evaluation = evaluate(theory, read_instance(args[1:]))
+    for step, state in evaluation.states.items():
+        print(f"Time step {step}: {' '.join(sorted(str(atom) for atom in state))}")
+    for step, violation in evaluation.violations:
+        print(f"Violated at time step {step}: {violation}")
+    print(f"Number of incorrectly predicted hidden states: {evaluation.num_incorrect}")
+
+
+if __name__ == "__main__":
+    main()  # nocoverage
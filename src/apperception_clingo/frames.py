@@ -0,0 +1,421 @@
+"""
+Strategies for scheduling the frames searched for an optimal unified interpretation.
+
+A frame assigns a value to each of the constants bounding the complexity of the theories under consideration. New
+frames are obtained by incrementing one of the constants, where the number of generated types is always incremented
+by one.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+from .bounds import LowerBound
+from .budget import Budget
+from .grounding import Frame
+
+FrameKey = Tuple[Tuple[str, int], ...]
+
+default_init_frame: Frame = {
+    "gen_types": 0,
+    "gen_objs": 0,
+    "gen_unary_preds": 0,
+    "gen_binary_preds": 0,
+    "causal_max": 1,
+    "static_max": 1,
+    "rule_body_size_max": 1,
+    "gen_vars": 2,
+}
+
+
+def frame_key(frame: Frame) -> FrameKey:
+    """
+    Return a hashable key identifying the frame.
+    """
+    return tuple(sorted(frame.items()))
+
+
+def dominates(frame: Frame, other: Frame) -> bool:
+    """
+    Return true if every constant of the other frame is at most the one of the frame.
+
+    The theories under consideration in the other frame are then also considered in the frame.
+    """
+    return all(val <= frame[key] for key, val in other.items())
+
+
+class FrameScheduler:  # pylint: disable=too-many-instance-attributes
+    """
+    Base class of frame schedulers.
+
+    Frames to be searched are obtained one after the other via next_frame, and the scheduler is informed about the
+    result of searching a frame via report. Frames that are dominated by a frame which was searched completely are
+    skipped, as no better unified interpretation can be found in them.
+
+    If a lower bound is set, frames whose bound is not below the cost of the incumbent, which is the best unified
+    interpretation found so far, are skipped as well, and the search ends once the incumbent meets the lower bound.
+
+    Frames searched by an earlier run are restored via restore. They are skipped, but count towards the maximum
+    number of frames.
+    """
+
+    def __init__(self, init_frame: Frame, frame_deltas: Frame, max_frames: Optional[int] = None) -> None:
+        self.init_frame = init_frame.copy()
+        self.frame_deltas = frame_deltas.copy()
+        self.frame_deltas.setdefault("gen_types", 1)
+        self.max_frames = max_frames
+        self.num_frames = 0
+        self.complete: List[Frame] = []
+        self.restored: Set[FrameKey] = set()
+        self.lower_bound: Optional[LowerBound] = None
+        self.incumbent: Optional[int] = None
+
+    def _next(self) -> Optional[Frame]:
+        """
+        Return the next frame according to the strategy, or None if there are no more frames.
+        """
+        raise NotImplementedError
+
+    def successors(self, frame: Frame) -> List[Frame]:
+        """
+        Return the frames obtained by incrementing one of the constants of the frame.
+        """
+        successors = []
+        for key, val in self.frame_deltas.items():
+            if val > 0:
+                successor = frame.copy()
+                successor[key] += val
+                successors.append(successor)
+        return successors
+
+    def dominated(self, frame: Frame) -> bool:
+        """
+        Return true if the frame is dominated by a completely searched frame.
+        """
+        return any(dominates(complete, frame) for complete in self.complete)
+
+    def bounded(self, frame: Frame) -> bool:
+        """
+        Return true if the lower bound of the frame is not below the cost of the incumbent.
+        """
+        return (
+            self.lower_bound is not None
+            and self.incumbent is not None
+            and self.lower_bound.frame(frame) >= self.incumbent
+        )
+
+    def optimal(self) -> bool:
+        """
+        Return true if the incumbent meets the lower bound of all frames.
+        """
+        return self.lower_bound is not None and self.incumbent is not None and self.lower_bound.value >= self.incumbent
+
+    def next_frame(self) -> Optional[Frame]:
+        """
+        Return the next frame to be searched, or None if the search is over.
+        """
+        if (self.max_frames is not None and self.num_frames >= self.max_frames) or self.optimal():
+            return None
+        frame = self._next()
+        while frame is not None and (frame_key(frame) in self.restored or self.dominated(frame) or self.bounded(frame)):
+            frame = self._next()
+        if frame is not None:
+            self.num_frames += 1
+        return frame
+
+    def report(self, frame: Frame, status: str, duration: float) -> None:  # pylint: disable=unused-argument
+        """
+        Inform the scheduler that the frame was searched in the given time, with the given status.
+        """
+        if status in ("optimal", "unsatisfiable"):
+            self.complete.append(frame.copy())
+
+    def restore(self, frame: Frame, status: str, duration: float) -> None:
+        """
+        Inform the scheduler that the frame was searched by an earlier run in the given time, with the given status.
+        """
+        key = frame_key(frame)
+        if key not in self.restored:
+            self.restored.add(key)
+            self.num_frames += 1
+        self.report(frame, status, duration)
+
+    def __iter__(self) -> Iterator[Frame]:
+        frame = self.next_frame()
+        while frame is not None:
+            yield frame
+            frame = self.next_frame()
+
+
+class RoundRobinScheduler(FrameScheduler):
+    """
+    Search frame families in turns, in the order of the original search loop.
+
+    The first family starts at the initial frame. In its turn, a family is grown by rounds, where each round
+    increments every constant once, one after the other. A turn ends once the total number of rounds is a multiple of
+    the given number of rounds per turn, and the count of rounds starts at one, so the first turn has one round less.
+    After each pass over the families, a family starting at the initial frame with the number of generated types set
+    to the number of families so far is added. No pass starts once the given number of rounds is reached, but a pass
+    is always completed, so the total number of rounds may exceed it.
+    """
+
+    def __init__(
+        self,
+        init_frame: Frame,
+        frame_deltas: Frame,
+        max_frames: Optional[int] = None,
+        rounds_per_turn: int = 5,
+        max_rounds: int = 20,
+    ) -> None:
+        super().__init__(init_frame, frame_deltas, max_frames)
+        self.rounds_per_turn = rounds_per_turn
+        self.max_rounds = max_rounds
+        self._frames = self._round_robin()
+
+    def _round_robin(self) -> Iterator[Frame]:
+        yield self.init_frame.copy()
+        families = [self.init_frame.copy()]
+        rounds = 1
+        while rounds < self.max_rounds:
+            for idx, family in enumerate(families):
+                while True:
+                    for key, val in self.frame_deltas.items():
+                        if key != "gen_types" and val > 0:
+                            family = family.copy()
+                            family[key] += val
+                            yield family
+                    rounds += 1
+                    if rounds % self.rounds_per_turn == 0:
+                        break
+                families[idx] = family
+            new_family = self.init_frame.copy()
+            new_family["gen_types"] = len(families)
+            families.append(new_family)
+
+    def _next(self) -> Optional[Frame]:
+        return next(self._frames, None)
+
+
+class BreadthFirstScheduler(FrameScheduler):
+    """
+    Search frames in order of their size, which is the number of increments needed to reach them from the initial
+    frame.
+    """
+
+    def __init__(self, init_frame: Frame, frame_deltas: Frame, max_frames: Optional[int] = None) -> None:
+        super().__init__(init_frame, frame_deltas, max_frames)
+        self._queue: Deque[Frame] = deque([self.init_frame.copy()])
+        self._seen: Set[FrameKey] = {frame_key(self.init_frame)}
+
+    def _next(self) -> Optional[Frame]:
+        if not self._queue:
+            return None
+        frame = self._queue.popleft()
+        for successor in self.successors(frame):
+            key = frame_key(successor)
+            if key not in self._seen:
+                self._seen.add(key)
+                self._queue.append(successor)
+        return frame
+
+
+class CheapestFirstScheduler(FrameScheduler):
+    """
+    Search the unexplored frame with the least estimated search time next.
+
+    The time of a frame is estimated as the measured time of the frame it was obtained from, multiplied by the
+    geometric mean of the growth in time measured so far when incrementing the same constant.
+    """
+
+    default_growth = 2.0
+    min_time = 0.001
+
+    def __init__(self, init_frame: Frame, frame_deltas: Frame, max_frames: Optional[int] = None) -> None:
+        super().__init__(init_frame, frame_deltas, max_frames)
+        # unexplored frames along with the key of the frame they were obtained from and the incremented constant
+        self._frontier: Dict[FrameKey, Tuple[Frame, Optional[FrameKey], Optional[str]]] = {
+            frame_key(self.init_frame): (self.init_frame.copy(), None, None)
+        }
+        self._seen: Set[FrameKey] = set(self._frontier)
+        self._parents: Dict[FrameKey, Tuple[Optional[FrameKey], Optional[str]]] = {}
+        self._times: Dict[FrameKey, float] = {}
+        self._growth: Dict[str, List[float]] = {}
+
+    def growth(self, const: str) -> float:
+        """
+        Return the estimated factor the search time grows by when incrementing the given constant.
+        """
+        factors = self._growth.get(const)
+        if not factors:
+            return self.default_growth
+        return math.exp(sum(math.log(f) for f in factors) / len(factors))
+
+    def estimate(self, key: FrameKey, parent: Optional[FrameKey], const: Optional[str]) -> float:
+        """
+        Return the estimated search time of the frame with the given key.
+        """
+        if key in self._times:
+            return self._times[key]
+        if parent is None or const is None:
+            return self.min_time
+        return self.estimate(parent, *self._parents[parent]) * self.growth(const)
+
+    def _next(self) -> Optional[Frame]:
+        if not self._frontier:
+            return None
+        key = min(self._frontier, key=lambda k: self.estimate(k, *self._frontier[k][1:]))
+        frame, parent, const = self._frontier.pop(key)
+        self._parents[key] = (parent, const)
+        for successor_const, val in self.frame_deltas.items():
+            if val > 0:
+                successor = frame.copy()
+                successor[successor_const] += val
+                successor_key = frame_key(successor)
+                if successor_key not in self._seen:
+                    self._seen.add(successor_key)
+                    self._frontier[successor_key] = (successor, key, successor_const)
+        return frame
+
+    def report(self, frame: Frame, status: str, duration: float) -> None:
+        super().report(frame, status, duration)
+        key = frame_key(frame)
+        self._times[key] = max(duration, self.min_time)
+        parent, const = self._parents.get(key, (None, None))
+        if parent is not None and const is not None and parent in self._times:
+            self._growth.setdefault(const, []).append(self._times[key] / self._times[parent])
+
+
+class FrameJobs:
+    """
+    Frames of a schedule to be searched along with their budget.
+
+    Frames interrupted by their budget are collected in interrupted. With a growth factor, they are searched again
+    with their budget multiplied by it once the schedule is exhausted and no frame is being searched anymore, until no
+    frame is interrupted. Interrupted frames dominated by a completely searched frame or whose lower bound is not below
+    the cost of the incumbent are dropped.
+    """
+
+    def __init__(self, budget: Budget = Budget(), growth: Optional[float] = None) -> None:
+        self.budget = budget
+        self.growth = growth
+        self.interrupted: List[Tuple[Frame, Budget]] = []
+        self.scheduler: Optional[FrameScheduler] = None
+        self._retries: Deque[Tuple[Frame, Budget]] = deque()
+        self._exhausted = False
+
+    def start(self, scheduler: FrameScheduler) -> None:
+        """
+        Start taking the frames of the scheduler.
+
+        A budget only grows if the growth factor is above one and no limit is zero, otherwise interrupted frames would
+        be searched again forever.
+        """
+        if self.growth is not None and (self.growth <= 1.0 or 0 in self.budget):
+            raise ValueError("A budget only grows with a growth factor above 1 and limits above 0.")
+        self.scheduler = scheduler
+        self._retries.clear()
+        self._exhausted = False
+
+    def take(self, count: int, idle: bool = True) -> List[Tuple[Frame, Budget]]:
+        """
+        Return up to the given number of frames to be searched next along with their budget. Interrupted frames are
+        only searched again if no frame is being searched, as indicated by idle, since frames being searched may still
+        be interrupted. An empty list is returned once the search is over, unless frames are being searched.
+        """
+        assert self.scheduler is not None
+        jobs: List[Tuple[Frame, Budget]] = []
+        while len(jobs) < count:
+            frame = None if self._exhausted else self.scheduler.next_frame()
+            if frame is not None:
+                jobs.append((frame, self.budget))
+                continue
+            self._exhausted = True
+            if not self._retries and idle and not jobs:
+                self._requeue()
+            if not self._retries:
+                break
+            frame, budget = self._retries.popleft()
+            if not self.scheduler.dominated(frame) and not self.scheduler.bounded(frame):
+                jobs.append((frame, budget))
+        return jobs
+
+    def _requeue(self) -> None:
+        assert self.scheduler is not None
+        if self.growth is not None and not self.scheduler.optimal():
+            growth = self.growth
+            self._retries.extend((frame, budget.scaled(growth)) for frame, budget in self.interrupted)
+            self.interrupted = []
+
+    def __iter__(self) -> Iterator[Tuple[Frame, Budget]]:
+        jobs = self.take(1)
+        while jobs:
+            yield jobs[0]
+            jobs = self.take(1)
+
+
+strategies: Dict[str, Type[FrameScheduler]] = {
+    "round-robin": RoundRobinScheduler,
+    "breadth-first": BreadthFirstScheduler,
+    "cheapest": CheapestFirstScheduler,
+}
+
+
+def make_scheduler(
+    strategy: str,
+    init_frame: Frame,
+    frame_deltas: Frame,
+    max_frames: Optional[int] = None,
+    *,
+    rounds_per_turn: int = 5,
+    max_rounds: int = 20,
+) -> FrameScheduler:
+    """
+    Return the scheduler of the strategy with the given name.
+
+    The round robin schedule ends after the given number of rounds, while the other strategies never run out of
+    frames. Unless a maximum number of frames is given, they stop after as many frames as the round robin schedule
+    has, so that a search ends even if the lower bound is never met.
+    """
+    if strategy == "round-robin":
+        return RoundRobinScheduler(init_frame, frame_deltas, max_frames, rounds_per_turn, max_rounds)
+    if max_frames is None:
+        round_robin = RoundRobinScheduler(init_frame, frame_deltas, None, rounds_per_turn, max_rounds)
+        max_frames = sum(1 for _ in round_robin)
+    return strategies[strategy](init_frame, frame_deltas, max_frames)
+
+
+class FrameSchedule:
+    """
+    Schedule of frames by the strategy with the given name, starting from the initial frame and growing it by the
+    frame deltas, optionally stopping after the given number of frames.
+    """
+
+    def __init__(
+        self,
+        init_frame: Frame,
+        frame_deltas: Frame,
+        strategy: str = "round-robin",
+        max_frames: Optional[int] = None,
+        *,
+        rounds_per_turn: int = 5,
+        max_rounds: int = 20,
+    ) -> None:
+        self.init_frame = init_frame
+        self.frame_deltas = frame_deltas
+        self.strategy = strategy
+        self.max_frames = max_frames
+        self.rounds_per_turn = rounds_per_turn
+        self.max_rounds = max_rounds
+
+    def scheduler(self) -> FrameScheduler:
+        """
+        Return a new scheduler of the frames.
+        """
+        return make_scheduler(
+            self.strategy,
+            self.init_frame,
+            self.frame_deltas,
+            self.max_frames,
+            rounds_per_turn=self.rounds_per_turn,
+            max_rounds=self.max_rounds,
+        )
@@ -0,0 +1,295 @@
+"""
+Grounding of the search encodings for a frame.
+
+The encodings are resolved as resources of the installed package. Files are parsed once per process, and the parsed
+statements are added to the control of every frame.
+
+Ground programs can be cached on disk in aspif form, so that frames grounded in an earlier run are loaded instead of
+grounded again.
+
+The substitution groups of the standard meta-interpreter are generated in Python as a flat table for the frame and
+added as facts before grounding, instead of being built by chains of nested terms in the encoding. A group assigns an
+object to every variable, so a rule only fires for complete substitutions of its variables. The table is the product
+of the variables and the candidate objects and is not narrowed by type: the types of the variables are chosen when
+solving, independently of each other, so every assignment is type consistent under some choice of types. The encoding
+keeps only the groups whose assignments are consistent with the types chosen.
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+from importlib import resources
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import clingo
+from clingo import ast
+from clingo.ast import ASTType
+from clingo.backend import Observer
+from clingo.control import BackendType, Control
+from clingo.symbol import Function, Number, Symbol
+
+from .lazy import RulePropagator
+
+Frame = Dict[str, int]
+
+asp_files_dir = Path(str(resources.files("apperception_clingo").joinpath("asp")))
+
+meta_interpreters = {
+    "std": asp_files_dir / "meta-int" / "standard" / "meta.lp",
+    "bd": asp_files_dir / "meta-int" / "body-decoupled" / "meta.lp",
+    "bd-reach": asp_files_dir / "meta-int" / "body-decoupled" / "meta-reach.lp",
+    "bd-tight": asp_files_dir / "meta-int" / "body-decoupled" / "meta-tight.lp",
+    "bd-tight-reach": asp_files_dir / "meta-int" / "body-decoupled" / "meta-tight-reach.lp",
+    "lazy": asp_files_dir / "meta-int" / "lazy" / "meta.lp",
+}
+
+include_re = re.compile(r'#include\s*"([^"]*)"\s*\.')
+
+
+@lru_cache(maxsize=16)
+def parse_files(files: Tuple[str, ...]) -> List[ast.AST]:
+    """
+    Return the statements of the files and the files they include, parsing them only on the first call per process.
+    """
+    statements: List[ast.AST] = []
+    ast.parse_files(files, statements.append)
+    return statements
+
+
+def add_files(ctl: Control, files: Sequence[str]) -> None:
+    """
+    Add the parsed statements of the files to the control.
+    """
+    with ast.ProgramBuilder(ctl) as builder:
+        for statement in parse_files(tuple(files)):
+            builder.add(statement)
+
+
+def const_program(frame: Frame) -> str:
+    """
+    Return a program overriding the constants with the values of the frame.
+    """
+    return "".join(f"#const {const} = {val}. [override]\n" for const, val in frame.items())
+
+
+def uses_interpreter(files: Sequence[str], interpreter: str) -> bool:
+    """
+    Return whether the files include the encoding of the given meta-interpreter.
+    """
+    path = meta_interpreters[interpreter].resolve()
+    return any(Path(f).resolve() == path for f in files)
+
+
+@lru_cache(maxsize=16)
+def fact_terms(files: Tuple[str, ...], name: str, program: str = "") -> List[Symbol]:
+    """
+    Return the terms given by facts of the unary predicate with the given name of the files and the additional program,
+    grounding only their facts.
+    """
+    statements = list(parse_files(files))
+    ast.parse_string(program, statements.append)
+    ctl = Control()
+    with ast.ProgramBuilder(ctl) as builder:
+        for statement in statements:
+            if statement.ast_type in (ASTType.Definition, ASTType.Program) or (
+                statement.ast_type == ASTType.Rule and not statement.body
+            ):
+                builder.add(statement)
+    ctl.ground()
+    return sorted(Function(name, [atom.symbol.arguments[0]]) for atom in ctl.symbolic_atoms.by_signature(name, 1))
+
+
+def substitution_table(files: Sequence[str], frame: Frame, program: str = "") -> List[Tuple[int, Symbol, Symbol]]:
+    """
+    Return the rows (S,V,O) of the substitution groups S of the frame, assigning an object O to each variable V.
+
+    The variables are the variables given by facts and the generated variables of the frame, and the candidate objects
+    are the objects of the instance and the generated objects of the frame, both without duplicates.
+    """
+    generated_vars = [Function("var", [Number(var)]) for var in range(1, frame["gen_vars"] + 1)]
+    variables = list(dict.fromkeys(fact_terms(tuple(files), "var", program) + generated_vars))
+    generated = [Function("obj", [Number(obj)]) for obj in range(1, frame.get("gen_objs", 0) + 1)]
+    objects = list(dict.fromkeys(fact_terms(tuple(files), "obj", program) + generated))
+    return [
+        (group, var, obj)
+        for group, assignment in enumerate(product(objects, repeat=len(variables)), 1)
+        for var, obj in zip(variables, assignment)
+    ]
+
+
+def substitution_facts(files: Sequence[str], frame: Frame, program: str = "") -> List[Symbol]:
+    """
+    Return the facts subs_group(S,V,O) of the substitution table of the frame and the fact subs_tables if the files
+    use the standard meta-interpreter, so that its encoding does not build the groups itself.
+    """
+    if "gen_vars" not in frame or not uses_interpreter(files, "std"):
+        return []
+    return [Function("subs_tables")] + [
+        Function("subs_group", [Number(group), var, obj])
+        for group, var, obj in substitution_table(files, frame, program)
+    ]
+
+
+def add_facts(ctl: Control, facts: Sequence[Symbol]) -> None:
+    """
+    Add the facts through the backend.
+
+    The facts have to be added before any statements, since statements added earlier are otherwise reported as not
+    occurring in the program.
+    """
+    with ctl.backend() as backend:
+        for fact in facts:
+            backend.add_rule([backend.add_atom(fact)])
+
+
+class GroundCache(NamedTuple):
+    """
+    Cache of ground programs in the given directory, whose total size is limited to the given number of MB by
+    evicting the least recently used programs. A size of None means that the cache is not limited.
+    """
+
+    directory: Path
+    size: Optional[int] = None
+
+    def key(self, files: Sequence[str], frame: Frame, program: str = "") -> str:
+        """
+        Return the key of the ground program of the files and the additional program under the constants of the
+        frame.
+
+        The key covers the contents of the files including the files they include, the additional program, the
+        constants and the clingo version.
+        """
+        digest = hashlib.sha256(clingo.__version__.encode())
+        seen: Set[Path] = set()
+        for path in files:
+            for f in _included_files(Path(path), seen):
+                digest.update(str(f).encode())
+                digest.update(f.read_bytes())
+        digest.update(program.encode())
+        digest.update(const_program(dict(sorted(frame.items()))).encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """
+        Return the path of the ground program with the given key.
+        """
+        return self.directory / f"{key}.aspif"
+
+    def store(self, files: Sequence[str], frame: Frame, key: str, program: str = "") -> None:
+        """
+        Ground the files and the additional program under the constants of the frame, and store the result under the
+        given key.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{key}.{os.getpid()}.tmp"
+        ctl = Control()
+        ctl.register_backend(BackendType.Aspif, str(tmp_path), replace=True)
+        add_files(ctl, files)
+        # atoms added through the backend would be shown in the aspif program
+        facts = "".join(f"{fact}.\n" for fact in substitution_facts(files, frame, program))
+        ctl.add(program + facts + const_program(frame))
+        ctl.ground()
+        # the program is only written completely once the step ends
+        ctl.solve()
+        del ctl
+        os.replace(tmp_path, self.path(key))
+        self.evict(key)
+
+    def evict(self, keep: str) -> None:
+        """
+        Remove least recently used programs until the cache fits its size, except for the program with the given key.
+        """
+        if self.size is None:
+            return
+        entries = sorted(self.directory.glob("*.aspif"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for entry in entries:
+            if total <= self.size * 2**20:
+                break
+            if entry != self.path(keep):
+                total -= entry.stat().st_size
+                entry.unlink()
+
+    def load(self, files: Sequence[str], frame: Frame, args: Sequence[str], program: str = "") -> Control:
+        """
+        Return a control with the cached ground program of the files and the additional program under the constants
+        of the frame, grounding and storing the program first if it is not cached yet.
+        """
+        key = self.key(files, frame, program)
+        path = self.path(key)
+        if path.exists():
+            print(f"Loading ground program from cache: {path}")
+            os.utime(path)
+        else:
+            self.store(files, frame, key, program)
+        ctl = Control(args)
+        ctl.load_aspif([str(path)])
+        return ctl
+
+
+class GroundCacheOptions:
+    """
+    Directory and size limit of the ground cache, which is only used if a directory is given.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, size: Optional[int] = None) -> None:
+        self.directory = directory
+        self.size = size
+
+    @property
+    def cache(self) -> Optional[GroundCache]:
+        """
+        The ground cache, or None if no directory is given.
+        """
+        if self.directory is None:
+            return None
+        return GroundCache(self.directory, self.size)
+
+
+def _included_files(path: Path, seen: Set[Path]) -> Iterator[Path]:
+    """
+    Yield the file and all files it includes that have not been seen yet.
+    """
+    path = path.resolve()
+    if path in seen:
+        return
+    seen.add(path)
+    yield path
+    for include in include_re.findall(path.read_text(encoding="utf-8")):
+        yield from _included_files(path.parent / include, seen)
+
+
+def ground(
+    files: Sequence[str],
+    frame: Frame,
+    args: Sequence[str],
+    *,
+    cache: Optional[GroundCache] = None,
+    program: str = "",
+    observer: Optional[Observer] = None,
+) -> Control:
+    """
+    Return a control with the given files and the additional program grounded under the constants of the frame,
+    using the cache if given. The observer is registered before grounding if given.
+
+    The propagator of the lazy meta-interpreter is registered if the files use it. It needs the symbols of the atoms
+    it checks, which are not kept in cached programs, so the cache cannot be used with it.
+    """
+    lazy = uses_interpreter(files, "lazy")
+    if cache is not None:
+        if lazy:
+            raise ValueError("The lazy meta-interpreter cannot be used with a ground cache.")
+        return cache.load(files, frame, args, program)
+    ctl = Control(args)
+    if observer is not None:
+        ctl.register_observer(observer)
+    if lazy:
+        ctl.register_propagator(RulePropagator())
+    add_facts(ctl, substitution_facts(files, frame, program))
+    add_files(ctl, files)
+    ctl.add(program + const_program(frame))
+    ctl.ground()
+    return ctl
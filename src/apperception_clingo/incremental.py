@@ -0,0 +1,51 @@
+"""
+Incremental grounding of frames.
+
+Instead of grounding every frame from scratch, a ceiling frame a number of steps of the frame deltas ahead is grounded
+once with the incremental core encoding, and each frame up to the ceiling is switched on by assigning the externals
+frame/2. The control is only ground again once a frame exceeds the ceiling.
+"""
+
+from typing import Callable, Optional, Sequence
+
+from clingo.control import Control
+from clingo.symbol import Function, Number, String
+
+from .grounding import Frame, ground
+
+
+class IncrementalGrounding:
+    """
+    Long-lived control for the frames of a search, grounded with a ceiling the given number of frame deltas ahead of
+    the frame that exceeds the previous ceiling.
+    """
+
+    def __init__(self, lookahead: int, deltas: Frame) -> None:
+        self.lookahead = lookahead
+        self.deltas = deltas
+        self.ceiling: Frame = {}
+        self._ctl: Optional[Control] = None
+
+    def reset(self) -> None:
+        """
+        Release the control, so that the next frame is ground again.
+        """
+        self._ctl = None
+
+    def control(
+        self, files: Sequence[str], frame: Frame, args: Sequence[str], program: Callable[[Frame], str]
+    ) -> Control:
+        """
+        Return the control with the externals set to the given frame, grounding the files with the given clingo
+        options and the additional program of the ceiling first if the frame exceeds the current one.
+        """
+        if self._ctl is None or any(val > self.ceiling[key] for key, val in frame.items()):
+            self.ceiling = {key: val + self.lookahead * self.deltas.get(key, 0) for key, val in frame.items()}
+            print(f"Grounding frame ceiling:\n{self.ceiling}")
+            # release the previous ground program before building the next one
+            self._ctl = None
+            self._ctl = ground(files, self.ceiling, args, program=program(self.ceiling))
+        for const, ceil in self.ceiling.items():
+            for val in range(1, ceil + 1):
+                self._ctl.assign_external(Function("frame", [String(const), Number(val)]), val <= frame[const])
+        return self._ctl
@@ -0,0 +1,110 @@
+"""
+Decoding of models into unified interpretations.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from clingo.symbol import Symbol, SymbolType, parse_term
+
+from .stats import SerializedInterpretation
+
+Interpretation = Dict[str, Dict[int, List[Symbol]]]
+
+signatures = [
+    ("type", 1),
+    ("obj", 1),
+    ("var", 1),
+    ("pred", 2),
+    ("isa", 2),
+    ("xor", 2),
+    ("exist", 1),
+    ("rule_head", 2),
+    ("rule_body", 2),
+    ("init", 1),
+    ("num_incorrect", 1),
+]
+
+
+def decode(symbols: Sequence[Symbol]) -> Interpretation:
+    """
+    Group the shown symbols of a model by signature in a single pass.
+    """
+    interpretation: Interpretation = {name: {arity: []} for name, arity in signatures}
+    by_signature: Dict[Tuple[str, int], List[Symbol]] = {
+        (name, arity): interpretation[name][arity] for name, arity in signatures
+    }
+    for symb in symbols:
+        if symb.type == SymbolType.Function:
+            group = by_signature.get((symb.name, len(symb.arguments)))
+            if group is not None:
+                group.append(symb)
+    return interpretation
+
+
+def rules(interpretation: Interpretation) -> List[str]:
+    """
+    Return the rules of the interpretation as strings, where causal rules use the arrow ::-.
+    """
+    bodies: Dict[Symbol, List[Symbol]] = {}
+    for body in interpretation["rule_body"][2]:
+        bodies.setdefault(body.arguments[0], []).append(body.arguments[1])
+    rule_strs = []
+    for rule_head in interpretation["rule_head"][2]:
+        rule_id = rule_head.arguments[0]
+        arrow = " ::- " if rule_id.match("causal", 1) else " :- "
+        rule_strs.append(str(rule_head.arguments[1]) + arrow + ", ".join(str(s) for s in bodies.get(rule_id, [])))
+    return rule_strs
+
+
+def format_interpretation(interpretation: Interpretation, rule_strs: Sequence[str], cost: int) -> str:
+    """
+    Return the interpretation with the given rules and cost formatted for printing.
+    """
+    num_incorrect = interpretation["num_incorrect"][1][0].arguments[0]
+    isa_dict = {isa.arguments[1]: isa.arguments[0] for isa in interpretation["isa"][2]}
+    separator = " "
+    lines = [
+        "-----------------------------------------------------------\n"
+        f"Found unified interpretation with cost {cost}. "
+        f"Number of incorrectly predicted hidden states: {num_incorrect}.",
+        "Types:",
+        separator.join([str(s) for s in interpretation["type"][1]]),
+        "Objects:",
+        separator.join([f"{symb}:{isa_dict[symb]}" for symb in interpretation["obj"][1]]),
+        "Variables:",
+        separator.join([f"{symb}:{isa_dict[symb]}" for symb in interpretation["var"][1]]),
+        "Predicates:",
+        separator.join([f"{symb}:{isa_dict[symb]}" for symb in interpretation["pred"][2]]),
+        "Constraints:",
+        separator.join([str(s) for s in interpretation["xor"][2]]),
+        separator.join([str(s) for s in interpretation["exist"][1]]),
+        "Initial State:",
+        separator.join([str(s.arguments[0]) for s in interpretation["init"][1]]),
+        "Rules:",
+        "\n".join(rule_strs),
+        "----------------------------------------------------------",
+    ]
+    return "\n".join(lines)
+
+
+def serialize(
+    interpretation: Interpretation, rule_strs: Sequence[str], cost: int, found_time: float
+) -> SerializedInterpretation:
+    """
+    Return the interpretation with the given rules, cost and the time it was found at in serializable form.
+    """
+    serialized: SerializedInterpretation = {
+        name: {arity: [str(symb) for symb in symbs] for arity, symbs in arity2symb.items()}
+        for name, arity2symb in interpretation.items()
+    }
+    serialized["rules"] = list(rule_strs)
+    serialized["cost"] = cost
+    serialized["time"] = found_time
+    return serialized
+
+
+def deserialize(serialized: SerializedInterpretation) -> List[Symbol]:
+    """
+    Return the shown symbols of a serialized interpretation, as read back from the stats.
+    """
+    return [parse_term(symb) for name, _ in signatures for symbs in serialized.get(name, {}).values() for symb in symbs]
@@ -0,0 +1,279 @@
+"""
+Lazy checking of the rules of unified interpretations by a propagator.
+
+The standard meta-interpreter grounds every substitution of every possible rule, and the body-decoupled ones avoid
+this by saturation and guessed substitutions, which add many auxiliary atoms. The lazy meta-interpreter only guesses
+which ground atoms hold, and a propagator checks the rules against the atoms holding once the rules are chosen.
+
+The propagator watches the literals of the atoms holding and of the rule choices, decides the rule choices before the
+atoms holding, and checks each fixpoint of propagation with all rules chosen. Substitutions are only searched by
+joining the body atoms of a rule with the atoms holding at a time step, and nogoods are added for the violations
+found:
+
+- a ground rule whose body holds at a time step requires its head to hold at the next time step, or at the same one
+  for static rules, and
+- a set of atoms that may hold at a time step, but are founded neither by inertia, nor by being an init atom at the
+  initial time step, nor by a rule whose body may hold outside of the set, must not hold.
+
+Nothing is checked on partial assignments of the rule choices, and the nogoods contain the rule choices they were
+found under. So a nogood only prunes the choices of the same rules, and proving that a frame has no unified
+interpretation enumerates every choice of rules, which makes the lazy meta-interpreter much slower than the others on
+unsatisfiable frames.
+
+Predicates, objects and variables are numbered when the propagator is initialized, so that checking does not handle
+symbols.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from clingo.propagator import Assignment, PropagateControl, PropagateInit, Propagator, PropagatorCheckMode
+from clingo.symbol import Symbol
+
+# atoms s(C,X) and s2(C,X1,X2) by the numbers of their predicate and arguments, which are variables for unground atoms
+Atom = Tuple[int, Tuple[int, ...]]
+# atoms at a time step by predicate
+Index = Dict[int, Set[Tuple[int, ...]]]
+Substitution = Dict[int, int]
+
+
+def _index(atoms: Set[Atom]) -> Index:
+    index: Index = {}
+    for pred, args in atoms:
+        index.setdefault(pred, set()).add(args)
+    return index
+
+
+def _ground(atom: Atom, substitution: Substitution) -> Atom:
+    pred, variables = atom
+    return pred, tuple(substitution[var] for var in variables)
+
+
+def matches(body: Sequence[Atom], index: Index, substitution: Optional[Substitution] = None) -> Iterator[Substitution]:
+    """
+    Yield the substitutions under which all atoms of the body are in the index.
+    """
+    substitution = {} if substitution is None else substitution
+    if not body:
+        yield substitution
+        return
+    (pred, variables), rest = body[0], body[1:]
+    for args in index.get(pred, ()):
+        extended = dict(substitution)
+        if all(extended.setdefault(var, arg) == arg for var, arg in zip(variables, args)):
+            yield from matches(rest, index, extended)
+
+
+class _Rule:  # pylint: disable=too-few-public-methods
+    """
+    Chosen rule, with the solver literals of the choices of its head and body atoms.
+    """
+
+    def __init__(
+        self, static: bool, head: Tuple[Atom, int], body: Sequence[Tuple[Atom, int]], others: Sequence[int]
+    ) -> None:
+        self.static = static
+        self.head, self.head_literal = head
+        # binary atoms bind more variables, so they are joined first
+        self.body = sorted((atom for atom, _ in body), key=lambda atom: -len(atom[1]))
+        # the rule has the chosen body atoms, and none of the others, which might not hold
+        self.choice = [self.head_literal, *(literal for _, literal in body), *(-literal for literal in others)]
+
+
+class RulePropagator(Propagator):
+    """
+    Propagator checking the chosen rules against the atoms holding.
+    """
+
+    def __init__(self) -> None:
+        self._numbers: Dict[Symbol, int] = {}
+        self._hold: Dict[int, Dict[Atom, int]] = {}
+        self._init: Dict[Atom, int] = {}
+        self._init_times: Set[int] = set()
+        # rule slots by whether they are static, with the literals of the slot, and of its head and body choices
+        self._slots: List[Tuple[bool, int, List[Tuple[Atom, int]], List[Tuple[Atom, int]]]] = []
+        self._choices: List[int] = []
+        # true literals and negations of false literals among the watched ones, by thread
+        self._assigned: List[Set[int]] = []
+
+    def _atom(self, symbol: Symbol) -> Atom:
+        numbers = [self._numbers.setdefault(argument, len(self._numbers)) for argument in symbol.arguments]
+        return numbers[0], tuple(numbers[1:])
+
+    def init(self, init: PropagateInit) -> None:
+        def literals(name: str, arity: int) -> Iterator[Tuple[Symbol, int]]:
+            for atom in init.symbolic_atoms.by_signature(name, arity):
+                yield atom.symbol, init.solver_literal(atom.literal)
+
+        # the literals are collected again on each call to solve, since the program may have changed in between
+        self._hold = {}
+        for symbol, literal in literals("hold", 2):
+            self._hold.setdefault(symbol.arguments[1].number, {})[self._atom(symbol.arguments[0])] = literal
+        self._init = {self._atom(symbol.arguments[0]): literal for symbol, literal in literals("init", 1)}
+        self._init_times = {symbol.arguments[0].number for symbol, _ in literals("init_time", 1)}
+        choices: Dict[str, Dict[Symbol, List[Tuple[Atom, int]]]] = {"rule_head": {}, "rule_body": {}}
+        for name, rules in choices.items():
+            for symbol, literal in literals(name, 2):
+                rules.setdefault(symbol.arguments[0], []).append((self._atom(symbol.arguments[1]), literal))
+        self._slots = [
+            (slot.name == "static", literal, choices["rule_head"].get(slot, []), choices["rule_body"].get(slot, []))
+            for slot, literal in ((symbol.arguments[0], literal) for symbol, literal in literals("rule", 1))
+        ]
+        self._choices = [literal for _, literal, _, _ in self._slots]
+        for rules in choices.values():
+            self._choices.extend(literal for rule in rules.values() for _, literal in rule)
+        watched = set(self._choices)
+        watched.update(literal for atoms in self._hold.values() for literal in atoms.values())
+        watched.update(self._init.values())
+        fixed = set()
+        for literal in watched:
+            if init.assignment.is_true(literal):
+                fixed.add(literal)
+            elif init.assignment.is_false(literal):
+                fixed.add(-literal)
+            else:
+                init.add_watch(literal)
+                init.add_watch(-literal)
+        self._assigned = [set(fixed) for _ in range(init.number_of_threads)]
+        init.check_mode = PropagatorCheckMode.Both
+
+    def propagate(self, control: PropagateControl, changes: Sequence[int]) -> None:
+        self._assigned[control.thread_id].update(changes)
+
+    def undo(self, thread_id: int, assignment: Assignment, changes: Sequence[int]) -> None:
+        self._assigned[thread_id].difference_update(changes)
+
+    def decide(self, thread_id: int, assignment: Assignment, fallback: int) -> int:
+        """
+        Decide the rule choices before the atoms holding, so that the rules can be checked early.
+        """
+        assigned = self._assigned[thread_id]
+        for literal in self._choices:
+            if literal not in assigned and -literal not in assigned:
+                return -literal
+        return fallback
+
+    def _rules(self, assigned: Set[int]) -> List[_Rule]:
+        """
+        Return the chosen rules.
+        """
+        rules = []
+        for static, literal, heads, bodies in self._slots:
+            chosen = [head for head in heads if head[1] in assigned]
+            if literal in assigned and chosen:
+                body = [body for body in bodies if body[1] in assigned]
+                others = [literal for _, literal in bodies if literal not in assigned]
+                rules.append(_Rule(static, chosen[0], body, others))
+        return rules
+
+    def _body_time(self, rule: _Rule, time: int) -> Optional[int]:
+        """
+        Return the time step of the body of the rule for its head at the given time step, or None if there is none.
+        """
+        if rule.static:
+            return time
+        return None if time in self._init_times or time - 1 not in self._hold else time - 1
+
+    def check(self, control: PropagateControl) -> None:
+        assigned = self._assigned[control.thread_id]
+        if any(literal not in assigned and -literal not in assigned for literal in self._choices):
+            return
+        holds = {time: {atom for atom, lit in atoms.items() if lit in assigned} for time, atoms in self._hold.items()}
+        possible = {
+            time: {atom for atom, lit in atoms.items() if -lit not in assigned} for time, atoms in self._hold.items()
+        }
+        rules = self._rules(assigned)
+        nogoods = list(self._unsatisfied(rules, holds))
+        for time in sorted(possible):
+            nogoods.extend(self._unfounded(assigned, rules, possible, time))
+        for nogood in nogoods:
+            if not control.add_nogood(nogood):
+                return
+        control.propagate()
+
+    def _unsatisfied(self, rules: Sequence[_Rule], holds: Dict[int, Set[Atom]]) -> Iterator[List[int]]:
+        """
+        Yield the nogoods of ground rules whose body holds and whose head does not hold yet.
+        """
+        indices = {time: _index(atoms) for time, atoms in holds.items()}
+        for rule in rules:
+            for time in holds:
+                body_time = self._body_time(rule, time)
+                if body_time is None:
+                    continue
+                for substitution in matches(rule.body, indices[body_time]):
+                    head = _ground(rule.head, substitution)
+                    if head in holds[time]:
+                        continue
+                    nogood = list(rule.choice)
+                    nogood.extend(self._hold[body_time][_ground(atom, substitution)] for atom in rule.body)
+                    if head in self._hold[time]:
+                        nogood.append(-self._hold[time][head])
+                    yield nogood
+
+    def _founded(
+        self, assigned: Set[int], rules: Sequence[_Rule], possible: Dict[int, Set[Atom]], time: int
+    ) -> Set[Atom]:
+        """
+        Return the atoms that may hold at the time step and may be founded.
+        """
+        if time in self._init_times:
+            founded = {atom for atom in possible[time] if atom in self._init and -self._init[atom] not in assigned}
+        else:
+            founded = possible[time] & possible.get(time - 1, set())
+        for rule in rules:
+            body_time = self._body_time(rule, time)
+            if not rule.static and body_time is not None:
+                founded.update(_ground(rule.head, subs) for subs in matches(rule.body, _index(possible[body_time])))
+        founded &= possible[time]
+        size = None
+        while size != len(founded):
+            size = len(founded)
+            index = _index(founded)
+            for rule in rules:
+                if rule.static:
+                    founded.update(_ground(rule.head, subs) for subs in matches(rule.body, index))
+            founded &= possible[time]
+        return founded
+
+    def _unfounded(
+        self, assigned: Set[int], rules: Sequence[_Rule], possible: Dict[int, Set[Atom]], time: int
+    ) -> Iterator[List[int]]:
+        """
+        Yield the loop nogoods of the atoms that may hold at the time step but cannot be founded.
+
+        Besides an unfounded atom, the nogoods contain the rule choices, and for rules with a head of the predicate
+        of an unfounded atom, the atoms of the predicates of their bodies that do not hold.
+        """
+        unfounded = possible[time] - self._founded(assigned, rules, possible, time)
+        if not unfounded:
+            return
+        initial = time in self._init_times
+        reason: List[int] = []
+        for atom in unfounded:
+            if initial and atom in self._init:
+                reason.append(-self._init[atom])
+            elif not initial and atom in self._hold.get(time - 1, {}):
+                reason.append(-self._hold[time - 1][atom])
+        preds = {pred for pred, _ in unfounded}
+        for static, literal, heads, bodies in self._slots:
+            if initial and not static:
+                continue
+            if literal not in assigned:
+                reason.append(-literal)
+                continue
+            chosen = [head for head in heads if head[1] in assigned]
+            reason.extend(head_literal for _, head_literal in chosen)
+            if not chosen or chosen[0][0][0] not in preds:
+                continue
+            body_atoms = self._hold.get(time if static else time - 1, {})
+            for (body_pred, _), body_literal in bodies:
+                if body_literal in assigned:
+                    reason.append(body_literal)
+                    reason.extend(
+                        -hold_literal
+                        for (pred, _), hold_literal in body_atoms.items()
+                        if pred == body_pred and -hold_literal in assigned
+                    )
+        reason = list(dict.fromkeys(reason))
+        for atom in sorted(unfounded):
+            yield [self._hold[time][atom], *reason]
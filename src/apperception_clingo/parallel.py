@@ -0,0 +1,116 @@
+"""
+Solving of frames in worker processes.
+
+The workers share the cost of the best unified interpretation found so far, so that a model found by one worker
+tightens the optimization bound of all the others.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from clingo.solving import Model
+from clingo.symbol import parse_term
+
+from .budget import Budget, peak_memory_usage, reset_peak_memory, solve
+from .grounding import Frame, GroundCache, ground
+from .stats import solver_statistics
+from .warmstart import add_sign_hints
+
+ModelMessage = Tuple[int, List[str], int, float]
+
+# state of the worker process, set by init_worker
+_WORKER: Dict[str, Any] = {}
+
+
+class FrameTask(NamedTuple):
+    """
+    Frame with the given index to be solved along with the additional program within the budget, using the ground
+    cache if given. The solver arguments are passed to the control, and the solver is warm started with the hints,
+    which are model symbols.
+    """
+
+    frame_index: int
+    files: Sequence[str]
+    frame: Frame
+    budget: Budget
+    cache: Optional[GroundCache] = None
+    solver_args: Sequence[str] = ()
+    hints: Sequence[str] = ()
+    program: str = ""
+
+
+def init_worker(best_cost: Any, models: Any, start_time: float) -> None:
+    """
+    Initialize a worker process.
+
+    The best cost is a shared multiprocessing value holding the cost of the best model found by any worker, and
+    models is a multiprocessing queue improving models are reported to.
+    """
+    _WORKER.update(best_cost=best_cost, models=models, start_time=start_time)
+
+
+def solve_frame(task: FrameTask) -> Tuple[int, Dict[str, Any]]:
+    """
+    Ground and solve the frame of the task to optimality.
+
+    Every model improving on the shared best cost is put into the model queue as a tuple of the frame index, the
+    shown symbols, the cost and the time it was found at. Whenever another worker improves on the best cost, solving
+    is restarted with the tighter bound, and the conflicts spent before count against the budget of the restart.
+    Returns the frame index along with the times grounding and solving ended, the status of the frame, the cost of the
+    best model the worker found and the statistics of the frame.
+    """
+    best_cost, models, start_time = _WORKER["best_cost"], _WORKER["models"], _WORKER["start_time"]
+    index, budget = task.frame_index, task.budget
+    reset_peak_memory()
+    ctl = ground(task.files, task.frame, ["--opt-mode=opt", *task.solver_args], cache=task.cache, program=task.program)
+    ground_end_time = time.time() - start_time
+    ground_memory = peak_memory_usage()
+    if task.hints:
+        add_sign_hints(ctl, [parse_term(s) for s in task.hints])
+    reset_peak_memory()
+    own_best = math.inf
+    frame_best: Optional[int] = None
+
+    def on_model(model: Model) -> None:  # nocoverage, called on the solver thread
+        nonlocal own_best, frame_best
+        cost = model.cost[0]
+        own_best = frame_best = cost
+        with best_cost.get_lock():
+            if cost < best_cost.value:
+                best_cost.value = cost
+                message: ModelMessage = (
+                    index,
+                    [str(symb) for symb in model.symbols(shown=True)],
+                    cost,
+                    time.time() - start_time,
+                )
+                models.put(message)
+
+    solve_start = time.time()
+    # conflicts of the cancelled solve calls, since the statistics of the control only cover the last one
+    conflicts = 0
+    while True:
+        own_best = best_cost.value
+        bound_str = f",{int(own_best) - 1}" if not math.isinf(own_best) else ""
+        ctl.configuration.solve.opt_mode = "opt" + bound_str  # type: ignore[union-attr]
+        remaining = budget._replace(
+            time=None if budget.time is None else budget.time - time.time() + solve_start,
+            conflicts=None if budget.conflicts is None else max(budget.conflicts - conflicts, 0),
+        )
+        status = solve(ctl, on_model, remaining, cancel=lambda: bool(best_cost.value < own_best))
+        if status != "cancelled":
+            break
+        conflicts += int(ctl.statistics["solving"]["solvers"]["conflicts"])
+    if status == "complete":
+        status = "optimal" if frame_best is not None else "unsatisfiable"
+    solve_end_time = time.time() - start_time
+    statistics = solver_statistics(ctl)
+    statistics["conflicts"] = conflicts + (statistics["conflicts"] or 0)
+    return index, {
+        "ground_end": ground_end_time,
+        "solve_end": solve_end_time,
+        "status": status,
+        "best_cost": frame_best,
+        "statistics": {**statistics, "ground_memory": ground_memory, "solve_memory": peak_memory_usage()},
+    }
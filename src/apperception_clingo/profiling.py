@@ -0,0 +1,142 @@
+"""
+Profiling of the ground programs of frames.
+
+A profiler observes grounding and counts the ground atoms and rules of each predicate signature, where a rule counts
+for the predicates of its head atoms. Each predicate is attributed to the encoding files with rules defining it, so
+that the ranked profile of a frame points at the parts of the encodings responsible for the size of its ground
+program.
+"""
+
+import os
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+
+from clingo import ast
+from clingo.ast import ASTType, UnaryOperator
+from clingo.backend import Observer
+from clingo.control import Control
+
+from .grounding import asp_files_dir, parse_files
+
+Profile = List[Dict[str, Any]]
+
+
+def signature_str(name: str, arity: int, positive: bool = True) -> str:
+    """
+    Return the string of a predicate signature, like hold/2 or -hold/2.
+    """
+    return f"{'' if positive else '-'}{name}/{arity}"
+
+
+def _file_name(filename: str) -> str:
+    """
+    Return the file name relative to the encodings of the package, or as given for other files.
+    """
+    path = Path(os.path.abspath(filename))
+    if path.is_relative_to(asp_files_dir):
+        return str(path.relative_to(asp_files_dir))
+    return filename
+
+
+def _atom_signature(term: ast.AST, positive: bool = True) -> Iterator[str]:
+    """
+    Yield the signature of the symbolic atom with the given term.
+    """
+    if term.ast_type == ASTType.UnaryOperation and term.operator_type == UnaryOperator.Minus:
+        yield from _atom_signature(term.argument, not positive)
+    elif term.ast_type == ASTType.Function:
+        yield signature_str(term.name, len(term.arguments), positive)
+    elif term.ast_type == ASTType.Pool:
+        for argument in term.arguments:
+            yield from _atom_signature(argument, positive)
+
+
+def _head_signatures(node: ast.AST) -> Iterator[str]:
+    """
+    Yield the signatures of the atoms in the head of a rule, skipping the conditions of conditional literals.
+    """
+    if node.ast_type == ASTType.SymbolicAtom:
+        yield from _atom_signature(node.symbol)
+        return
+    for key in node.child_keys:
+        if node.ast_type == ASTType.ConditionalLiteral and key == "condition":
+            continue
+        child = getattr(node, key)
+        if isinstance(child, ast.AST):
+            yield from _head_signatures(child)
+        elif child is not None:
+            for item in child:
+                yield from _head_signatures(item)
+
+
+@lru_cache(maxsize=16)
+def defining_files(files: Tuple[str, ...]) -> Dict[str, List[str]]:
+    """
+    Return the files with rules or external declarations defining each predicate of the program of the files.
+    """
+    defined: Dict[str, Set[str]] = {}
+    for statement in parse_files(files):
+        if statement.ast_type == ASTType.Rule:
+            signatures = _head_signatures(statement.head)
+        elif statement.ast_type == ASTType.External:
+            signatures = _head_signatures(statement.atom)
+        else:
+            continue
+        for signature in signatures:
+            defined.setdefault(signature, set()).add(_file_name(statement.location.begin.filename))
+    return {signature: sorted(names) for signature, names in defined.items()}
+
+
+class GroundingProfiler(Observer):
+    """
+    Observer counting the ground rules by head atom.
+    """
+
+    def __init__(self) -> None:
+        self._heads: "Counter[int]" = Counter()
+        self._constraints = 0
+
+    def _count(self, head: Sequence[int]) -> None:
+        if not head:
+            self._constraints += 1
+        self._heads.update(set(head))
+
+    def rule(self, choice: bool, head: Sequence[int], body: Sequence[int]) -> None:
+        self._count(head)
+
+    def weight_rule(self, choice: bool, head: Sequence[int], lower_bound: int, body: Sequence[Tuple[int, int]]) -> None:
+        self._count(head)
+
+    def profile(self, ctl: Control, files: Sequence[str]) -> Profile:
+        """
+        Return the ground atoms and rules of each predicate of the observed ground program of the files, ranked by
+        the number of rules and atoms. Rules whose head atoms are auxiliary are counted for #aux, and integrity
+        constraints for #false.
+        """
+        atoms: "Counter[str]" = Counter()
+        signatures: Dict[int, str] = {}
+        for name, arity, positive in ctl.symbolic_atoms.signatures:
+            signature = signature_str(name, arity, positive)
+            for symbolic_atom in ctl.symbolic_atoms.by_signature(name, arity, positive):
+                atoms[signature] += 1
+                signatures[symbolic_atom.literal] = signature
+        rules: "Counter[str]" = Counter()
+        for literal, count in self._heads.items():
+            rules[signatures.get(literal, "#aux")] += count
+        if self._constraints:
+            rules["#false"] = self._constraints
+        defined = defining_files(tuple(files))
+        return sorted(
+            (
+                {
+                    "predicate": signature,
+                    "files": defined.get(signature, []),
+                    "atoms": atoms[signature],
+                    "rules": rules[signature],
+                }
+                for signature in set(atoms) | set(rules)
+            ),
+            key=lambda row: (-row["rules"], -row["atoms"], row["predicate"]),
+        )
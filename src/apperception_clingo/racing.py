@@ -0,0 +1,212 @@
+"""
+Racing of meta-interpreters on frames.
+
+The meta-interpreters differ a lot in grounding and solving time depending on the frame: the standard one grounds
+substitutions of all variables at once, while the body-decoupled ones move this cost into solving. A race grounds and
+solves a frame with several meta-interpreters in worker processes sharing the best cost, keeps the result of the
+first one to search the frame completely and kills the others.
+
+The winners of races are recorded by the features of their frames, which are the number of objects, the number of
+variables and the maximum size of rule bodies. A frame whose features are close to the ones of recorded races is
+solved by the meta-interpreter that won most of them instead of racing.
+"""
+
+import json
+import math
+import multiprocessing
+import time
+from collections import Counter
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import SimpleQueue
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from clingo.control import Control
+
+from .budget import POLL_INTERVAL
+from .grounding import Frame, add_files
+from .parallel import FrameTask, ModelMessage, init_worker, solve_frame
+
+Features = Tuple[int, int, int]
+
+FrameResult = Dict[str, Any]
+
+
+def instance_objects(files: Sequence[str]) -> int:
+    """
+    Return the number of objects of the instance given by the files.
+    """
+    ctl = Control()
+    add_files(ctl, files)
+    ctl.ground()
+    return sum(1 for _ in ctl.symbolic_atoms.by_signature("obj", 1))
+
+
+def frame_features(frame: Frame, objects: int) -> Features:
+    """
+    Return the features of the frame for an instance with the given number of objects.
+    """
+    return objects + frame.get("gen_objs", 0), frame.get("gen_vars", 0), frame.get("rule_body_size_max", 0)
+
+
+class RaceTable:
+    """
+    Number of races won by each meta-interpreter by frame features, optionally persisted in a JSON file.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.wins: Dict[Features, Dict[str, int]] = {}
+        if path is not None and path.exists():
+            with path.open(encoding="utf-8") as f:
+                for key, wins in json.load(f).items():
+                    objects, variables, body_size = map(int, key.split(","))
+                    self.wins[(objects, variables, body_size)] = wins
+
+    def record(self, features: Features, interpreter: str) -> None:
+        """
+        Record that the meta-interpreter won the race on a frame with the given features.
+        """
+        wins = self.wins.setdefault(features, {})
+        wins[interpreter] = wins.get(interpreter, 0) + 1
+        if self.path is not None:
+            with self.path.open("w", encoding="utf-8") as f:
+                json.dump({",".join(map(str, key)): wins for key, wins in self.wins.items()}, f)
+
+    def select(self, features: Features, interpreters: Sequence[str]) -> Optional[str]:
+        """
+        Return the meta-interpreter among the given ones that won most races on frames whose features differ by at
+        most one from the given ones, or None if there are no such races.
+        """
+        counts: Counter[str] = Counter()
+        for recorded, wins in self.wins.items():
+            if sum(abs(a - b) for a, b in zip(recorded, features)) <= 1:
+                counts.update({name: wins.get(name, 0) for name in interpreters})
+        if not counts or max(counts.values()) == 0:
+            return None
+        return max(interpreters, key=lambda name: counts[name])
+
+
+class Racing:
+    """
+    Racing of the given meta-interpreters on the frames of a search, recording the winners in the table at the given
+    path if any. The table and the number of objects of the instance are loaded once the instance is known.
+    """
+
+    def __init__(self, interpreters: Sequence[str] = (), table_path: Optional[Path] = None) -> None:
+        self.interpreters = list(interpreters)
+        self.table_path = table_path
+        self.table = RaceTable()
+        self.objects = 0
+
+    def load(self, files: Sequence[str]) -> None:
+        """
+        Load the table of winners and count the objects of the instance given by the files.
+        """
+        self.objects = instance_objects(files)
+        self.table = RaceTable(self.table_path)
+
+    def racers(self, frame: Frame) -> Tuple[Features, List[str]]:
+        """
+        Return the features of the frame along with the meta-interpreters to race on it, which is only the one that
+        won most races on similar frames if there is one.
+        """
+        features = frame_features(frame, self.objects)
+        selected = self.table.select(features, self.interpreters)
+        return features, self.interpreters if selected is None else [selected]
+
+
+class Race(NamedTuple):
+    """
+    State shared by the racers on a frame: the multiprocessing value holding the cost of the best model found by any
+    racer, the queues improving models and the results of the racers are put into, and the start time of the search.
+    """
+
+    best_cost: Any
+    models: Any
+    results: Any
+    start_time: float
+
+
+def race_worker(race: Race, name: str, task: FrameTask) -> None:
+    """
+    Solve the frame of the task in a racing process, and put the result into the results queue.
+    """
+    init_worker(race.best_cost, race.models, race.start_time)
+    result = solve_frame(task)[1]
+    with race.best_cost.get_lock():
+        race.results.put((name, result))
+
+
+def _cost(result: FrameResult) -> float:
+    return math.inf if result["best_cost"] is None else float(result["best_cost"])
+
+
+def _drain(models: "SimpleQueue[ModelMessage]", on_model: Callable[[ModelMessage], None]) -> None:
+    while not models.empty():
+        on_model(models.get())
+
+
+def _collect(results: "SimpleQueue[Tuple[str, FrameResult]]", finished: Dict[str, FrameResult]) -> Optional[str]:
+    """
+    Add the results in the queue to the finished ones, and return the first meta-interpreter among them that searched
+    the frame completely.
+    """
+    winner = None
+    while not results.empty():
+        name, result = results.get()
+        finished[name] = result
+        if winner is None and result["status"] in ("optimal", "unsatisfiable"):
+            winner = name
+    return winner
+
+
+def race_frame(
+    task: FrameTask,
+    racers: Dict[str, Tuple[List[str], List[str]]],
+    on_model: Callable[[ModelMessage], None],
+    start_time: float,
+    best_cost: Optional[int] = None,
+) -> Tuple[str, FrameResult]:
+    """
+    Race the meta-interpreters on the frame of the task, where racers maps each meta-interpreter to the files of its
+    program and its solver arguments replacing the ones of the task, and return the winner along with its result as
+    returned by solve_frame.
+
+    Models improving on the given best cost are passed to on_model as they arrive. The winner is the first
+    meta-interpreter to search the frame completely. If none does within the budget, the one with the best cost found
+    is returned.
+    """
+    shared_cost = multiprocessing.Value("d", math.inf if best_cost is None else best_cost)
+    models: "SimpleQueue[ModelMessage]" = multiprocessing.SimpleQueue()
+    results: "SimpleQueue[Tuple[str, FrameResult]]" = multiprocessing.SimpleQueue()
+    race = Race(shared_cost, models, results, start_time)
+    processes: Dict[str, BaseProcess] = {}
+    for name, (files, solver_args) in racers.items():
+        racer_task = task._replace(files=files, solver_args=solver_args)
+        processes[name] = multiprocessing.Process(target=race_worker, args=(race, name, racer_task))
+        processes[name].start()
+    finished: Dict[str, FrameResult] = {}
+    winner = None
+    while winner is None and any(process.is_alive() for process in processes.values()):
+        time.sleep(POLL_INTERVAL)
+        _drain(models, on_model)
+        winner = _collect(results, finished)
+    # the racers write to the queues only while holding the lock of the shared cost, so that killing them does not
+    # leave a message partially written
+    lock = shared_cost.get_lock()
+    while not lock.acquire(timeout=POLL_INTERVAL):
+        _drain(models, on_model)  # nocoverage, a racer is blocked writing a model
+    try:
+        for process in processes.values():
+            process.terminate()
+            process.join()
+    finally:
+        lock.release()
+    _drain(models, on_model)
+    winner = winner or _collect(results, finished)
+    if winner is not None:
+        return winner, finished[winner]
+    if not finished:
+        raise RuntimeError(f"All meta-interpreters failed on frame {task.frame}")
+    return min(finished.items(), key=lambda item: _cost(item[1]))
@@ -0,0 +1,96 @@
+"""
+Reporting of the unified interpretations found while searching frames.
+
+Models are queued as they are found, which may happen on the solver thread or in worker processes, and are decoded,
+printed and recorded on the main thread.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Sequence, Tuple
+
+from clingo.symbol import Symbol
+
+from .interpretation import Interpretation, decode, deserialize, format_interpretation, rules, serialize
+from .stats import SerializedInterpretation
+
+# shown symbols of a model, its cost, the time it was found at and the index of its frame
+ModelRecord = Tuple[Sequence[Symbol], int, float, int]
+
+model_outputs = ["all", "final-per-frame", "final-overall", "none"]
+
+
+class ModelReporter:
+    """
+    Reporter of models according to the model output, passing the serialized interpretation of each reported model
+    along with the index of its frame to the record callback.
+
+    Unless all models are output, only the last model of each frame is kept until the frame is finished.
+    """
+
+    def __init__(self, record: Callable[[int, SerializedInterpretation], None], output: str = "all") -> None:
+        self.output = output
+        self._record = record
+        self._queue: Deque[ModelRecord] = deque()
+        self._frame_models: Dict[int, ModelRecord] = {}
+        # cost and formatted interpretation of the best model reported, if only that one is output
+        self._final: Optional[Tuple[int, str]] = None
+
+    @property
+    def final_output(self) -> Optional[str]:
+        """
+        The formatted interpretation of the best model reported, if only that one is output.
+        """
+        return None if self._final is None else self._final[1]
+
+    def add(self, record: ModelRecord) -> None:
+        """
+        Queue a model found, which may be called on the solver thread.
+        """
+        self._queue.append(record)
+
+    def report(self) -> None:
+        """
+        Report the models queued since the last call.
+        """
+        while self._queue:
+            record = self._queue.popleft()
+            if self.output == "all":
+                self._report(*record)
+            else:
+                self._frame_models[record[3]] = record
+
+    def finish(self, index: int) -> None:
+        """
+        Report the last model of the finished frame with the given index, unless all models are output.
+        """
+        self.report()
+        record = self._frame_models.pop(index, None)
+        if record is not None:
+            self._report(*record)
+
+    def finish_all(self) -> None:
+        """
+        Report the last models of all frames, in the order of the frames.
+        """
+        self.report()
+        for index in sorted(self._frame_models):
+            self.finish(index)
+
+    def restore(self, interpretation: SerializedInterpretation) -> None:
+        """
+        Restore the best model from the serialized interpretation of an earlier run, without recording it.
+        """
+        self._keep_final(decode(deserialize(interpretation)), interpretation["rules"], interpretation["cost"])
+
+    def _keep_final(self, interpretation: Interpretation, rule_strs: Sequence[str], cost: int) -> None:
+        # frames solved concurrently finish in any order, so a model reported later may be worse
+        if self.output == "final-overall" and (self._final is None or cost < self._final[0]):
+            self._final = cost, format_interpretation(interpretation, rule_strs, cost)
+
+    def _report(self, symbols: Sequence[Symbol], cost: int, found_time: float, index: int) -> None:
+        interpretation = decode(symbols)
+        rule_strs = rules(interpretation)
+        if self.output in ("all", "final-per-frame"):
+            print(format_interpretation(interpretation, rule_strs, cost))
+        self._keep_final(interpretation, rule_strs, cost)
+        self._record(index, serialize(interpretation, rule_strs, cost, found_time))
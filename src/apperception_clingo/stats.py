@@ -0,0 +1,245 @@
+"""
+Logging of information about solving as a stream of JSON Lines records.
+
+Every record is an event of a frame, identified by the index of the frame in the order frames were started:
+
+- frame_start: the frame, the time it was started at and optionally the clingo options it is solved with and the
+  lower bound on its cost
+- ground_end: the time grounding of the frame ended at, and optionally statistics of grounding and the ranked
+  ground atoms and rules of the predicates
+- model: a unified interpretation found while solving the frame
+- solve_end: the time solving of the frame ended at, its status, the best cost found, and optionally the budget it
+  was solved with, the meta-interpreter that won the race on the frame along with its clingo options, and solver
+  statistics
+
+Running this module rebuilds the nested stats of a log and writes them as one JSON document.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from clingo.control import Control
+
+from .grounding import Frame
+
+SerializedInterpretation = Dict[str, Any]
+Stat = Dict[str, Union[Frame, float, List[SerializedInterpretation]]]
+Statistics = Dict[str, Optional[float]]
+
+
+def solver_statistics(ctl: Control) -> Statistics:
+    """
+    Return the size of the ground program of the last step and the search statistics of the last solve call.
+
+    The times are the time to the first model, the time spent proving optimality or unsatisfiability after the last
+    model and the total solving time.
+    """
+    stats = ctl.statistics
+    program, solvers, times = stats["problem"]["lpStep"], stats["solving"]["solvers"], stats["summary"]["times"]
+    return {
+        "atoms": program["atoms"],
+        "rules": program["rules"],
+        "bodies": program["bodies"],
+        "choices": solvers["choices"],
+        "conflicts": solvers["conflicts"],
+        "restarts": solvers["restarts"],
+        "sat_time": times["sat"],
+        "unsat_time": times["unsat"],
+        "solve_time": times["solve"],
+    }
+
+
+def _fields(stat: Stat, *names: str) -> Dict[str, Any]:
+    """
+    Return the given optional fields of the stats of a frame that are present.
+    """
+    return {name: stat[name] for name in names if name in stat}
+
+
+class StatsWriter:
+    """
+    Append-only writer of a stats log.
+
+    Records are buffered, and only flushed and synced to disk at frame boundaries.
+    """
+
+    def __init__(self, path: Path, stats: Sequence[Stat] = ()) -> None:
+        """
+        Start the log with the records of the given stats rebuilt from another log, which may be the same file.
+
+        The records are written to a temporary file that replaces the log once it is synced, so that the other log
+        is not lost if writing them is interrupted.
+        """
+        temporary = path.with_name(path.name + ".tmp")
+        self._file = temporary.open("w", encoding="utf-8")
+        for index, stat in enumerate(stats):
+            self.replay(index, stat)
+        self.close()
+        os.replace(temporary, path)
+        self._file = path.open("a", encoding="utf-8")
+
+    def write(self, event: str, index: int, **fields: Any) -> None:
+        """
+        Append a record of the given event of the frame with the given index.
+        """
+        self._file.write(json.dumps({"event": event, "index": index, **fields}) + "\n")
+
+    def replay(self, index: int, stat: Stat) -> None:
+        """
+        Append the records of the stats of a frame rebuilt from another log, as the frame with the given index.
+        """
+        self.write(
+            "frame_start",
+            index,
+            frame=stat["frame"],
+            time=stat["frame_start"],
+            **_fields(stat, "solver_args", "lower_bound"),
+        )
+        # the statistics of grounding and solving are merged in the stats, where grounding only records its memory
+        statistics: Statistics = stat.get("statistics", {})  # type: ignore[assignment]
+        ground_statistics = {key: val for key, val in statistics.items() if key == "ground_memory"}
+        solve_statistics = {key: val for key, val in statistics.items() if key != "ground_memory"}
+        if "ground_end" in stat:
+            fields = _fields(stat, "grounding_profile")
+            if ground_statistics:
+                fields["statistics"] = ground_statistics
+            self.write("ground_end", index, time=stat["ground_end"], **fields)
+        for interpretation in stat["unified_interpretations"]:  # type: ignore[union-attr]
+            self.write("model", index, interpretation=interpretation)
+        if "status" in stat:
+            fields = _fields(stat, "budget", "interpreter")
+            if "interpreter" in stat:
+                fields.update(_fields(stat, "solver_args"))
+            if solve_statistics:
+                fields["statistics"] = solve_statistics
+            self.write(
+                "solve_end", index, time=stat["solve_end"], status=stat["status"], best_cost=stat["best_cost"], **fields
+            )
+
+    def sync(self) -> None:
+        """
+        Flush the buffered records and sync them to disk.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Sync and close the log.
+        """
+        self.sync()
+        self._file.close()
+
+
+class StatsLog:
+    """
+    Stats log at the given path, which is only written if a path is given. The records are synced once solving of a
+    frame ends.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._writer: Optional[StatsWriter] = None
+
+    def open(self, stats: Sequence[Stat] = ()) -> None:
+        """
+        Start the log with the records of the given stats rebuilt from another log.
+        """
+        if self.path is not None:
+            self._writer = StatsWriter(self.path, stats)
+
+    def write(self, event: str, index: int, **fields: Any) -> None:
+        """
+        Append a record of the given event of the frame with the given index, if the log is open.
+        """
+        if self._writer is not None:
+            self._writer.write(event, index, **fields)
+            if event == "solve_end":
+                self._writer.sync()
+
+    def close(self) -> None:
+        """
+        Close the log if it is open.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _merge_statistics(stat: Stat, record: Dict[str, Any]) -> None:
+    if "statistics" in record:
+        stat.setdefault("statistics", {}).update(record["statistics"])  # type: ignore[union-attr]
+
+
+def _read_frame_start(stat: Stat, record: Dict[str, Any]) -> None:
+    stat["frame"] = record["frame"]
+    stat["frame_start"] = record["time"]
+    stat.update(_fields(record, "solver_args", "lower_bound"))
+
+
+def _read_ground_end(stat: Stat, record: Dict[str, Any]) -> None:
+    stat["ground_end"] = record["time"]
+    stat.update(_fields(record, "grounding_profile"))
+    _merge_statistics(stat, record)
+
+
+def _read_model(stat: Stat, record: Dict[str, Any]) -> None:
+    stat["unified_interpretations"].append(record["interpretation"])  # type: ignore[union-attr]
+
+
+def _read_solve_end(stat: Stat, record: Dict[str, Any]) -> None:
+    stat["solve_end"] = record["time"]
+    stat["status"] = record["status"]
+    stat["best_cost"] = record["best_cost"]
+    stat.update(_fields(record, "budget", "interpreter", "solver_args"))
+    _merge_statistics(stat, record)
+
+
+# readers of the records of each event, updating the stats of the frame of the record
+_READERS: Dict[str, Callable[[Stat, Dict[str, Any]], None]] = {
+    "frame_start": _read_frame_start,
+    "ground_end": _read_ground_end,
+    "model": _read_model,
+    "solve_end": _read_solve_end,
+}
+
+
+def read_stats(path: Path) -> List[Stat]:
+    """
+    Rebuild the stats of each frame from the records of a log.
+    """
+    stats: List[Stat] = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            index = record["index"]
+            while len(stats) <= index:
+                stats.append({"frame": {}, "unified_interpretations": []})
+            event = record["event"]
+            if event not in _READERS:
+                raise ValueError(f"Invalid event '{event}' in stats log {path}")
+            _READERS[event](stats[index], record)
+    return stats
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    """
+    Write the stats rebuilt from the log given as first argument as JSON to the file given as second argument, or to
+    standard output.
+    """
+    args = sys.argv[1:] if args is None else args
+    if len(args) not in (1, 2):
+        raise ValueError("Usage: python -m apperception_clingo.stats <log> [<json-file>]")
+    stats = read_stats(Path(args[0]))
+    if len(args) == 2:
+        with Path(args[1]).open("w", encoding="utf-8") as f:
+            json.dump(stats, f)
+    else:
+        json.dump(stats, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()  # nocoverage
@@ -0,0 +1,86 @@
+"""
+Streaming of sensory observations into the engine as they arrive.
+
+Observations are the senses/2 and hidden/2 facts of an instance, read line by line from the standard input or a Unix
+socket, either as JSON objects like {"senses": "s(pred(on,1),obj(a))", "time": 3} or as ASP facts. They are added
+to the timed facts of an instance, whose time steps are handed to the engine once all their observations were read.
+As the encodings are not split into steps, new time steps are not added to a persistent control, but grounded as
+windows like the chunks of window.py.
+"""
+
+import json
+import os
+import socket
+import sys
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, TextIO
+
+from clingo.symbol import Function, Number, Symbol, SymbolType, parse_term
+
+from .window import TimedInstance, timed_signatures
+
+
+def parse_observation(line: str) -> Optional[Symbol]:
+    """
+    Return the observation given by the line, or None if the line is empty or a comment.
+    """
+    line = line.strip()
+    if not line or line.startswith("%"):
+        return None
+    if line.startswith("{"):
+        record = json.loads(line)
+        names = [name for name, _ in timed_signatures if name in record]
+        if len(names) != 1 or "time" not in record:
+            raise ValueError(f"Invalid observation: {line}")
+        symbol = Function(names[0], [parse_term(record[names[0]]), Number(int(record["time"]))])
+    else:
+        symbol = parse_term(line.rstrip(".").rstrip())
+    if not any(symbol.match(name, arity) for name, arity in timed_signatures) or (
+        symbol.arguments[1].type != SymbolType.Number
+    ):
+        raise ValueError(f"Invalid observation: {line}")
+    return symbol
+
+
+def time_steps(instance: TimedInstance, lines: Iterable[str]) -> Iterator[int]:
+    """
+    Add the observations read from the lines to the timed facts of the instance, and yield each time step once all
+    its observations were read.
+
+    Observations have to arrive in the order of their time steps. A time step is complete once an observation of a
+    later time step arrives, or the lines are exhausted.
+    """
+    last = 0
+    pending = instance.horizon if instance.timed else 0
+    for line in lines:
+        observation = parse_observation(line)
+        if observation is None:
+            continue
+        step = observation.arguments[1].number
+        if step <= last:
+            raise ValueError(f"Observation of completed time step {step}: {observation}")
+        yield from range(last + 1, step)
+        last = step - 1
+        pending = max(pending, step)
+        instance.timed.setdefault(step, []).append(observation)
+    yield from range(last + 1, pending + 1)
+
+
+@contextmanager
+def open_stream(source: str) -> Iterator[TextIO]:
+    """
+    Open the source of a stream of observations, which is the standard input for -, and otherwise the path of a Unix
+    socket listening for a single connection.
+    """
+    if source == "-":
+        yield sys.stdin
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(source)
+        try:
+            server.listen(1)
+            conn, _ = server.accept()
+            with conn, conn.makefile("r", encoding="utf-8") as stream:
+                yield stream
+        finally:
+            os.unlink(source)
@@ -0,0 +1,269 @@
+"""
+Detection and breaking of symmetries of an instance before grounding.
+
+symmetry-breaking.lp only orders the generated entities, so objects and predicates that are interchangeable in the
+instance are still explored under every permutation. A symmetry of the instance is a permutation of its objects and
+predicates mapping its facts onto its facts. Applying a symmetry to a unified interpretation yields one of the same
+cost, so it suffices to search for interpretations that are lexicographically smallest among their images.
+
+The symmetries are found as automorphisms of a colored graph with a vertex per object, predicate and fact of the
+instance, where each occurrence of an object or predicate in a fact is a vertex colored by the fact with the
+occurrences blanked out and the index of the occurrence. The automorphisms are searched by color refinement and
+individualization, and each one found is checked before it is used.
+
+The lex-leader constraints of lex-leader.lp compare positions of an interpretation with their images in a fixed order.
+The positions are whether some causal or static rule has a head or body atom of a predicate of the instance, which is
+independent of the rule slots and variables, followed by the initial atoms of the frame.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from clingo.control import Control
+from clingo.symbol import Function, Number, Symbol, SymbolType
+
+from .grounding import Frame, add_files
+
+Permutation = Dict[Symbol, Symbol]
+
+# maximum number of nodes of the search for an automorphism mapping one vertex to another
+SEARCH_LIMIT = 1000
+
+
+def _is_entity(symbol: Symbol) -> bool:
+    return symbol.match("obj", 1) or (symbol.match("pred", 2) and symbol.arguments[1].type == SymbolType.Number)
+
+
+def _blank(symbol: Symbol, occurrences: List[Symbol]) -> Symbol:
+    """
+    Return the symbol with its objects and predicates replaced by blanks, which are appended to the occurrences.
+    """
+    if _is_entity(symbol):
+        occurrences.append(symbol)
+        return Function("_", [Function(symbol.name), *symbol.arguments[1:]])
+    if symbol.type == SymbolType.Function and symbol.arguments:
+        return Function(symbol.name, [_blank(argument, occurrences) for argument in symbol.arguments], symbol.positive)
+    return symbol
+
+
+class _Graph:
+    """
+    Colored graph with vertices numbered from zero.
+    """
+
+    def __init__(self) -> None:
+        self.colors: List[Symbol] = []
+        self.adjacency: List[Set[int]] = []
+
+    def add_vertex(self, color: Symbol) -> int:
+        """
+        Add a vertex of the given color, and return its number.
+        """
+        self.colors.append(color)
+        self.adjacency.append(set())
+        return len(self.colors) - 1
+
+    def add_edge(self, vertex: int, other: int) -> None:
+        """
+        Add an undirected edge.
+        """
+        self.adjacency[vertex].add(other)
+        self.adjacency[other].add(vertex)
+
+    def initial(self) -> List[int]:
+        """
+        Return the coloring of the vertices by rank of their color.
+        """
+        ranks = {color: rank for rank, color in enumerate(sorted(set(self.colors)))}
+        return [ranks[color] for color in self.colors]
+
+    def refine(self, coloring: List[int]) -> List[int]:
+        """
+        Return the coarsest equitable coloring refining the given one.
+
+        The colors are ranks of the colors of the vertices and their neighbors, so that refining colorings of
+        isomorphic graphs yields the same colors for corresponding vertices.
+        """
+        while True:
+            signatures = [
+                (color, tuple(sorted(coloring[other] for other in neighbors)))
+                for color, neighbors in zip(coloring, self.adjacency)
+            ]
+            ranks = {signature: rank for rank, signature in enumerate(sorted(set(signatures)))}
+            refined = [ranks[signature] for signature in signatures]
+            if len(ranks) == len(set(coloring)):
+                return refined
+            coloring = refined
+
+    def individualize(self, coloring: List[int], vertex: int) -> List[int]:
+        """
+        Return the refined coloring where the vertex has a color of its own.
+        """
+        individualized = list(coloring)
+        individualized[vertex] = len(coloring)
+        return self.refine(individualized)
+
+    def is_automorphism(self, permutation: List[int]) -> bool:
+        """
+        Return whether the permutation of the vertices maps colors and edges onto themselves.
+        """
+        return all(
+            self.colors[permutation[vertex]] == color
+            and {permutation[other] for other in neighbors} == self.adjacency[permutation[vertex]]
+            for vertex, (color, neighbors) in enumerate(zip(self.colors, self.adjacency))
+        )
+
+    def _extend(self, left: List[int], right: List[int], budget: List[int]) -> Optional[List[int]]:
+        """
+        Return an automorphism mapping the vertices of each color of the left coloring to the ones of the same color
+        of the right coloring, or None if none is found within the budget of search nodes.
+        """
+        budget[0] -= 1
+        if budget[0] < 0 or Counter(left) != Counter(right):
+            return None
+        sizes = Counter(left)
+        cell = min((color for color, size in sizes.items() if size > 1), default=None)
+        if cell is None:
+            image = {color: vertex for vertex, color in enumerate(right)}
+            permutation = [image[color] for color in left]
+            return permutation if self.is_automorphism(permutation) else None
+        individualized = self.individualize(left, left.index(cell))
+        for other in (other for other, color in enumerate(right) if color == cell):
+            extended = self._extend(individualized, self.individualize(right, other), budget)
+            if extended is not None:
+                return extended
+        return None
+
+    def automorphisms(self, targets: Sequence[int]) -> List[List[int]]:
+        """
+        Return automorphisms generating the permutations of the target vertices found, by searching for automorphisms
+        mapping a target vertex to each other one of its color outside its orbit, and then fixing the vertex.
+        """
+        generators: List[List[int]] = []
+        coloring = self.refine(self.initial())
+        while True:
+            sizes = Counter(coloring[vertex] for vertex in targets)
+            cell = min((color for color, size in sizes.items() if size > 1), default=None)
+            if cell is None:
+                return generators
+            vertex = min(vertex for vertex in targets if coloring[vertex] == cell)
+            individualized = self.individualize(coloring, vertex)
+            orbit = {vertex}
+            for other in targets:
+                if coloring[other] != cell or other in orbit:
+                    continue
+                permutation = self._extend(individualized, self.individualize(coloring, other), [SEARCH_LIMIT])
+                if permutation is not None:
+                    generators.append(permutation)
+                    orbit = _orbit(vertex, generators)
+            coloring = individualized
+
+
+def _orbit(vertex: int, generators: Sequence[List[int]]) -> Set[int]:
+    """
+    Return the orbit of the vertex under the group generated by the permutations.
+    """
+    orbit, queue = {vertex}, [vertex]
+    while queue:
+        current = queue.pop()
+        for generator in generators:
+            if generator[current] not in orbit:
+                orbit.add(generator[current])
+                queue.append(generator[current])
+    return orbit
+
+
+def instance_facts(files: Sequence[str]) -> List[Symbol]:
+    """
+    Return the facts of the instance given by the files.
+    """
+    ctl = Control()
+    add_files(ctl, files)
+    ctl.ground()
+    return sorted(atom.symbol for atom in ctl.symbolic_atoms if atom.is_fact)
+
+
+def symmetries(facts: Sequence[Symbol]) -> List[Permutation]:
+    """
+    Return permutations of the objects and predicates generating symmetries of the facts, leaving out the objects and
+    predicates each permutation fixes.
+    """
+    graph = _Graph()
+    entities: Dict[Symbol, int] = {}
+    for fact in facts:
+        occurrences: List[Symbol] = []
+        blanked = _blank(fact, occurrences)
+        if not occurrences:
+            continue
+        vertex = graph.add_vertex(Function("fact", [blanked]))
+        for index, entity in enumerate(occurrences):
+            if entity not in entities:
+                entities[entity] = graph.add_vertex(Function("entity", [_blank(entity, [])]))
+            occurrence = graph.add_vertex(Function("occurrence", [blanked, Number(index)]))
+            graph.add_edge(vertex, occurrence)
+            graph.add_edge(occurrence, entities[entity])
+    symbols = {vertex: entity for entity, vertex in entities.items()}
+    return [
+        {entity: symbols[permutation[vertex]] for entity, vertex in entities.items() if permutation[vertex] != vertex}
+        for permutation in graph.automorphisms(sorted(symbols))
+    ]
+
+
+def _image(symbol: Symbol, permutation: Permutation) -> Symbol:
+    """
+    Return the symbol with its objects and predicates replaced by their images under the permutation.
+    """
+    if symbol in permutation:
+        return permutation[symbol]
+    if symbol.type == SymbolType.Function and symbol.arguments:
+        arguments = [_image(argument, permutation) for argument in symbol.arguments]
+        return Function(symbol.name, arguments, symbol.positive)
+    return symbol
+
+
+def positions(facts: Sequence[Symbol], frame: Frame) -> List[Symbol]:
+    """
+    Return the positions of interpretations in the frame compared by the lex-leader constraints, in the order they
+    are compared.
+    """
+    entities: List[Symbol] = []
+    for fact in facts:
+        _blank(fact, entities)
+    objects = sorted({entity for entity in entities if entity.match("obj", 1)})
+    preds = sorted({entity for entity in entities if entity.match("pred", 2)})
+    result = [
+        Function(position, [Function(kind), pred])
+        for position in ("head", "body")
+        for kind in ("causal", "static")
+        for pred in preds
+    ]
+    objects.extend(Function("obj", [Number(obj)]) for obj in range(1, frame.get("gen_objs", 0) + 1))
+    for arity, const in ((1, "gen_unary_preds"), (2, "gen_binary_preds")):
+        preds.extend(Function("pred", [Number(pred), Number(arity)]) for pred in range(1, frame.get(const, 0) + 1))
+    for pred in preds:
+        if pred.arguments[1].number == 1:
+            atoms = [Function("s", [pred, obj]) for obj in objects]
+        else:
+            atoms = [Function("s2", [pred, obj1, obj2]) for obj1 in objects for obj2 in objects]
+        result.extend(Function("init", [atom]) for atom in atoms)
+    return result
+
+
+def lex_leader_program(facts: Sequence[Symbol], permutations: Sequence[Permutation], frame: Frame) -> str:
+    """
+    Return the facts sym_pair(K,I,X,Y) for the lex-leader constraints of the permutations in the frame, where the
+    permutation with index K maps the position X it moves with index I to position Y.
+
+    Generated objects and predicates are fixed by the permutations, but the initial atoms over them and objects of
+    the instance are moved, so the positions depend on the frame.
+    """
+    lines: List[str] = []
+    compared = positions(facts, frame)
+    for index, permutation in enumerate(permutations):
+        moved: List[Tuple[Symbol, Symbol]] = []
+        for position in compared:
+            image = _image(position, permutation)
+            if image != position:
+                moved.append((position, image))
+        lines.extend(f"sym_pair({index},{i},{x},{y}).\n" for i, (x, y) in enumerate(moved, 1))
+    return "".join(lines)
@@ -0,0 +1,50 @@
+"""
+Warm starting of frames with the best unified interpretation found in a previous frame.
+
+As the domains only grow from frame to frame, the atoms of a theory found in a smaller frame also exist in the ground
+program of a bigger frame. Domain heuristic sign hints let the solver start out from this theory.
+"""
+
+from typing import List, Sequence, Tuple
+
+from clingo.backend import HeuristicType
+from clingo.control import Control
+from clingo.symbol import Symbol
+
+from .interpretation import signatures
+
+# signatures of the atoms describing a theory, which are the shown ones apart from the declarations and the cost, along
+# with the rules in use, which are not shown but follow from their heads
+hint_signatures = [("causal", 1), ("static", 1)] + [
+    (name, arity) for name, arity in signatures if name not in ("type", "obj", "var", "pred", "num_incorrect")
+]
+
+
+def theory_literals(ctl: Control, model: Sequence[Symbol]) -> List[Tuple[int, bool]]:
+    """
+    Return the literals of the theory atoms in the ground program of the control, each paired with whether the atom
+    is part of the theory of the model. Atoms that are facts are skipped.
+    """
+    true_symbols = set(model)
+    true_symbols.update(symb.arguments[0] for symb in model if symb.match("rule_head", 2))
+    return [
+        (atom.literal, atom.symbol in true_symbols)
+        for name, arity in hint_signatures
+        for atom in ctl.symbolic_atoms.by_signature(name, arity)
+        if not atom.is_fact
+    ]
+
+
+def add_sign_hints(ctl: Control, model: Sequence[Symbol], priority: int = 1) -> int:
+    """
+    Add sign hints to the ground program of the control, preferring the theory atoms of the model to be true and all
+    other theory atoms to be false.
+
+    Hints of a higher priority override the ones of a lower priority. They only take effect if the control uses the
+    domain heuristic via --heuristic=Domain. Returns the number of atoms of the model that were hinted.
+    """
+    literals = theory_literals(ctl, model)
+    with ctl.backend() as backend:
+        for literal, sign in literals:
+            backend.add_heuristic(literal, HeuristicType.Sign, 1 if sign else -1, priority, [])
+    return sum(sign for _, sign in literals)
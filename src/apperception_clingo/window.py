@@ -0,0 +1,153 @@
+"""
+Learning of theories for long sequences on windows of the time horizon.
+
+The facts of an instance are split into the timed facts senses/2 and hidden/2, and the remaining facts. A theory is
+learned on a window at the start of the sequence, and then validated chunk by chunk over the whole time horizon. Each
+chunk is grounded on its own, starting from the state the theory reached at the end of the previous chunk, so that
+the size of the ground program only depends on the length of a chunk and not on the length of the sequence.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from clingo.control import Control
+from clingo.solving import Model
+from clingo.symbol import Function, Symbol
+
+from .grounding import Frame, add_files, ground
+from .warmstart import theory_literals
+
+Window = Tuple[int, int]
+
+timed_signatures = [("senses", 2), ("hidden", 2)]
+
+
+class TimedInstance(NamedTuple):
+    """
+    Instance split into the facts that do not depend on time, and the timed facts by time step.
+    """
+
+    facts: List[Symbol]
+    timed: Dict[int, List[Symbol]]
+
+    @property
+    def horizon(self) -> int:
+        """
+        Return the last time step of the instance.
+        """
+        return max(self.timed, default=1)
+
+    def program(self, window: Window) -> str:
+        """
+        Return the program of the instance restricted to the time steps of the window, which starts at the initial
+        time step.
+        """
+        start, end = window
+        facts = list(self.facts)
+        for step in range(start, end + 1):
+            facts.extend(self.timed.get(step, []))
+        return (
+            "".join(f"{fact}.\n" for fact in facts)
+            + f"time({start}..{end}).\n#const first_time_point = {start}. [override]\n"
+            + "#defined senses/2.\n#defined hidden/2.\n"
+        )
+
+    def chunks(self, size: int) -> List[Window]:
+        """
+        Return the windows of the given number of time steps covering the time horizon, where each window starts at
+        the last time step of the previous one.
+        """
+        chunks = []
+        start = 1
+        while True:
+            end = min(start + size - 1, self.horizon)
+            chunks.append((start, end))
+            if end == self.horizon:
+                return chunks
+            start = end
+
+
+def read_instance(files: Sequence[str]) -> TimedInstance:
+    """
+    Return the facts of the instance given by the files split by time step.
+    """
+    ctl = Control()
+    add_files(ctl, files)
+    ctl.ground()
+    facts: List[Symbol] = []
+    timed: Dict[int, List[Symbol]] = {}
+    for atom in ctl.symbolic_atoms:
+        if not atom.is_fact or atom.symbol.match("time", 1):
+            continue
+        if any(atom.symbol.match(name, arity) for name, arity in timed_signatures):
+            timed.setdefault(atom.symbol.arguments[1].number, []).append(atom.symbol)
+        else:
+            facts.append(atom.symbol)
+    return TimedInstance(facts, timed)
+
+
+class Windowing:
+    """
+    Learning on windows of the given number of time steps, optionally reading the time steps from the given stream
+    source. The program is the instance restricted to the window currently learned on.
+    """
+
+    def __init__(self, size: Optional[int] = None, stream: Optional[str] = None) -> None:
+        self.size = size
+        self.stream = stream
+        self.program = ""
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether theories are learned on windows or on a stream.
+        """
+        return self.size is not None or self.stream is not None
+
+
+class Validation(NamedTuple):
+    """
+    Result of validating a theory on a window: the atoms holding at its last time step and the number of incorrectly
+    predicted hidden atoms. If the window starts from a given state, its first time step is not counted, as it was
+    counted for the previous window already.
+    """
+
+    state: List[Symbol]
+    num_incorrect: int
+
+
+def validate(
+    files: Sequence[str],
+    frame: Frame,
+    instance: TimedInstance,
+    window: Window,
+    theory: Sequence[Symbol],
+    *,
+    state: Optional[Sequence[Symbol]] = None,
+) -> Optional[Validation]:
+    """
+    Check whether the theory explains the sensed atoms of the window, and return the validation if it does.
+
+    The theory is given by the shown symbols of a model found in the frame. Unless the state at the start of the
+    window is given, the initial atoms of the theory are used.
+    """
+    symbols = list(theory)
+    if state is not None:
+        symbols = [symb for symb in symbols if not symb.match("init", 1)]
+        symbols.extend(Function("init", [atom]) for atom in state)
+    ctl = ground(files, frame, ["--opt-mode=ignore"], program=instance.program(window))
+    assumptions = [literal if sign else -literal for literal, sign in theory_literals(ctl, symbols)]
+    start, end = window
+    first = start if state is None else start + 1
+    result: List[Validation] = []
+
+    def on_model(model: Model) -> None:
+        atoms = model.symbols(atoms=True)
+        result.append(
+            Validation(
+                [symb.arguments[0] for symb in atoms if symb.match("hold", 2) and symb.arguments[1].number == end],
+                sum(1 for symb in atoms if symb.match("incorrect", 2) and symb.arguments[1].number >= first),
+            )
+        )
+
+    ctl.solve(assumptions=assumptions, on_model=on_model)
+    return result[0] if result else None
@@ -0,0 +1,24 @@
+"""
+Instance, encodings and frame shared by the test cases solving frames.
+"""
+
+from pathlib import Path
+
+asp_dir = Path("src", "apperception_clingo", "asp")
+search_test_dir = Path("tests", "data", "search")
+instance_file = search_test_dir / "alternating.lp"
+
+# the alternating instance along with the search encoding and the standard meta-interpreter
+files = [str(instance_file), str(asp_dir / "search" / "core.lp"), str(asp_dir / "meta-int" / "standard" / "meta.lp")]
+
+# frame in which the optimal unified interpretation of the alternating instance has cost 5
+frame = {
+    "gen_types": 0,
+    "gen_objs": 0,
+    "gen_unary_preds": 0,
+    "gen_binary_preds": 0,
+    "gen_vars": 1,
+    "causal_max": 2,
+    "static_max": 1,
+    "rule_body_size_max": 1,
+}
@@ -0,0 +1,113 @@
+"""
+Test cases for the analysis of instances before grounding.
+"""
+
+import io
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Optional, Tuple
+from unittest import TestCase
+
+from clingo import Control, Model
+
+from apperception_clingo.analysis import InstanceAnalysis, fixed_types, fixed_types_program
+from apperception_clingo.grounding import asp_files_dir, ground, meta_interpreters
+from apperception_clingo.symmetry import lex_leader_program
+
+instance = [
+    "type(sensor). type(letter).",
+    "pred(on,1). isa(sensor,pred(on,1)).",
+    "pred(sense_l,2). isa((sensor,letter),pred(sense_l,2)).",
+    "pred(p,1). isa(unknown,pred(p,1)).",
+    "obj(a). isa(sensor,obj(a)).",
+    "obj(b). obj(c). obj(d). obj(e).",
+    "senses(s2(pred(sense_l,2),obj(b),obj(c)),1).",
+    "hidden(s(pred(on,1),obj(d)),2).",
+    "senses(s2(pred(sense_l,2),obj(d),obj(d)),1).",
+    "senses(s(pred(q,1),obj(e)),1).",
+]
+
+
+class TestAnalysis(TestCase):
+    """
+    Test cases for the analysis of instances before grounding.
+    """
+
+    def solve(self, ctl: Control) -> Tuple[float, Optional[int]]:
+        """
+        Return the number of ground rules and the optimal cost of the control.
+        """
+        costs: List[int] = []
+
+        def on_model(model: Model) -> None:
+            costs.append(model.cost[0])
+
+        ctl.solve(on_model=on_model)
+        return ctl.statistics["problem"]["lp"]["rules"], costs[-1] if costs else None
+
+    def test_fixed_types(self) -> None:
+        """
+        Test that declared types are fixed, and types of undeclared objects are inferred if they are unambiguous.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "instance.lp")
+            path.write_text("\n".join(instance), encoding="utf-8")
+            program = fixed_types_program(fixed_types([str(path)]))
+        self.assertEqual(
+            program.splitlines(),
+            [
+                "fixed_isa(type(sensor),obj(a)).",
+                "fixed_isa(type(sensor),obj(b)).",
+                "fixed_isa(type(letter),obj(c)).",
+                "fixed_isa(type(sensor),pred(on,1)).",
+                "fixed_isa((type(sensor),type(letter)),pred(sense_l,2)).",
+            ],
+        )
+
+    def test_instance_analysis(self) -> None:
+        """
+        Test that the enabled analyses add their programs and encodings to the frames.
+        """
+        frame = {"gen_types": 0, "gen_objs": 0, "gen_unary_preds": 0, "gen_binary_preds": 0}
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "instance.lp")
+            path.write_text("\n".join(instance), encoding="utf-8")
+            symmetric = Path(tmp, "symmetric.lp")
+            symmetric.write_text(
+                "pred(on,1). obj(a). obj(b). senses(s(pred(on,1),(obj(a);obj(b))),1).", encoding="utf-8"
+            )
+            analysis = InstanceAnalysis()
+            self.assertEqual(analysis.analyse([str(path)]), [])
+            self.assertEqual(analysis.frame_program(frame), "")
+            analysis.fix_declared_types.flag = True
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(analysis.analyse([str(path)]), [])
+                self.assertEqual(analysis.frame_program(frame), fixed_types_program(fixed_types([str(path)])))
+                analysis = InstanceAnalysis()
+                analysis.break_symmetries.flag = True
+                encodings = analysis.analyse([str(symmetric)])
+        self.assertEqual(encodings, [str(asp_files_dir / "search" / "lex-leader.lp")])
+        assert analysis.symmetries is not None
+        self.assertEqual(analysis.frame_program(frame), lex_leader_program(*analysis.symmetries, frame))
+        self.assertIn("sym_pair(", analysis.frame_program(frame))
+
+    def test_ground(self) -> None:
+        """
+        Test that fixing the declared types shrinks the ground program, and keeps the optimum of a single type.
+        """
+        for name, frame, shrinks in [
+            ("predict_paper_seekwhence_theme_song.lp", {"gen_vars": 1}, True),
+            ("search/alternating.lp", {"gen_vars": 1, "causal_max": 2}, False),
+        ]:
+            with self.subTest(instance=name):
+                path = str(Path("tests", "data", name))
+                files = [path, str(asp_files_dir / "search" / "core.lp"), str(meta_interpreters["bd-tight"])]
+                program = fixed_types_program(fixed_types([path]))
+                results = [
+                    self.solve(ground(files, frame, ["--opt-mode=opt"])),
+                    self.solve(ground(files, frame, ["--opt-mode=opt"], program=program)),
+                ]
+                if shrinks:
+                    self.assertLess(results[1][0], results[0][0])
+                self.assertEqual(results[0][1], results[1][1])
@@ -0,0 +1,72 @@
+"""
+Test cases for batch runs over many instances.
+"""
+
+import json
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from apperception_clingo.batch import Entry, check_args, main, read_manifest, run_instance
+
+instance_file = Path("tests", "data", "search", "alternating.lp")
+
+args = ["--frame-strategy=breadth-first", "--max-frames=12", "-m", "bd-tight"]
+
+
+class TestBatch(TestCase):
+    """
+    Test cases for batch runs over many instances.
+    """
+
+    def test_run_instance(self) -> None:
+        """
+        Test running the engine on an instance in process.
+        """
+        result = run_instance(Entry("alternating", [str(instance_file)], args))
+        self.assertEqual(result["exit_code"], 0)
+        self.assertEqual(result["best_cost"], 5)
+        self.assertIn("num_incorrect(0)", result["opt_model"])
+
+    def test_budget_growth(self) -> None:
+        """
+        Test that frames interrupted while other frames are searched by frame workers are searched again with a grown
+        budget, and that budgets that cannot grow are rejected.
+        """
+        growth = ["--max-frames=3", "--frame-conflict-limit=1", "--budget-growth=1000", "--frame-workers=2"]
+        result = run_instance(Entry("alternating", [str(instance_file)], [args[0], *args[2:], *growth]))
+        statuses = [stat["status"] for stat in result["stats"]]
+        self.assertEqual(statuses.count("interrupted"), 3)
+        self.assertEqual(len(statuses), 6)
+        for invalid in ["--frame-conflict-limit=0", "--frame-time-limit=0", "--budget-growth=1"]:
+            with self.subTest(option=invalid):
+                self.assertIn(invalid.split("=", maxsplit=1)[0], str(check_args([invalid])))
+
+    def test_main(self) -> None:
+        """
+        Test running a manifest, where instances with invalid options or files are recorded with their error.
+        """
+        with TemporaryDirectory() as tmp:
+            shutil.copy(instance_file, tmp)
+            manifest = Path(tmp, "manifest.jsonl")
+            entries = [
+                {"name": "alternating", "files": ["alternating.lp"], "args": args},
+                {"files": ["alternating.lp"], "args": [*args, "--frame-workers=2"]},
+                {"name": "missing", "files": ["missing.lp"], "args": args},
+                {"name": "invalid", "files": ["alternating.lp"], "args": ["--time-window=1"]},
+            ]
+            manifest.write_text("\n".join(json.dumps(entry) for entry in entries) + "\n\n", encoding="utf-8")
+            self.assertEqual(read_manifest(manifest)[1].name, str(Path(tmp, "alternating.lp")))
+            main([str(manifest), str(Path(tmp, "results.jsonl"))])
+            with Path(tmp, "results.jsonl").open(encoding="utf-8") as f:
+                results = {result["name"]: result for result in map(json.loads, f)}
+        self.assertEqual(len(results), 4)
+        self.assertIn("--time-window", results["invalid"]["error"])
+        self.assertEqual(results["missing"]["exit_code"], 65)
+        for name in ["alternating", str(Path(tmp, "alternating.lp"))]:
+            self.assertEqual(results[name]["exit_code"], 0)
+            self.assertEqual(results[name]["best_cost"], 5)
+            self.assertEqual(len(results[name]["stats"]), 12)
+        with self.assertRaises(ValueError):
+            main([])
@@ -0,0 +1,97 @@
+"""
+Test cases for the benchmark of the meta-interpreters.
+"""
+
+import io
+import json
+import os
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from apperception_clingo.benchmark import compare, main, parse_frame, run, run_matrix
+from apperception_clingo.budget import Budget
+
+instance = Path("tests", "data", "search", "alternating.lp")
+
+
+class TestBenchmark(TestCase):
+    """
+    Test cases for the benchmark of the meta-interpreters.
+    """
+
+    def test_run(self) -> None:
+        """
+        Test the measurements of a single run.
+        """
+        result = run(instance, "bd-tight", parse_frame('{"causal_max": 2}'), Budget(time=60))
+        self.assertEqual(result["status"], "optimal")
+        self.assertEqual(result["cost"], 5)
+        self.assertEqual(result["frame"]["causal_max"], 2)
+        self.assertGreater(result["atoms"], 0)
+        self.assertGreater(result["rules"], 0)
+        self.assertLessEqual(result["first_model_time"], result["optimal_model_time"])
+        result = run(instance, "std", parse_frame("{}"), Budget(time=60))
+        self.assertEqual(result["status"], "unsatisfiable")
+        self.assertIsNone(result["first_model_time"])
+
+    def test_compare(self) -> None:
+        """
+        Test flagging of regressions against a baseline.
+        """
+        with redirect_stderr(io.StringIO()):
+            report = run_matrix([instance], ["std", "bd"], [parse_frame('{"causal_max": 2}')], Budget(time=60))
+        self.assertEqual(len(report["results"]), 2)
+        self.assertEqual(compare(report, report, 0.2), [])
+        slower = json.loads(json.dumps(report))
+        slower["results"][0]["solve_time"] += 1
+        slower["results"][1]["cost"] = 6
+        slower["results"][1]["status"] = "interrupted"
+        regressions = compare(slower, report, 0.2)
+        self.assertEqual(len(regressions), 3)
+        self.assertIn("solve_time", regressions[0])
+        self.assertEqual(compare(report, slower, 0.2), [])
+        self.assertEqual(compare(report, {"results": []}, 0.2), [])
+
+    def test_main(self) -> None:
+        """
+        Test running the benchmark from the command line, with and without baseline.
+        """
+        args = ["-i", str(instance), "-m", "bd-tight", "-f", '{"causal_max": 2}']
+        with TemporaryDirectory() as tmp, redirect_stderr(io.StringIO()):
+            report_path = Path(tmp, "report.json")
+            self.assertEqual(main(args + ["-o", str(report_path)]), 0)
+            with report_path.open(encoding="utf-8") as f:
+                report = json.load(f)
+            self.assertEqual(report["results"][0]["cost"], 5)
+            out = io.StringIO()
+            with redirect_stdout(out):
+                self.assertEqual(main(args + ["-b", str(report_path)]), 0)
+            self.assertEqual(json.loads(out.getvalue())["results"][0]["cost"], 5)
+            report["results"][0]["cost"] = 4
+            with report_path.open("w", encoding="utf-8") as f:
+                json.dump(report, f)
+            self.assertEqual(main(args + ["-o", str(Path(tmp, "new.json")), "-b", str(report_path)]), 1)
+
+    def test_default_instances(self) -> None:
+        """
+        Test that the default instances are found from any working directory, and that they are required to exist.
+        """
+        args = ["-m", "bd-tight", "-f", '{"causal_max": 2}']
+        cwd = os.getcwd()
+        with TemporaryDirectory() as tmp, redirect_stderr(io.StringIO()) as err:
+            os.chdir(tmp)
+            try:
+                with patch("apperception_clingo.benchmark.default_instances", [instance]):
+                    self.assertEqual(main(args + ["-o", "report.json"]), 0)
+                with open("report.json", encoding="utf-8") as f:
+                    result = json.load(f)["results"][0]
+                with patch("apperception_clingo.benchmark.default_instances", [Path("missing.lp")]):
+                    with self.assertRaises(SystemExit):
+                        main(args)
+            finally:
+                os.chdir(cwd)
+        self.assertEqual((result["instance"], result["cost"]), (str(instance), 5))
+        self.assertIn("give the instances with -i", err.getvalue())
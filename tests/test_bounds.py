@@ -0,0 +1,47 @@
+"""
+Test cases for the lower bounds on the cost.
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from apperception_clingo.bounds import LowerBound, lower_bound
+
+alternating = Path("tests", "data", "search", "alternating.lp")
+
+
+class TestBounds(TestCase):
+    """
+    Test cases for the lower bounds on the cost.
+    """
+
+    def test_lower_bound(self) -> None:
+        """
+        Test the lower bound of an instance whose sensed state changes over time.
+        """
+        bound = lower_bound([str(alternating)])
+        self.assertEqual(bound, LowerBound(1, 2))
+        self.assertEqual(bound.value, 2)
+        self.assertEqual(bound.frame({"causal_max": 1, "static_max": 0}), 2)
+
+    def test_constant(self) -> None:
+        """
+        Test that the lower bound of an instance whose sensed state is constant is met by the initial atoms alone.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "constant.lp")
+            path.write_text(
+                "senses(s(pred(on,1),obj(a)),1..3). senses(s(pred(on,1),obj(b)),1). time(1..3).", encoding="utf-8"
+            )
+            bound = lower_bound([str(path)])
+        self.assertEqual(bound, LowerBound(2, 2))
+        self.assertEqual(bound.value, 2)
+
+    def test_frame(self) -> None:
+        """
+        Test that frames without rules need every sensed atom as initial atom.
+        """
+        bound = LowerBound(1, 5)
+        self.assertEqual(bound.value, 3)
+        self.assertEqual(bound.frame({"causal_max": 0, "static_max": 0}), 5)
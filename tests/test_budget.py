@@ -0,0 +1,72 @@
+"""
+Test cases for budgets limiting the solving of a frame.
+"""
+
+from typing import List
+from unittest import TestCase
+
+from clingo import Control
+
+from apperception_clingo.budget import Budget, memory_usage, peak_memory_usage, reset_peak_memory, solve
+
+
+class TestBudget(TestCase):
+    """
+    Test cases for budgets limiting the solving of a frame.
+    """
+
+    def control(self) -> Control:
+        """
+        Return a control with a small optimization problem grounded.
+        """
+        ctl = Control(["--opt-mode=opt"])
+        ctl.add("base", [], "{ a(1..10) }. :- not a(1), not a(2). #minimize { 1,X: a(X) }.")
+        ctl.ground()
+        return ctl
+
+    def test_scaled(self) -> None:
+        """
+        Test scaling of budgets.
+        """
+        self.assertEqual(Budget(1.5, 10, 100).scaled(2), Budget(3.0, 20, 200))
+        self.assertEqual(Budget().scaled(2), Budget())
+
+    def test_memory_usage(self) -> None:
+        """
+        Test that the memory usage of the process is positive, if it can be determined.
+        """
+        memory = memory_usage()
+        if memory is not None:
+            self.assertGreater(memory, 0)
+        reset_peak_memory()
+        peak = peak_memory_usage()
+        if memory is not None and peak is not None:
+            self.assertGreaterEqual(peak, memory - 1)
+
+    def test_solve(self) -> None:
+        """
+        Test solving within, and running out of budget.
+        """
+        costs = []
+        status = solve(self.control(), lambda m: costs.append(m.cost[0]), Budget(time=10, memory=2**20))
+        self.assertEqual(status, "complete")
+        self.assertEqual(costs[-1], 1)
+        self.assertEqual(solve(self.control(), lambda m: None, Budget(conflicts=0)), "interrupted")
+
+    def test_solve_cancelled(self) -> None:
+        """
+        Test cancelling solving and running out of time.
+        """
+        ctl = Control(["--opt-mode=opt"])
+        # pigeon hole problem which can not be solved in reasonable time
+        ctl.add("base", [], "1 { p(X,Y): Y=1..11 } 1 :- X=1..12. :- p(X1,Y), p(X2,Y), X1 < X2.")
+        ctl.ground()
+        self.assertEqual(solve(ctl, lambda m: None, Budget(), cancel=lambda: True), "cancelled")
+        self.assertEqual(solve(ctl, lambda m: None, Budget(time=0.0)), "interrupted")
+        self.assertEqual(solve(ctl, lambda m: None, Budget(memory=0)), "interrupted")
+        polls: List[int] = []
+        self.assertEqual(
+            solve(ctl, lambda m: None, Budget(), cancel=lambda: bool(polls), on_poll=lambda: polls.append(1)),
+            "cancelled",
+        )
+        self.assertEqual(polls, [1])
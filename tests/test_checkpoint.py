@@ -0,0 +1,51 @@
+"""
+Test cases for resuming the frame search from a stats log.
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from apperception_clingo.budget import Budget
+from apperception_clingo.checkpoint import read_checkpoint
+from apperception_clingo.frames import BreadthFirstScheduler, frame_key
+from apperception_clingo.stats import StatsWriter
+
+frames = [{"gen_objs": 0}, {"gen_objs": 2}, {"gen_objs": 4}]
+
+
+class TestCheckpoint(TestCase):
+    """
+    Test cases for resuming the frame search from a stats log.
+    """
+
+    def test_read_checkpoint(self) -> None:
+        """
+        Test restoring the best unified interpretation and the frames still interrupted, where models of frames whose
+        solving did not end are kept.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "log.jsonl")
+            log = StatsWriter(path)
+            for index, (frame, status) in enumerate([(frames[0], "interrupted"), (frames[1], "interrupted")]):
+                log.write("frame_start", index, frame=frame, time=0.0)
+                log.write("model", index, interpretation={"cost": 9 - index, "time": 1.0})
+                log.write("solve_end", index, time=1.0, status=status, best_cost=9 - index, budget={"time": 2.0})
+            log.write("frame_start", 2, frame=frames[0], time=1.0)
+            log.write("solve_end", 2, time=2.0, status="optimal", best_cost=None)
+            log.write("frame_start", 3, frame=frames[2], time=2.0)
+            log.write("model", 3, interpretation={"cost": 5, "time": 3.0})
+            log.write("model", 3, interpretation={"cost": 5, "time": 4.0})
+            log.close()
+            checkpoint = read_checkpoint(path)
+            self.assertEqual(len(checkpoint.stats), 4)
+            self.assertEqual(checkpoint.incumbent, (3, {"cost": 5, "time": 4.0}))
+            self.assertEqual(checkpoint.interrupted, [(frames[1], Budget(time=2.0))])
+            scheduler = BreadthFirstScheduler(frames[0], {"gen_objs": 2})
+            checkpoint.restore(scheduler)
+            self.assertEqual(scheduler.incumbent, 5)
+            self.assertEqual(scheduler.complete, [frames[0]])
+            self.assertEqual(scheduler.restored, {frame_key(frame) for frame in frames[:2]})
+            log = StatsWriter(path)
+            log.close()
+            self.assertEqual(read_checkpoint(path), ([], None, []))
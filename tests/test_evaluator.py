@@ -0,0 +1,155 @@
+"""
+Test cases for evaluating theories without the solver.
+"""
+
+import io
+import json
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Set, Tuple
+from unittest import TestCase
+
+from clingo import Control, Model, Symbol, parse_term
+
+from apperception_clingo.evaluator import Theory, best_interpretation, evaluate, main
+from apperception_clingo.grounding import asp_files_dir, ground, meta_interpreters
+from apperception_clingo.interpretation import decode, deserialize, rules, serialize
+from apperception_clingo.stats import StatsWriter
+from apperception_clingo.window import read_instance
+
+meta_test_dir = Path("tests", "data", "meta-interpreter")
+
+instance_file = Path("tests", "data", "search", "alternating_long.lp")
+
+meta_test_files = [
+    "static-tight.lp",
+    "static-loop-found.lp",
+    "causal.lp",
+    "incompos-xor.lp",
+    "incompos-exist.lp",
+    "paper-example6.lp",
+    "paper-example7.lp",
+]
+
+
+class TestEvaluator(TestCase):
+    """
+    Test cases for evaluating theories without the solver.
+    """
+
+    def holds(self, path: Path) -> Tuple[List[Symbol], Set[Tuple[Symbol, int]]]:
+        """
+        Return the atoms of the theory given by the file, and the atoms holding in its answer set.
+        """
+        ctl = Control()
+        ctl.load(str(asp_files_dir / "meta-int" / "body-decoupled" / "meta.lp"))
+        ctl.load(str(path))
+        ctl.add("#defined exist/1.")
+        ctl.ground()
+        atoms = [atom.symbol for atom in ctl.symbolic_atoms if atom.is_fact]
+        holds: List[Set[Tuple[Symbol, int]]] = []
+
+        def on_model(model: Model) -> None:
+            holds.append(
+                {
+                    (symb.arguments[0], symb.arguments[1].number)
+                    for symb in model.symbols(atoms=True)
+                    if symb.match("hold", 2)
+                }
+            )
+
+        ctl.solve(on_model=on_model)
+        return atoms, holds[0]
+
+    def test_meta_interpreter(self) -> None:
+        """
+        Test that the evaluator derives the atoms holding in the answer sets of the meta-interpreter.
+        """
+        for name in meta_test_files:
+            with self.subTest(name=name):
+                atoms, holds = self.holds(meta_test_dir / name)
+                horizon = max(symb.arguments[0].number for symb in atoms if symb.match("time", 1))
+                evaluation = evaluate(Theory(decode(atoms)), read_instance([str(meta_test_dir / name)]), (1, horizon))
+                self.assertEqual({(atom, step) for step, state in evaluation.states.items() for atom in state}, holds)
+
+    def test_violations(self) -> None:
+        """
+        Test that incompossible atoms, missing atoms of incompossible sets and unrelated objects are violations, and
+        that rules do not fire if a variable cannot be substituted.
+        """
+        atoms, _ = self.holds(meta_test_dir / "paper-example7.lp")
+        theory = Theory(decode([symb for symb in atoms if not symb.match("init", 1) or symb.arguments[0].name == "s"]))
+        violations = theory.violations(theory.initial_state())
+        self.assertEqual(len(violations), 4)
+        self.assertEqual(
+            violations[0],
+            "0 of the incompossible atoms s2(pred(r,2),obj(a),obj(a)), "
+            "s2(pred(r,2),obj(a),obj(b)), s2(pred(r,2),obj(a),obj(c)) hold",
+        )
+        self.assertEqual(violations[-1], "the objects are not related")
+        state = theory.initial_state() | {parse_term("s(pred(off,1),obj(a))")}
+        self.assertIn(
+            "2 of the incompossible atoms s(pred(on,1),obj(a)), s(pred(off,1),obj(a)) hold", theory.violations(state)
+        )
+        theory = Theory(decode(atoms + [parse_term("var(z)")]))
+        self.assertEqual(theory.next_state(theory.initial_state()), theory.initial_state())
+
+    def test_evaluate(self) -> None:
+        """
+        Test that a learned theory explains the whole sequence, and hidden atoms are predicted.
+        """
+        instance = read_instance([str(instance_file)])
+        files = [str(asp_files_dir / "search" / "core.lp"), str(meta_interpreters["bd-tight"])]
+        ctl = ground(files, {"gen_vars": 1, "causal_max": 2}, ["--opt-mode=opt"], program=instance.program((1, 5)))
+        theory: List[Symbol] = []
+
+        def on_model(model: Model) -> None:
+            theory[:] = model.symbols(shown=True)
+
+        ctl.solve(on_model=on_model)
+        interpretation = decode(theory)
+        evaluation = evaluate(Theory(interpretation), instance)
+        self.assertEqual(evaluation.violations, [])
+        self.assertEqual([str(atom) for atom in evaluation.states[20]], ["s(pred(off,1),obj(a))"])
+        instance.timed[21] = [parse_term(f"hidden(s(pred({pred},1),obj(a)),21)") for pred in ("on", "off")]
+        instance.timed[22] = [parse_term("senses(s(pred(on,1),obj(a)),22)")]
+        evaluation = evaluate(Theory(interpretation), instance)
+        self.assertEqual([str(fact) for fact in evaluation.incorrect], ["hidden(s(pred(off,1),obj(a)),21)"])
+        self.assertEqual(evaluation.num_incorrect, 1)
+        self.assertEqual(evaluation.violations, [(22, "sensed atom s(pred(on,1),obj(a)) does not hold")])
+        static = [symb for symb in theory if not symb.match("rule_head", 2)]
+        self.assertEqual(evaluate(Theory(decode(static)), instance, (1, 2)).violations[0][0], 2)
+
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "log.jsonl")
+            log = StatsWriter(path)
+            serialized = serialize(interpretation, rules(interpretation), 5, 1.0)
+            log.write("frame_start", 0, frame={}, time=0.0)
+            log.write("model", 0, interpretation=json.loads(json.dumps(serialized)))
+            log.close()
+            self.assertEqual(sorted(deserialize(serialized)), sorted(theory))
+            out = io.StringIO()
+            with redirect_stdout(out):
+                main([str(path), str(instance_file)])
+            lines = out.getvalue().splitlines()
+            self.assertEqual(lines[-1], "Number of incorrectly predicted hidden states: 0")
+            self.assertEqual(lines[1], "Time step 2: s(pred(off,1),obj(a))")
+            Path(tmp, "extension.lp").write_text("senses(s(pred(on,1),obj(a)),22).", encoding="utf-8")
+            out = io.StringIO()
+            with redirect_stdout(out):
+                main([str(path), str(instance_file), str(Path(tmp, "extension.lp"))])
+            self.assertEqual(
+                out.getvalue().splitlines()[-2],
+                "Violated at time step 22: sensed atom s(pred(on,1),obj(a)) does not hold",
+            )
+            with self.assertRaises(ValueError):
+                main([str(path)])
+        with self.assertRaises(ValueError):
+            best_interpretation([{"frame": {}, "unified_interpretations": []}])
+        self.assertEqual(
+            best_interpretation(
+                [{"frame": {}, "unified_interpretations": [{"cost": 3, "time": 1.0}, {"cost": 3, "time": 2.0}]}]
+            ),
+            {"cost": 3, "time": 2.0},
+        )
@@ -0,0 +1,259 @@
+"""
+Test cases for the frame schedulers.
+"""
+
+from itertools import islice
+from typing import List
+from unittest import TestCase
+
+from apperception_clingo.bounds import LowerBound
+from apperception_clingo.budget import Budget
+from apperception_clingo.frames import (
+    BreadthFirstScheduler,
+    CheapestFirstScheduler,
+    FrameJobs,
+    FrameSchedule,
+    FrameScheduler,
+    RoundRobinScheduler,
+    default_init_frame,
+    dominates,
+    frame_key,
+    make_scheduler,
+    strategies,
+)
+from apperception_clingo.grounding import Frame
+
+init_frame = {"gen_types": 0, "gen_objs": 0, "causal_max": 1}
+frame_deltas = {"gen_objs": 2, "causal_max": 1}
+
+
+def original_frames(deltas: Frame, switch_frame_at_iter: int = 5, max_iterations: int = 20) -> List[Frame]:
+    """
+    Return the frames searched by the original search loop of the application.
+    """
+    searched = [default_init_frame.copy()]
+    i = 1
+    new_type = 1
+    frames = [default_init_frame.copy()]
+    while i < max_iterations:
+        for frame in frames:
+            while True:
+                for key, val in deltas.items():
+                    frame[key] += val
+                    searched.append(frame.copy())
+                i += 1
+                if i % switch_frame_at_iter == 0:
+                    break
+        new_frame = default_init_frame.copy()
+        new_frame["gen_types"] = new_type
+        new_type += 1
+        frames.append(new_frame)
+    return searched
+
+
+class TestFrames(TestCase):
+    """
+    Test cases for the frame schedulers.
+    """
+
+    def test_dominates(self) -> None:
+        """
+        Test domination of frames.
+        """
+        frame = {"gen_types": 1, "gen_objs": 2, "causal_max": 1}
+        self.assertTrue(dominates(frame, init_frame))
+        self.assertTrue(dominates(frame, frame))
+        self.assertFalse(dominates(init_frame, frame))
+        self.assertFalse(dominates(frame, {"gen_types": 0, "gen_objs": 0, "causal_max": 2}))
+
+    def test_base(self) -> None:
+        """
+        Test that the base scheduler leaves the strategy to subclasses.
+        """
+        with self.assertRaises(NotImplementedError):
+            FrameScheduler(init_frame, frame_deltas).next_frame()
+
+    def test_round_robin(self) -> None:
+        """
+        Test the order of the round robin scheduler.
+        """
+        frames = list(RoundRobinScheduler(init_frame, frame_deltas, rounds_per_turn=1, max_rounds=3))
+        self.assertEqual(
+            frames,
+            [
+                {"gen_types": 0, "gen_objs": 0, "causal_max": 1},
+                {"gen_types": 0, "gen_objs": 2, "causal_max": 1},
+                {"gen_types": 0, "gen_objs": 2, "causal_max": 2},
+                {"gen_types": 0, "gen_objs": 4, "causal_max": 2},
+                {"gen_types": 0, "gen_objs": 4, "causal_max": 3},
+                {"gen_types": 1, "gen_objs": 2, "causal_max": 1},
+                {"gen_types": 1, "gen_objs": 2, "causal_max": 2},
+            ],
+        )
+        self.assertEqual(len(set(frame_key(f) for f in frames)), len(frames))
+
+    def test_round_robin_original(self) -> None:
+        """
+        Test that the round robin scheduler searches the frames of the original search loop, in the same order.
+        """
+        deltas = {"gen_objs": 2, "gen_unary_preds": 1, "causal_max": 1, "gen_vars": 1}
+        self.assertEqual(list(RoundRobinScheduler(default_init_frame, deltas)), original_frames(deltas))
+        self.assertEqual(len(original_frames(deltas)), 4 * 29 + 1)
+
+    def test_make_scheduler(self) -> None:
+        """
+        Test that the schedulers that never run out of frames stop after as many frames as the round robin one.
+        """
+        for strategy in strategies:
+            with self.subTest(strategy=strategy):
+                self.assertEqual(len(list(make_scheduler(strategy, init_frame, frame_deltas))), 2 * 29 + 1)
+                self.assertEqual(len(list(make_scheduler(strategy, init_frame, frame_deltas, 5))), 5)
+                scheduler = make_scheduler(strategy, init_frame, frame_deltas, rounds_per_turn=1, max_rounds=3)
+                self.assertEqual(len(list(scheduler)), 7)
+
+    def test_schedule(self) -> None:
+        """
+        Test that the schedule makes new schedulers of its strategy.
+        """
+        schedule = FrameSchedule(init_frame, frame_deltas, "breadth-first", rounds_per_turn=1, max_rounds=3)
+        self.assertIsInstance(schedule.scheduler(), BreadthFirstScheduler)
+        self.assertEqual(len(list(schedule.scheduler())), 7)
+        schedule.max_frames = 2
+        self.assertEqual(len(list(schedule.scheduler())), 2)
+
+    def test_max_frames(self) -> None:
+        """
+        Test that schedulers stop after the maximum number of frames.
+        """
+        self.assertEqual(len(list(RoundRobinScheduler(init_frame, frame_deltas, max_frames=4))), 4)
+        self.assertEqual(len(list(BreadthFirstScheduler(init_frame, frame_deltas, max_frames=10))), 10)
+
+    def test_breadth_first(self) -> None:
+        """
+        Test that the breadth first scheduler searches frames in order of their size without repetition.
+        """
+        frames = list(islice(BreadthFirstScheduler(init_frame, frame_deltas), 10))
+        self.assertEqual(frames[0], init_frame)
+        self.assertEqual(len(frames[1:4]), 3)
+        for frame in frames[1:4]:
+            self.assertEqual(sum(frame[k] - init_frame[k] for k in frame), 1 if frame["gen_objs"] == 0 else 2)
+        self.assertEqual(len(set(frame_key(f) for f in frames)), len(frames))
+        scheduler = BreadthFirstScheduler(init_frame, {})
+        self.assertEqual(list(islice(scheduler, 3))[-1], {"gen_types": 2, "gen_objs": 0, "causal_max": 1})
+        scheduler = BreadthFirstScheduler(init_frame, {"gen_types": 0})
+        self.assertEqual(list(scheduler), [init_frame])
+
+    def test_dominated(self) -> None:
+        """
+        Test that frames dominated by a completely searched frame are skipped.
+        """
+        scheduler = BreadthFirstScheduler(init_frame, frame_deltas)
+        scheduler.report({"gen_types": 1, "gen_objs": 2, "causal_max": 2}, "optimal", 1.0)
+        scheduler.report({"gen_types": 0, "gen_objs": 2, "causal_max": 3}, "interrupted", 1.0)
+        frame = scheduler.next_frame()
+        self.assertEqual(frame, {"gen_types": 0, "gen_objs": 4, "causal_max": 1})
+        for frame in islice(scheduler, 20):
+            self.assertFalse(dominates({"gen_types": 1, "gen_objs": 2, "causal_max": 2}, frame))
+
+    def test_restore(self) -> None:
+        """
+        Test that frames searched by an earlier run are skipped, and count towards the maximum number of frames.
+        """
+        frames = list(BreadthFirstScheduler(init_frame, frame_deltas, max_frames=6))
+        scheduler = BreadthFirstScheduler(init_frame, frame_deltas, max_frames=6)
+        scheduler.restore(frames[0], "unsatisfiable", 1.0)
+        scheduler.restore(frames[2], "interrupted", 1.0)
+        scheduler.restore(frames[2], "interrupted", 2.0)
+        self.assertEqual(list(scheduler), [frames[1], *frames[3:]])
+        self.assertEqual(scheduler.complete, [frames[0]])
+
+    def test_lower_bound(self) -> None:
+        """
+        Test that frames whose lower bound is not below the incumbent are skipped, and that the search ends once the
+        incumbent meets the lower bound.
+        """
+        scheduler = BreadthFirstScheduler({**init_frame, "causal_max": 0, "static_max": 0}, frame_deltas)
+        scheduler.lower_bound = LowerBound(1, 4)
+        self.assertEqual(scheduler.next_frame(), {"gen_types": 0, "gen_objs": 0, "causal_max": 0, "static_max": 0})
+        scheduler.incumbent = 4
+        self.assertFalse(scheduler.optimal())
+        self.assertTrue(scheduler.bounded({"gen_types": 0, "gen_objs": 2, "causal_max": 0, "static_max": 0}))
+        frame = scheduler.next_frame()
+        self.assertEqual(frame, {"gen_types": 0, "gen_objs": 0, "causal_max": 1, "static_max": 0})
+        scheduler.incumbent = 3
+        self.assertTrue(scheduler.optimal())
+        self.assertIsNone(scheduler.next_frame())
+
+    def test_cheapest(self) -> None:
+        """
+        Test that the cheapest first scheduler prefers constants whose increment was measured to be cheap.
+        """
+        scheduler = CheapestFirstScheduler(init_frame, frame_deltas)
+        self.assertEqual(scheduler.next_frame(), init_frame)
+        scheduler.report(init_frame, "optimal", 1.0)
+        frames = [scheduler.next_frame() for _ in range(3)]
+        for frame in frames:
+            assert frame is not None
+            scheduler.report(frame, "interrupted", 1.5 if frame["causal_max"] > 1 else 100.0)
+        self.assertAlmostEqual(scheduler.growth("gen_objs"), 100.0)
+        self.assertAlmostEqual(scheduler.growth("gen_types"), 100.0)
+        self.assertAlmostEqual(scheduler.growth("causal_max"), 1.5)
+        self.assertAlmostEqual(scheduler.growth("static_max"), scheduler.default_growth)
+        # frames only incrementing the cheap constant are searched next
+        for _ in range(3):
+            frame = scheduler.next_frame()
+            assert frame is not None
+            self.assertEqual((frame["gen_types"], frame["gen_objs"]), (0, 0))
+            scheduler.report(frame, "interrupted", 1.5 ** (frame["causal_max"] - 1))
+
+    def test_cheapest_exhausted(self) -> None:
+        """
+        Test that the cheapest first scheduler stops once there are no more frames.
+        """
+        scheduler = CheapestFirstScheduler(init_frame, {"gen_types": 0})
+        self.assertEqual(list(scheduler), [init_frame])
+
+    def test_jobs(self) -> None:
+        """
+        Test that interrupted frames are searched again with a grown budget once the schedule is exhausted, until no
+        frame is interrupted anymore.
+        """
+        jobs = FrameJobs(Budget(conflicts=10), 2.0)
+        jobs.start(BreadthFirstScheduler(init_frame, frame_deltas, max_frames=2))
+        frames = [frame for frame, _ in jobs]
+        self.assertEqual(len(frames), 2)
+        jobs.interrupted = [(frames[0], Budget(conflicts=10)), (frames[1], Budget(conflicts=10))]
+        self.assertEqual(list(jobs), [(frames[0], Budget(conflicts=20)), (frames[1], Budget(conflicts=20))])
+        jobs.interrupted = [(frames[1], Budget(conflicts=20))]
+        assert jobs.scheduler is not None
+        jobs.scheduler.report(frames[0], "optimal", 1.0)
+        jobs.scheduler.report(frames[1], "optimal", 1.0)
+        self.assertEqual(list(jobs), [])
+        jobs.growth = None
+        jobs.interrupted = [(frames[0], Budget(conflicts=10))]
+        self.assertEqual(jobs.take(1), [])
+
+    def test_jobs_pending(self) -> None:
+        """
+        Test that a frame interrupted after the schedule is exhausted is searched again once no frame is pending, as
+        with several frame workers.
+        """
+        jobs = FrameJobs(Budget(conflicts=10), 2.0)
+        jobs.start(BreadthFirstScheduler(init_frame, frame_deltas, max_frames=2))
+        frames = [frame for frame, _ in jobs.take(2)]
+        # the first frame finishes while the second one is pending, which is interrupted afterwards
+        self.assertEqual(jobs.take(1, idle=False), [])
+        jobs.interrupted.append((frames[1], Budget(conflicts=10)))
+        self.assertEqual(jobs.take(2, idle=False), [])
+        self.assertEqual(jobs.take(2, idle=True), [(frames[1], Budget(conflicts=20))])
+        self.assertEqual(jobs.take(2, idle=True), [])
+
+    def test_jobs_growth(self) -> None:
+        """
+        Test that a budget that cannot grow is rejected, since interrupted frames would be searched again forever.
+        """
+        scheduler = BreadthFirstScheduler(init_frame, frame_deltas)
+        for budget, growth in [(Budget(conflicts=0), 2.0), (Budget(time=0.0), 2.0), (Budget(conflicts=5), 1.0)]:
+            with self.subTest(budget=budget, growth=growth), self.assertRaises(ValueError):
+                FrameJobs(budget, growth).start(scheduler)
+        FrameJobs(Budget(conflicts=0)).start(scheduler)
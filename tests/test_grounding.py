@@ -0,0 +1,143 @@
+"""
+Test cases for grounding frames and caching ground programs.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase
+
+from clingo import Control, Model, parse_term
+
+from apperception_clingo.grounding import (
+    GroundCache,
+    GroundCacheOptions,
+    add_files,
+    asp_files_dir,
+    const_program,
+    ground,
+    meta_interpreters,
+    parse_files,
+    substitution_table,
+)
+
+from .fixtures import asp_dir, files, frame
+
+
+class TestGrounding(TestCase):
+    """
+    Test cases for grounding frames and caching ground programs.
+    """
+
+    def optimum(self, ctl: Control) -> List[str]:
+        """
+        Solve the control and return the cost and shown symbols of the optimal model as strings.
+        """
+        optimum: List[str] = []
+
+        def on_model(model: Model) -> None:
+            optimum[:] = [str(model.cost)] + sorted(str(symb) for symb in model.symbols(shown=True))
+
+        ctl.solve(on_model=on_model)
+        return optimum
+
+    def test_resources(self) -> None:
+        """
+        Test that the encodings are resolved independently of the working directory.
+        """
+        self.assertTrue(asp_files_dir.is_absolute())
+        for path in meta_interpreters.values():
+            self.assertTrue(path.is_file())
+
+    def test_parse_files(self) -> None:
+        """
+        Test that files are parsed once, including the files they include.
+        """
+        statements = parse_files(tuple(files))
+        self.assertIs(parse_files(tuple(files)), statements)
+        locations = {stm.location.begin.filename for stm in statements}
+        self.assertTrue(any(location.endswith("generate.lp") for location in locations))
+
+    def test_substitution_table(self) -> None:
+        """
+        Test that the substitution table assigns each candidate object once to each variable of the frame.
+        """
+        table = substitution_table(files, {**frame, "gen_objs": 1, "gen_vars": 2}, "obj(b;1).")
+        self.assertEqual(len(table), 3**2 * 2)
+        self.assertEqual(table[0], (1, parse_term("var(1)"), parse_term("obj(1)")))
+        self.assertEqual(table[-1], (9, parse_term("var(2)"), parse_term("obj(b)")))
+        self.assertEqual(len({group for group, _, _ in table}), 9)
+        table = substitution_table(files, {**frame, "gen_vars": 1}, "var(x;1).")
+        self.assertEqual({var for _, var, _ in table}, {parse_term("var(1)"), parse_term("var(x)")})
+
+    def test_substitution_chain(self) -> None:
+        """
+        Test that the standard meta-interpreter has the same optimum with the substitution table of the frame as
+        with the chains of substitutions it builds without it.
+        """
+        chain_frame = {**frame, "gen_vars": 2}
+        ctl = Control(["--opt-mode=opt"])
+        add_files(ctl, files)
+        ctl.add(const_program(chain_frame))
+        ctl.ground()
+        self.assertFalse(any(ctl.symbolic_atoms.by_signature("subs_tables", 0)))
+        self.assertTrue(any(ctl.symbolic_atoms.by_signature("subs_chain", 1)))
+        self.assertEqual(self.optimum(ctl)[0], self.optimum(ground(files, chain_frame, ["--opt-mode=opt"]))[0])
+
+    def test_key(self) -> None:
+        """
+        Test that keys depend on the frame and the contents of the files, including included files.
+        """
+        with TemporaryDirectory() as tmp:
+            cache = GroundCache(Path(tmp))
+            key = cache.key(files, frame)
+            self.assertEqual(key, cache.key(files, dict(reversed(frame.items()))))
+            self.assertEqual(key, cache.key(files + [files[1]], frame))
+            self.assertNotEqual(key, cache.key(files, {**frame, "causal_max": 3}))
+            shutil.copytree(asp_dir / "search", Path(tmp, "search"))
+            copied = [files[0], str(Path(tmp, "search", "core.lp")), files[2]]
+            self.assertNotEqual(key, cache.key(copied, frame))
+            copied_key = cache.key(copied, frame)
+            with Path(tmp, "search", "domain.lp").open("a", encoding="utf-8") as f:
+                f.write("% changed\n")
+            self.assertNotEqual(copied_key, cache.key(copied, frame))
+
+    def test_load(self) -> None:
+        """
+        Test that cached programs have the same optimal model as the grounded ones, and are reused.
+        """
+        expected = self.optimum(ground(files, frame, ["--opt-mode=opt"]))
+        self.assertEqual(expected[0], "[5]")
+        with TemporaryDirectory() as tmp:
+            cache = GroundCache(Path(tmp, "cache"))
+            self.assertEqual(self.optimum(ground(files, frame, ["--opt-mode=opt"], cache=cache)), expected)
+            path = cache.path(cache.key(files, frame))
+            self.assertTrue(path.exists())
+            os.utime(path, (0, 0))
+            self.assertEqual(self.optimum(ground(files, frame, ["--opt-mode=opt"], cache=cache)), expected)
+            self.assertGreater(path.stat().st_mtime, 0)
+            self.assertEqual(len(list(Path(tmp, "cache").iterdir())), 1)
+
+    def test_cache_options(self) -> None:
+        """
+        Test that the ground cache is only used with a directory.
+        """
+        self.assertIsNone(GroundCacheOptions(size=5).cache)
+        self.assertEqual(GroundCacheOptions(Path("cache"), 5).cache, GroundCache(Path("cache"), 5))
+
+    def test_evict(self) -> None:
+        """
+        Test that the least recently used programs are evicted once the cache exceeds its size.
+        """
+        with TemporaryDirectory() as tmp:
+            cache = GroundCache(Path(tmp), 0)
+            first = {**frame, "causal_max": 1}
+            ground(files, first, [], cache=cache)
+            ground(files, frame, [], cache=cache)
+            self.assertFalse(cache.path(cache.key(files, first)).exists())
+            self.assertTrue(cache.path(cache.key(files, frame)).exists())
+            cache = cache._replace(size=1)
+            ground(files, first, [], cache=cache)
+            self.assertEqual(len(list(Path(tmp).glob("*.aspif"))), 2)
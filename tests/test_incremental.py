@@ -0,0 +1,57 @@
+"""
+Test cases for grounding frames incrementally.
+"""
+
+import io
+from contextlib import redirect_stdout
+from typing import List, Optional
+from unittest import TestCase
+
+from clingo import Control
+
+from apperception_clingo.grounding import Frame, meta_interpreters
+from apperception_clingo.incremental import IncrementalGrounding
+
+from .fixtures import asp_dir, frame, instance_file
+
+files = [str(instance_file), str(asp_dir / "search" / "core-incremental.lp"), str(meta_interpreters["std"])]
+
+deltas = {"gen_objs": 1, "causal_max": 1}
+
+
+class TestIncremental(TestCase):
+    """
+    Test cases for grounding frames incrementally.
+    """
+
+    def optimum(self, ctl: Control) -> Optional[int]:
+        """
+        Return the optimal cost of the program grounded in the control, or None if it is unsatisfiable.
+        """
+        costs: List[int] = []
+        ctl.solve(on_model=lambda model: costs.append(model.cost[0]))
+        return costs[-1] if costs else None
+
+    def test_control(self) -> None:
+        """
+        Test that frames up to the ceiling are solved on the same control, which is ground again for a frame exceeding
+        the ceiling or after a reset.
+        """
+        programs: List[Frame] = []
+
+        def program(ceiling: Frame) -> str:
+            programs.append(ceiling)
+            return ""
+
+        grounding = IncrementalGrounding(1, deltas)
+        with redirect_stdout(io.StringIO()) as out:
+            ctl = grounding.control(files, frame, ["--opt-mode=opt"], program)
+            self.assertEqual(self.optimum(ctl), 5)
+            self.assertEqual(grounding.ceiling, {**frame, "gen_objs": 1, "causal_max": 3})
+            self.assertIs(grounding.control(files, {**frame, "causal_max": 1}, ["--opt-mode=opt"], program), ctl)
+            self.assertIsNone(self.optimum(ctl))
+            self.assertIsNot(grounding.control(files, {**frame, "causal_max": 4}, ["--opt-mode=opt"], program), ctl)
+            grounding.reset()
+            grounding.control(files, frame, ["--opt-mode=opt"], program)
+        self.assertEqual(out.getvalue().count("Grounding frame ceiling"), 3)
+        self.assertEqual([ceiling["causal_max"] for ceiling in programs], [3, 5, 3])
@@ -0,0 +1,93 @@
+"""
+Test cases for decoding models into unified interpretations.
+"""
+
+from unittest import TestCase
+
+from clingo.symbol import Number, parse_term
+
+from apperception_clingo.interpretation import decode, format_interpretation, rules, serialize
+
+symbols = [
+    parse_term(s)
+    for s in [
+        "type(sensor)",
+        "obj(a)",
+        "var(1)",
+        "pred(on,1)",
+        "pred(off,1)",
+        "isa(sensor,obj(a))",
+        "isa(sensor,var(1))",
+        "isa(sensor,pred(on,1))",
+        "isa(sensor,pred(off,1))",
+        "xor(pred(on,1),pred(off,1))",
+        "rule_head(causal(1),s(pred(off,1),var(1)))",
+        "rule_body(causal(1),s(pred(on,1),var(1)))",
+        "rule_head(static(1),s(pred(on,1),var(1)))",
+        "rule_head(causal(2),s(pred(on,1),var(1)))",
+        "rule_body(causal(2),s(pred(off,1),var(1)))",
+        "rule_body(static(1),s(pred(off,1),var(1)))",
+        "rule_body(static(1),s(pred(on,1),var(1)))",
+        "init(s(pred(on,1),obj(a)))",
+        "num_incorrect(0)",
+        "other(1,2)",
+        "rule_head(1)",
+    ]
+]
+symbols.append(Number(3))
+
+
+class TestInterpretation(TestCase):
+    """
+    Test cases for decoding models into unified interpretations.
+    """
+
+    def test_decode(self) -> None:
+        """
+        Test grouping symbols by signature.
+        """
+        interpretation = decode(symbols)
+        self.assertEqual([str(s) for s in interpretation["obj"][1]], ["obj(a)"])
+        self.assertEqual(len(interpretation["isa"][2]), 4)
+        self.assertEqual(len(interpretation["rule_head"][2]), 3)
+        self.assertEqual(interpretation["exist"][1], [])
+        self.assertNotIn("other", interpretation)
+
+    def test_rules(self) -> None:
+        """
+        Test that rules are built from heads and the bodies of the same rule, in order.
+        """
+        self.assertEqual(
+            rules(decode(symbols)),
+            [
+                "s(pred(off,1),var(1)) ::- s(pred(on,1),var(1))",
+                "s(pred(on,1),var(1)) :- s(pred(off,1),var(1)), s(pred(on,1),var(1))",
+                "s(pred(on,1),var(1)) ::- s(pred(off,1),var(1))",
+            ],
+        )
+        self.assertEqual(rules(decode([parse_term("rule_head(static(1),s(p,x))")])), ["s(p,x) :- "])
+
+    def test_format(self) -> None:
+        """
+        Test formatting of an interpretation.
+        """
+        interpretation = decode(symbols)
+        lines = format_interpretation(interpretation, rules(interpretation), 5).splitlines()
+        self.assertEqual(
+            lines[1], "Found unified interpretation with cost 5. Number of incorrectly predicted hidden states: 0."
+        )
+        self.assertEqual(lines[lines.index("Objects:") + 1], "obj(a):sensor")
+        self.assertEqual(lines[lines.index("Predicates:") + 1], "pred(on,1):sensor pred(off,1):sensor")
+        self.assertEqual(lines[lines.index("Initial State:") + 1], "s(pred(on,1),obj(a))")
+        self.assertEqual(lines[lines.index("Rules:") + 1], "s(pred(off,1),var(1)) ::- s(pred(on,1),var(1))")
+
+    def test_serialize(self) -> None:
+        """
+        Test serializing an interpretation.
+        """
+        interpretation = decode(symbols)
+        serialized = serialize(interpretation, rules(interpretation), 5, 1.5)
+        self.assertEqual(serialized["type"], {1: ["type(sensor)"]})
+        self.assertEqual(serialized["cost"], 5)
+        self.assertEqual(serialized["time"], 1.5)
+        self.assertEqual(len(serialized["rules"]), 3)
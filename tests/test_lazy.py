@@ -0,0 +1,117 @@
+"""
+Test cases for checking rules lazily with a propagator.
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Tuple
+from unittest import TestCase
+
+from clingo import Control, Model
+
+from apperception_clingo.grounding import GroundCache, asp_files_dir, ground, meta_interpreters
+from apperception_clingo.lazy import Atom, Index, RulePropagator, matches
+
+instance_file = Path("tests", "data", "search", "alternating.lp")
+
+frame = {
+    "gen_types": 0,
+    "gen_objs": 1,
+    "gen_unary_preds": 1,
+    "gen_binary_preds": 0,
+    "gen_vars": 2,
+    "causal_max": 2,
+    "static_max": 1,
+    "rule_body_size_max": 2,
+}
+
+
+def files(interpreter: str) -> List[str]:
+    """
+    Return the files of the alternating instance with the given meta-interpreter.
+    """
+    return [str(instance_file), str(asp_files_dir / "search" / "core.lp"), str(meta_interpreters[interpreter])]
+
+
+class TestLazy(TestCase):
+    """
+    Test cases for checking rules lazily with a propagator.
+    """
+
+    def optimum(self, ctl: Control) -> Tuple[int, int]:
+        """
+        Solve the control and return the optimal cost and the number of optimal models.
+        """
+        costs: List[int] = []
+
+        def on_model(model: Model) -> None:
+            if model.optimality_proven:
+                costs.append(model.cost[0])
+
+        ctl.solve(on_model=on_model)
+        return costs[0], len(costs)
+
+    def test_matches(self) -> None:
+        """
+        Test joining the body atoms of a rule with the atoms holding.
+        """
+        # variables 0 and 1, predicates 2 and 3 and objects 4 to 6
+        index: Index = {2: {(5,), (6,)}, 3: {(4, 5), (5, 5), (6, 4)}}
+        body = [(3, (0, 1)), (2, (1,))]
+        self.assertEqual(
+            sorted(sorted(subs.items()) for subs in matches(body, index)), [[(0, 4), (1, 5)], [(0, 5), (1, 5)]]
+        )
+        self.assertEqual(list(matches([(3, (0, 0))], index)), [{0: 5}])
+        self.assertEqual(list(matches([(3, (0, 1))], index, {0: 6, 1: 5})), [])
+
+    def test_optimum(self) -> None:
+        """
+        Test that the lazy meta-interpreter has the same optimal models as the standard one.
+        """
+        args = ["--opt-mode=optN", "0"]
+        self.assertEqual(
+            self.optimum(ground(files("lazy"), frame, args)), self.optimum(ground(files("std"), frame, args))
+        )
+        self.assertEqual(
+            self.optimum(ground(files("lazy"), frame, [*args, "--parallel-mode=2"]))[0],
+            self.optimum(ground(files("std"), frame, args))[0],
+        )
+
+    def test_models(self) -> None:
+        """
+        Test that the lazy meta-interpreter has the same models as the standard one, ignoring their costs.
+        """
+        args = ["0", "--opt-mode=ignore"]
+        counts = []
+        for interpreter in ("std", "lazy"):
+            models: List[Model] = []
+            ground(files(interpreter), frame, args).solve(on_model=models.append)
+            counts.append(len(models))
+        self.assertEqual(counts, [256, 256])
+
+    def test_unfounded(self) -> None:
+        """
+        Test the loop nogood of an atom holding at the initial time step that is not an init atom.
+        """
+        # pylint: disable=protected-access
+        propagator = RulePropagator()
+        # atom 0 over predicate 0 and object 1, and variable 9
+        atom: Atom = (0, (1,))
+        unground: Atom = (0, (9,))
+        propagator._hold = {1: {atom: 2}, 2: {atom: 3}}
+        propagator._init = {atom: 4}
+        propagator._init_times = {1}
+        propagator._slots = [(False, 5, [(unground, 6)], [(unground, 7)]), (True, 8, [], [])]
+        assigned = {2, 3, -4, 5, 6, 7}
+        rules = propagator._rules(assigned)
+        possible = {1: {atom}, 2: {atom}}
+        self.assertEqual(list(propagator._unfounded(assigned, rules, possible, 1)), [[2, -4, -8]])
+        self.assertEqual(list(propagator._unfounded(assigned, rules, possible, 2)), [])
+
+    def test_cache(self) -> None:
+        """
+        Test that programs of the lazy meta-interpreter are not cached.
+        """
+        with TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                ground(files("lazy"), frame, [], cache=GroundCache(Path(tmp)))
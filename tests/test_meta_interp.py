@@ -9,9 +9,14 @@ from unittest import TestCase
 from clingo import Control
 from clingo.symbol import parse_term
 
+from apperception_clingo.grounding import ground
+from apperception_clingo.lazy import RulePropagator
+
 encoding_dir = Path("src", "apperception_clingo", "asp", "meta-int")
 meta_test_dir = Path("tests", "data", "meta-interpreter")
 
+DEFINED = "#defined exist/1."
+
 # Note to self: nice way of getting answer set hold/2 as a list of strings,
 # sorted by time point:
 
@@ -37,19 +42,29 @@ class TestMeta(TestCase):
             encoding_dir / "body-decoupled" / "meta-tight.lp",
             encoding_dir / "body-decoupled" / "meta-tight-reach.lp",
             encoding_dir / "standard" / "meta.lp",
+            encoding_dir / "lazy" / "meta.lp",
         ],
         clingo_args: List[str] = clingo_args,
     ) -> None:
         """
         Assert that a model's set of atoms equal a set of atoms, or unsat.
         """
-        for interpreter in meta_interpreters:
-            with self.subTest(interpreter=interpreter.name):
-                ctl = Control(clingo_args)
-                ctl.load(str(interpreter))
-                ctl.load(str(input_file))
-                ctl.add("#defined exist/1.")
-                ctl.ground()
+        for interpreter, tables in [(i, False) for i in meta_interpreters] + [
+            (i, True) for i in meta_interpreters if i.parent.name == "standard"
+        ]:
+            with self.subTest(interpreter=interpreter.name, tables=tables):
+                if tables:
+                    # the substitution groups are given by the table the grounding generates
+                    ctl = ground([str(interpreter), str(input_file)], {"gen_vars": 0}, clingo_args, program=DEFINED)
+                    self.assertTrue(any(ctl.symbolic_atoms.by_signature("subs_tables", 0)))
+                else:
+                    ctl = Control(clingo_args)
+                    if interpreter.parent.name == "lazy":
+                        ctl.register_propagator(RulePropagator())
+                    ctl.load(str(interpreter))
+                    ctl.load(str(input_file))
+                    ctl.add(DEFINED)
+                    ctl.ground()
                 with ctl.solve(yield_=True) as handle:
                     if result is not False:
                         expected = set(parse_term(s) for s in result)
@@ -93,6 +108,7 @@ class TestMeta(TestCase):
             meta_interpreters=[
                 encoding_dir / "body-decoupled" / "meta.lp",
                 encoding_dir / "standard" / "meta.lp",
+                encoding_dir / "lazy" / "meta.lp",
             ],
         )
 
@@ -106,9 +122,19 @@ class TestMeta(TestCase):
             meta_interpreters=[
                 encoding_dir / "body-decoupled" / "meta.lp",
                 encoding_dir / "standard" / "meta.lp",
+                encoding_dir / "lazy" / "meta.lp",
             ],
         )
 
+    def test_static_vacuous(self) -> None:
+        """
+        Test that a static rule does not hold for a substitution leaving out a variable of its body.
+        """
+        self.assertModelEqual(
+            meta_test_dir / "static-vacuous.lp",
+            ["hold(s(pred(p',1),obj(a)),1)", "hold(s(pred(r',1),obj(a)),1)"],
+        )
+
     def test_causal(self) -> None:
         """
         Test the interpreter on a simple causal program.
@@ -0,0 +1,105 @@
+"""
+Test cases for solving frames in worker processes.
+"""
+
+import math
+import multiprocessing
+import queue
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import patch
+
+from apperception_clingo.budget import Budget, solve
+from apperception_clingo.parallel import FrameTask, ModelMessage, init_worker, solve_frame
+
+from .fixtures import files, frame
+
+
+class TestParallel(TestCase):
+    """
+    Test cases for solving frames in worker processes.
+    """
+
+    def setUp(self) -> None:
+        """
+        Initialize the worker with no best cost found yet.
+        """
+        self.best_cost = multiprocessing.Value("d", math.inf)
+        self.models: "multiprocessing.Queue[ModelMessage]" = multiprocessing.Queue()
+        init_worker(self.best_cost, self.models, 0.0)
+
+    def test_solve_frame(self) -> None:
+        """
+        Test that improving models are reported and update the shared best cost.
+        """
+        index, times = solve_frame(FrameTask(3, files, frame, Budget()))
+        self.assertEqual(index, 3)
+        self.assertLessEqual(times["ground_end"], times["solve_end"])
+        self.assertEqual(self.best_cost.value, 5)
+        costs = []
+        while True:
+            try:
+                model_index, symbols, cost, _ = self.models.get(timeout=1)
+            except queue.Empty:
+                break
+            self.assertEqual(model_index, 3)
+            self.assertIn("init(s(pred(on,1),obj(a)))", symbols)
+            costs.append(cost)
+        self.assertEqual(costs[-1], 5)
+        self.assertEqual(times["status"], "optimal")
+        self.assertEqual(times["best_cost"], 5)
+
+    def test_solve_frame_bounded(self) -> None:
+        """
+        Test that no model is reported if the shared best cost cannot be improved on.
+        """
+        self.best_cost.value = 5
+        solve_frame(FrameTask(0, files, frame, Budget()))
+        self.assertEqual(self.best_cost.value, 5)
+        self.assertTrue(self.models.empty())
+
+    def test_solve_frame_solver_args(self) -> None:
+        """
+        Test solving a frame with core-guided optimization.
+        """
+        _, result = solve_frame(
+            FrameTask(0, files, frame, Budget(), solver_args=["--opt-strategy=usc", "--configuration=crafty"])
+        )
+        self.assertEqual(result["status"], "optimal")
+        self.assertEqual(result["best_cost"], 5)
+
+    def test_solve_frame_hints(self) -> None:
+        """
+        Test warm starting a frame with a model.
+        """
+        hints = ["init(s(pred(on,1),obj(a)))", "rule_head(causal(1),s(pred(off,1),var(1)))"]
+        _, result = solve_frame(FrameTask(0, files, frame, Budget(), solver_args=["--heuristic=Domain"], hints=hints))
+        self.assertEqual(result["best_cost"], 5)
+
+    def test_solve_frame_interrupted(self) -> None:
+        """
+        Test that a frame running out of budget is reported as interrupted.
+        """
+        _, result = solve_frame(FrameTask(0, files, frame, Budget(time=10, conflicts=0)))
+        self.assertEqual(result["status"], "interrupted")
+        self.assertIsNone(result["best_cost"])
+        self.assertGreater(result["statistics"]["rules"], 0)
+        self.assertIn("solve_memory", result["statistics"])
+
+    def test_solve_frame_restarted(self) -> None:
+        """
+        Test that the conflicts spent before solving is restarted count against the budget.
+        """
+        budgets: List[Budget] = []
+
+        def cancel_first(*args: Any, **kwargs: Any) -> str:
+            budgets.append(args[2])
+            status = solve(*args, **kwargs)
+            return "cancelled" if len(budgets) == 1 else status
+
+        with patch("apperception_clingo.parallel.solve", cancel_first):
+            _, result = solve_frame(FrameTask(0, files, frame, Budget(conflicts=100)))
+        self.assertEqual(budgets[0].conflicts, 100)
+        spent = 100 - (budgets[1].conflicts or 0)
+        self.assertGreater(spent, 0)
+        self.assertGreater(result["statistics"]["conflicts"], spent)
@@ -0,0 +1,56 @@
+"""
+Test cases for profiling the ground programs of frames.
+"""
+
+from pathlib import Path
+from unittest import TestCase
+
+from apperception_clingo.grounding import ground
+from apperception_clingo.profiling import GroundingProfiler, defining_files
+
+from .fixtures import files, frame
+
+defined_file = Path("tests", "data", "profiling", "defined.lp")
+
+
+class TestProfiling(TestCase):
+    """
+    Test cases for profiling the ground programs of frames.
+    """
+
+    def test_defining_files(self) -> None:
+        """
+        Test that predicates are attributed to the files with rules whose head contains them, but not to files using
+        them in conditions only.
+        """
+        defined = defining_files((str(defined_file),))
+        self.assertEqual(sorted(defined), ["-b/1", "a/0", "c/1", "d/1", "e/1", "f/1", "g/0", "q/1"])
+        self.assertEqual(defined["d/1"], [str(defined_file)])
+        defined = defining_files(tuple(files))
+        self.assertEqual(defined["hold_body/3"], ["meta-int/standard/meta.lp"])
+        self.assertIn("meta-int/common/definitions.lp", defined["hold/2"])
+
+    def test_profile(self) -> None:
+        """
+        Test counting the ground atoms and rules of the predicates of a small program.
+        """
+        profiler = GroundingProfiler()
+        ctl = ground([str(defined_file)], {}, [], observer=profiler)
+        profile = {row["predicate"]: row for row in profiler.profile(ctl, [str(defined_file)])}
+        self.assertEqual(profile["c/1"], {"predicate": "c/1", "files": [str(defined_file)], "atoms": 2, "rules": 2})
+        self.assertEqual(profile["e/1"]["rules"], 1)
+        self.assertEqual(profile["#false"]["files"], [])
+        self.assertGreater(profile["#false"]["rules"], 0)
+        self.assertEqual(profile["g/0"]["atoms"], 1)
+
+    def test_profile_frame(self) -> None:
+        """
+        Test that the profile of a frame is ranked by the number of rules and atoms.
+        """
+        profiler = GroundingProfiler()
+        ctl = ground(files, frame, [], observer=profiler)
+        profile = profiler.profile(ctl, files)
+        ranks = [(row["rules"], row["atoms"]) for row in profile]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        self.assertIn("hold/2", [row["predicate"] for row in profile[:5]])
+        self.assertGreater(sum(row["atoms"] for row in profile), 0)
@@ -0,0 +1,140 @@
+"""
+Test cases for racing meta-interpreters on frames.
+"""
+
+import io
+import math
+import multiprocessing
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory, TemporaryFile
+from typing import Any, Dict, Iterator, List, Tuple
+from unittest import TestCase
+
+from apperception_clingo.budget import Budget
+from apperception_clingo.parallel import FrameTask, ModelMessage
+from apperception_clingo.racing import (
+    Race,
+    RaceTable,
+    Racing,
+    frame_features,
+    instance_objects,
+    race_frame,
+    race_worker,
+)
+
+from .fixtures import asp_dir, frame, instance_file
+
+base_files = [str(instance_file), str(asp_dir / "search" / "core.lp")]
+
+racers = {
+    "std": ([*base_files, str(asp_dir / "meta-int" / "standard" / "meta.lp")], []),
+    "bd-tight": ([*base_files, str(asp_dir / "meta-int" / "body-decoupled" / "meta-tight.lp")], ["--opt-strategy=usc"]),
+}
+
+
+@contextmanager
+def captured_stderr() -> Iterator[io.StringIO]:
+    """
+    Capture the standard error of the process and of the processes it starts, including the output of clingo, and
+    return it once capturing ends.
+    """
+    output = io.StringIO()
+    saved = os.dup(2)
+    with TemporaryFile("w+", encoding="utf-8") as captured:
+        os.dup2(captured.fileno(), 2)
+        try:
+            yield output
+        finally:
+            os.dup2(saved, 2)
+            os.close(saved)
+            captured.seek(0)
+            output.write(captured.read())
+
+
+class TestRacing(TestCase):
+    """
+    Test cases for racing meta-interpreters on frames.
+    """
+
+    def test_features(self) -> None:
+        """
+        Test the features of frames.
+        """
+        self.assertEqual(instance_objects([str(instance_file)]), 1)
+        self.assertEqual(frame_features(frame, 1), (1, 1, 1))
+        self.assertEqual(frame_features({**frame, "gen_objs": 2, "gen_vars": 3}, 1), (3, 3, 1))
+
+    def test_race_table(self) -> None:
+        """
+        Test selecting the meta-interpreter that won most races on similar frames, and persisting the table.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "races.json")
+            table = RaceTable(path)
+            self.assertIsNone(table.select((1, 1, 1), ["std", "bd"]))
+            table.record((1, 1, 1), "std")
+            table.record((1, 2, 1), "bd")
+            table.record((1, 2, 1), "bd")
+            table = RaceTable(path)
+        self.assertEqual(table.wins, {(1, 1, 1): {"std": 1}, (1, 2, 1): {"bd": 2}})
+        self.assertEqual(table.select((1, 1, 1), ["std", "bd"]), "bd")
+        self.assertEqual(table.select((0, 1, 1), ["std", "bd"]), "std")
+        self.assertIsNone(table.select((0, 1, 1), ["bd-tight"]))
+        self.assertIsNone(table.select((3, 3, 3), ["std", "bd"]))
+
+    def test_racing(self) -> None:
+        """
+        Test racing all meta-interpreters on a frame unless one of them won races on similar frames.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "races.json")
+            racing = Racing(["std", "bd"], path)
+            racing.load([str(instance_file)])
+            self.assertEqual(racing.racers(frame), ((1, 1, 1), ["std", "bd"]))
+            racing.table.record((1, 1, 1), "bd")
+            racing.load([str(instance_file)])
+        self.assertEqual(racing.racers(frame), ((1, 1, 1), ["bd"]))
+
+    def test_race_worker(self) -> None:
+        """
+        Test solving a frame as a racer in process.
+        """
+        best_cost = multiprocessing.Value("d", math.inf)
+        models: "multiprocessing.SimpleQueue[ModelMessage]" = multiprocessing.SimpleQueue()
+        results: "multiprocessing.SimpleQueue[Tuple[str, Dict[str, Any]]]" = multiprocessing.SimpleQueue()
+        race_worker(Race(best_cost, models, results, 0.0), "std", FrameTask(0, racers["std"][0], frame, Budget()))
+        name, result = results.get()
+        self.assertEqual(name, "std")
+        self.assertEqual(result["status"], "optimal")
+        self.assertEqual(best_cost.value, 5)
+        self.assertFalse(models.empty())
+
+    def test_race_frame(self) -> None:
+        """
+        Test that the first meta-interpreter to search the frame completely wins, and that models are received.
+        """
+        received: List[ModelMessage] = []
+        name, result = race_frame(FrameTask(2, [], frame, Budget()), racers, received.append, 0.0)
+        self.assertIn(name, racers)
+        self.assertIn(result["status"], ["optimal", "unsatisfiable"])
+        self.assertEqual(received[-1][0], 2)
+        self.assertEqual(received[-1][2], 5)
+        name, result = race_frame(
+            FrameTask(2, [], frame, Budget()), {"bd-tight": racers["bd-tight"]}, received.append, 0.0, 5
+        )
+        self.assertEqual((name, result["status"], result["best_cost"]), ("bd-tight", "unsatisfiable", None))
+
+    def test_race_frame_interrupted(self) -> None:
+        """
+        Test that the racer with the best cost is returned if no racer searches the frame completely, and that racers
+        failing are reported.
+        """
+        received: List[ModelMessage] = []
+        name, result = race_frame(FrameTask(0, [], frame, Budget(conflicts=0)), racers, received.append, 0.0)
+        self.assertIn(name, racers)
+        self.assertEqual(result["status"], "interrupted")
+        with captured_stderr() as stderr, self.assertRaises(RuntimeError):
+            race_frame(FrameTask(0, [], frame, Budget()), {"std": (["missing.lp"], [])}, received.append, 0.0)
+        self.assertIn("missing.lp", stderr.getvalue())
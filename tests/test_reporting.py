@@ -0,0 +1,84 @@
+"""
+Test cases for reporting the unified interpretations found.
+"""
+
+import io
+from contextlib import redirect_stdout
+from typing import List, Tuple
+from unittest import TestCase
+
+from clingo.symbol import Symbol, parse_term
+
+from apperception_clingo.interpretation import decode, rules, serialize
+from apperception_clingo.reporting import ModelReporter
+from apperception_clingo.stats import SerializedInterpretation
+
+
+def model(pred: str) -> List[Symbol]:
+    """
+    Return the shown symbols of a model with the given initial predicate.
+    """
+    return [parse_term(s) for s in [f"init(s(pred({pred},1),obj(a)))", "num_incorrect(0)"]]
+
+
+class TestReporting(TestCase):
+    """
+    Test cases for reporting the unified interpretations found.
+    """
+
+    def setUp(self) -> None:
+        self.records: List[Tuple[int, int]] = []
+
+    def record(self, index: int, serialized: SerializedInterpretation) -> None:
+        """
+        Record the index and cost of a reported model.
+        """
+        self.records.append((index, serialized["cost"]))
+
+    def test_final_overall(self) -> None:
+        """
+        Test that the best model is output once the search is over, even if frames finish out of cost order.
+        """
+        reporter = ModelReporter(self.record, "final-overall")
+        # frame 0 finds a model of cost 5, frame 1 improves on it and finishes first
+        reporter.add((model("on"), 5, 1.0, 0))
+        reporter.add((model("off"), 3, 2.0, 1))
+        with redirect_stdout(io.StringIO()) as out:
+            reporter.report()
+            self.assertEqual(self.records, [])
+            reporter.finish(1)
+            reporter.finish(0)
+        self.assertEqual(out.getvalue(), "")
+        self.assertEqual(self.records, [(1, 3), (0, 5)])
+        self.assertIsNotNone(reporter.final_output)
+        self.assertIn("cost 3.", str(reporter.final_output))
+        self.assertIn("s(pred(off,1),obj(a))", str(reporter.final_output))
+
+    def test_restore(self) -> None:
+        """
+        Test that the best model of an earlier run is output unless a better one is found.
+        """
+        reporter = ModelReporter(self.record, "final-overall")
+        interpretation = decode(model("on"))
+        reporter.restore(serialize(interpretation, rules(interpretation), 4, 0.0))
+        self.assertIn("cost 4.", str(reporter.final_output))
+        reporter.add((model("off"), 6, 1.0, 0))
+        reporter.finish_all()
+        self.assertIn("cost 4.", str(reporter.final_output))
+        self.assertEqual(self.records, [(0, 6)])
+
+    def test_outputs(self) -> None:
+        """
+        Test printing every model or the last model of each frame.
+        """
+        for output, printed in [("all", 2), ("final-per-frame", 1), ("none", 0)]:
+            with self.subTest(output=output):
+                self.records = []
+                reporter = ModelReporter(self.record, output)
+                with redirect_stdout(io.StringIO()) as out:
+                    reporter.add((model("on"), 5, 1.0, 0))
+                    reporter.add((model("off"), 3, 2.0, 0))
+                    reporter.finish(0)
+                self.assertEqual(out.getvalue().count("Found unified interpretation"), printed)
+                self.assertEqual(self.records, [(0, 5), (0, 3)] if output == "all" else [(0, 3)])
+                self.assertIsNone(reporter.final_output)
@@ -0,0 +1,75 @@
+"""
+Test cases for the search encodings.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest import TestCase
+
+from clingo import Control
+from clingo.symbol import Function, Number, String
+
+from . import fixtures
+from .fixtures import search_test_dir
+
+search_dir = Path("src", "apperception_clingo", "asp", "search")
+encoding_dir = Path("src", "apperception_clingo", "asp", "meta-int")
+
+frame = {**fixtures.frame, "gen_objs": 1}
+
+ceiling = {
+    "gen_types": 1,
+    "gen_objs": 2,
+    "gen_unary_preds": 1,
+    "gen_binary_preds": 1,
+    "gen_vars": 2,
+    "causal_max": 3,
+    "static_max": 1,
+    "rule_body_size_max": 2,
+}
+
+
+def const_args(consts: Dict[str, int]) -> List[str]:
+    """
+    Return the command line arguments setting the given constants.
+    """
+    args = []
+    for const, val in consts.items():
+        args.extend(["-c", f"{const}={val}"])
+    return args
+
+
+class TestSearch(TestCase):
+    """
+    Test cases for the search encodings.
+    """
+
+    def optimum(self, ctl: Control) -> Optional[int]:
+        """
+        Return the optimal cost of the program grounded in the control, or None if it is unsatisfiable.
+        """
+        costs: List[int] = []
+        ctl.solve(on_model=lambda model: costs.append(model.cost[0]))
+        return costs[-1] if costs else None
+
+    def test_incremental(self) -> None:
+        """
+        Test that switching on a frame via externals yields the same optimum as grounding the frame.
+        """
+        for interpreter in [encoding_dir / "standard" / "meta.lp", encoding_dir / "body-decoupled" / "meta-tight.lp"]:
+            with self.subTest(interpreter=interpreter.name):
+                ctl = Control(["--opt-mode=opt"] + const_args(frame))
+                for f in [search_test_dir / "alternating.lp", search_dir / "core.lp", interpreter]:
+                    ctl.load(str(f))
+                ctl.ground()
+                expected = self.optimum(ctl)
+                self.assertEqual(expected, 5)
+
+                ctl = Control(["--opt-mode=opt"] + const_args(ceiling))
+                for f in [search_test_dir / "alternating.lp", search_dir / "core-incremental.lp", interpreter]:
+                    ctl.load(str(f))
+                ctl.ground()
+                for const, ceil in ceiling.items():
+                    for val in range(1, ceil + 1):
+                        ctl.assign_external(Function("frame", [String(const), Number(val)]), val <= frame[const])
+                self.assertEqual(self.optimum(ctl), expected)
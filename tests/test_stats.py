@@ -0,0 +1,182 @@
+"""
+Test cases for the stats log.
+"""
+
+import io
+import json
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from clingo import Control
+
+from apperception_clingo.stats import StatsLog, StatsWriter, main, read_stats, solver_statistics
+
+frame = {"gen_types": 0, "gen_objs": 2}
+
+
+class TestStats(TestCase):
+    """
+    Test cases for the stats log.
+    """
+
+    def write_log(self, path: Path) -> None:
+        """
+        Write a log of two frames, where models of the second frame are found before the first frame ends.
+        """
+        log = StatsWriter(path)
+        log.write("frame_start", 0, frame=frame, time=0.5, solver_args=["--opt-strategy=usc"])
+        log.write("frame_start", 1, frame={**frame, "gen_objs": 4}, time=0.6, lower_bound=3)
+        log.write(
+            "ground_end",
+            1,
+            time=0.8,
+            statistics={"ground_memory": 10},
+            grounding_profile=[{"predicate": "hold/2", "files": ["meta-int/standard/meta.lp"], "atoms": 3, "rules": 4}],
+        )
+        log.write("model", 1, interpretation={"cost": 7, "time": 1.0})
+        log.write("model", 1, interpretation={"cost": 5, "time": 1.5})
+        log.write("ground_end", 0, time=1.0)
+        log.write("solve_end", 0, time=2.0, status="unsatisfiable", best_cost=None, budget={"time": 1.0})
+        log.sync()
+        log.write(
+            "solve_end",
+            1,
+            time=2.5,
+            status="optimal",
+            best_cost=5,
+            interpreter="std",
+            solver_args=["--configuration=crafty"],
+            statistics={"choices": 3},
+        )
+        log.close()
+
+    def test_read_stats(self) -> None:
+        """
+        Test that the nested stats are rebuilt from the log.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "log.jsonl")
+            self.write_log(path)
+            self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 8)
+            stats = read_stats(path)
+        self.assertEqual(
+            stats,
+            [
+                {
+                    "frame": frame,
+                    "unified_interpretations": [],
+                    "frame_start": 0.5,
+                    "solver_args": ["--opt-strategy=usc"],
+                    "ground_end": 1.0,
+                    "solve_end": 2.0,
+                    "status": "unsatisfiable",
+                    "best_cost": None,
+                    "budget": {"time": 1.0},
+                },
+                {
+                    "frame": {**frame, "gen_objs": 4},
+                    "unified_interpretations": [{"cost": 7, "time": 1.0}, {"cost": 5, "time": 1.5}],
+                    "frame_start": 0.6,
+                    "lower_bound": 3,
+                    "solver_args": ["--configuration=crafty"],
+                    "ground_end": 0.8,
+                    "grounding_profile": [
+                        {"predicate": "hold/2", "files": ["meta-int/standard/meta.lp"], "atoms": 3, "rules": 4}
+                    ],
+                    "solve_end": 2.5,
+                    "status": "optimal",
+                    "best_cost": 5,
+                    "interpreter": "std",
+                    "statistics": {"ground_memory": 10, "choices": 3},
+                },
+            ],
+        )
+
+    def test_replay(self) -> None:
+        """
+        Test that replaying rebuilt stats in another log or the same one rebuilds the same stats.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "log.jsonl")
+            self.write_log(path)
+            stats = read_stats(path)
+            stats.append({"frame": frame, "unified_interpretations": [], "frame_start": 3.0})
+            log = StatsWriter(Path(tmp, "replayed.jsonl"), stats)
+            log.close()
+            self.assertEqual(read_stats(Path(tmp, "replayed.jsonl")), stats)
+            # the records of the earlier log are on disk before the log is closed, with the same events
+            log = StatsWriter(path, stats)
+            self.assertEqual(read_stats(path), stats)
+            records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(records[-2]["statistics"], {"choices": 3})
+            self.assertEqual(records[-2]["solver_args"], ["--configuration=crafty"])
+            self.assertEqual(records[4]["statistics"], {"ground_memory": 10})
+            log.write("frame_start", 3, frame=frame, time=4.0)
+            log.close()
+            self.assertEqual(len(read_stats(path)), 4)
+            self.assertEqual(sorted(path.parent.iterdir()), [path, Path(tmp, "replayed.jsonl")])
+
+    def test_stats_log(self) -> None:
+        """
+        Test that the log is only written if a path is given, starting with the records of the given stats.
+        """
+        log = StatsLog()
+        log.open()
+        log.write("frame_start", 0, frame=frame, time=0.5)
+        log.close()
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "log.jsonl")
+            self.write_log(path)
+            log = StatsLog(path)
+            log.open(read_stats(path)[:1])
+            log.write("frame_start", 1, frame=frame, time=3.0)
+            log.write("solve_end", 1, time=4.0, status="optimal", best_cost=3)
+            self.assertEqual([stat["best_cost"] for stat in read_stats(path)], [None, 3])
+            log.close()
+            log.close()
+
+    def test_invalid_event(self) -> None:
+        """
+        Test that unknown events are rejected.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "log.jsonl")
+            log = StatsWriter(path)
+            log.write("frame_end", 0)
+            log.close()
+            with self.assertRaises(ValueError):
+                read_stats(path)
+
+    def test_main(self) -> None:
+        """
+        Test writing the rebuilt stats as JSON.
+        """
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "log.jsonl")
+            self.write_log(path)
+            main([str(path), str(Path(tmp, "stats.json"))])
+            with Path(tmp, "stats.json").open(encoding="utf-8") as f:
+                self.assertEqual(json.load(f), read_stats(path))
+            out = io.StringIO()
+            with redirect_stdout(out):
+                main([str(path)])
+            self.assertEqual(json.loads(out.getvalue()), read_stats(path))
+            with self.assertRaises(ValueError):
+                main([])
+
+    def test_solver_statistics(self) -> None:
+        """
+        Test extracting the statistics of the last solve call.
+        """
+        ctl = Control()
+        ctl.add("base", [], "{ a; b }. :- a, b. :- not a, not b.")
+        ctl.ground()
+        ctl.solve()
+        statistics = solver_statistics(ctl)
+        self.assertEqual(statistics["rules"], 3)
+        choices, solve_time, sat_time = statistics["choices"], statistics["solve_time"], statistics["sat_time"]
+        assert choices is not None and solve_time is not None and sat_time is not None
+        self.assertGreaterEqual(choices, 0)
+        self.assertGreaterEqual(solve_time, sat_time)
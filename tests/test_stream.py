@@ -0,0 +1,92 @@
+"""
+Test cases for streaming observations into the engine.
+"""
+
+import socket
+from contextlib import suppress
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from apperception_clingo.stream import open_stream, parse_observation, time_steps
+from apperception_clingo.window import TimedInstance
+
+lines = [
+    "% comment",
+    "senses(s(pred(on,1),obj(a)),1).",
+    '{"senses": "s(pred(off,1),obj(a))", "time": 2}',
+    "",
+    '{"hidden": "s(pred(on,1),obj(a))", "time": 4}',
+    "senses(s(pred(off,1),obj(a)),4).",
+]
+
+
+class TestStream(TestCase):
+    """
+    Test cases for streaming observations into the engine.
+    """
+
+    def test_parse_observation(self) -> None:
+        """
+        Test parsing observations given as JSON objects or ASP facts, and rejecting other lines.
+        """
+        self.assertEqual(
+            [str(parse_observation(line)) for line in lines],
+            [
+                "None",
+                "senses(s(pred(on,1),obj(a)),1)",
+                "senses(s(pred(off,1),obj(a)),2)",
+                "None",
+                "hidden(s(pred(on,1),obj(a)),4)",
+                "senses(s(pred(off,1),obj(a)),4)",
+            ],
+        )
+        for line in ["obj(a).", "senses(a,b).", '{"obj": "a", "time": 1}', '{"senses": "a"}']:
+            with self.subTest(line=line):
+                self.assertRaises(ValueError, parse_observation, line)
+
+    def test_time_steps(self) -> None:
+        """
+        Test that time steps are yielded once complete, and that observations of completed time steps are rejected.
+        """
+        instance = TimedInstance([], {})
+        steps = time_steps(instance, lines)
+        self.assertEqual(next(steps), 1)
+        self.assertEqual(list(instance.timed), [1])
+        self.assertEqual(list(steps), [2, 3, 4])
+        self.assertEqual(len(instance.timed[4]), 2)
+        instance = TimedInstance([], {5: []})
+        self.assertEqual(list(time_steps(instance, lines[:2])), [1, 2, 3, 4, 5])
+        self.assertRaises(ValueError, list, time_steps(TimedInstance([], {}), lines[2:] + lines[1:2]))
+
+    def test_open_stream(self) -> None:
+        """
+        Test reading observations from the standard input and a Unix socket.
+        """
+        with patch("sys.stdin", StringIO("\n".join(lines))):
+            with open_stream("-") as stream:
+                self.assertEqual(len(stream.readlines()), len(lines))
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "stream.sock")
+            received: List[str] = []
+
+            def read() -> None:
+                with open_stream(str(path)) as stream:
+                    received.extend(stream)
+
+            reader = Thread(target=read)
+            reader.start()
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                # the reader may not listen yet
+                while True:
+                    with suppress(FileNotFoundError, ConnectionRefusedError):
+                        client.connect(str(path))
+                        break
+                client.sendall("\n".join(lines).encode("utf-8"))
+            reader.join()
+            self.assertEqual(len(received), len(lines))
+            self.assertFalse(path.exists())
@@ -0,0 +1,121 @@
+"""
+Test cases for detecting and breaking symmetries of instances.
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Optional, Tuple
+from unittest import TestCase
+from unittest.mock import patch
+
+from clingo import Control, Model, parse_term
+
+from apperception_clingo.grounding import asp_files_dir, ground, meta_interpreters
+from apperception_clingo.symmetry import _Graph, instance_facts, lex_leader_program, symmetries
+
+twins_file = Path("tests", "data", "symmetry", "twins.lp")
+
+triplets = [
+    "obj(a). obj(b). obj(c).",
+    "senses(s(pred(on,1),(obj(a);obj(b);obj(c))),1).",
+    "senses(s(pred(p,1),obj(a)),1). senses(s(pred(q,1),obj(a)),1).",
+]
+
+frame = {
+    "gen_types": 0,
+    "gen_objs": 0,
+    "gen_unary_preds": 0,
+    "gen_binary_preds": 1,
+    "gen_vars": 2,
+    "causal_max": 2,
+    "static_max": 1,
+    "rule_body_size_max": 1,
+}
+
+
+class TestSymmetry(TestCase):
+    """
+    Test cases for detecting and breaking symmetries of instances.
+    """
+
+    def test_symmetries(self) -> None:
+        """
+        Test detecting the permutations of objects and predicates mapping the facts onto themselves.
+        """
+        self.assertEqual(
+            [
+                {str(key): str(val) for key, val in permutation.items()}
+                for permutation in symmetries(instance_facts([str(twins_file)]))
+            ],
+            [{"obj(a)": "obj(b)", "obj(b)": "obj(a)"}],
+        )
+        self.assertEqual(symmetries(instance_facts([str(Path("tests", "data", "search", "alternating.lp"))])), [])
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "instance.lp")
+            path.write_text("\n".join(triplets), encoding="utf-8")
+            facts = instance_facts([str(path)])
+        permutations = symmetries(facts)
+        moved = sorted(sorted(str(key) for key in permutation) for permutation in permutations)
+        self.assertEqual(moved, [["obj(b)", "obj(c)"], ["pred(p,1)", "pred(q,1)"]])
+        # the search for a symmetry moving objects gives up before the predicates are individualized
+        with patch("apperception_clingo.symmetry.SEARCH_LIMIT", 1):
+            self.assertEqual(
+                [sorted(str(key) for key in permutation) for permutation in symmetries(facts)],
+                [["pred(p,1)", "pred(q,1)"]],
+            )
+
+    def test_graph(self) -> None:
+        """
+        Test that automorphisms are checked, and not searched between vertices that refinement tells apart.
+        """
+        graph = _Graph()
+        vertices = [graph.add_vertex(parse_term("v")) for _ in range(9)]
+        for cycle in [vertices[:6], vertices[6:]]:
+            for vertex, other in zip(cycle, cycle[1:] + cycle[:1]):
+                graph.add_edge(vertex, other)
+        self.assertTrue(graph.is_automorphism([1, 2, 3, 4, 5, 0, 6, 7, 8]))
+        self.assertFalse(graph.is_automorphism([1, 0, 2, 3, 4, 5, 6, 7, 8]))
+        automorphisms = graph.automorphisms(vertices)
+        self.assertTrue(all(graph.is_automorphism(permutation) for permutation in automorphisms))
+        self.assertFalse(any(permutation[0] >= 6 for permutation in automorphisms))
+
+    def test_lex_leader_program(self) -> None:
+        """
+        Test the positions moved by a symmetry, including initial atoms over generated predicates.
+        """
+        facts = instance_facts([str(twins_file)])
+        program = lex_leader_program(facts, symmetries(facts), frame).splitlines()
+        self.assertEqual(len(program), 8)
+        self.assertEqual(program[0], "sym_pair(0,1,init(s(pred(off,1),obj(a))),init(s(pred(off,1),obj(b)))).")
+        self.assertEqual(
+            program[-1], "sym_pair(0,8,init(s2(pred(1,2),obj(b),obj(b))),init(s2(pred(1,2),obj(a),obj(a))))."
+        )
+        self.assertEqual(lex_leader_program(facts, [], frame), "")
+
+    def optima(self, ctl: Control) -> Tuple[int, Optional[int]]:
+        """
+        Return the number of optimal models and the optimal cost of the control.
+        """
+        costs: List[Tuple[int, bool]] = []
+
+        def on_model(model: Model) -> None:
+            costs.append((model.cost[0], model.optimality_proven))
+
+        ctl.solve(on_model=on_model)
+        optimal = [cost for cost, proven in costs if proven]
+        return len(optimal), optimal[0] if optimal else None
+
+    def test_ground(self) -> None:
+        """
+        Test that breaking the symmetries of the instance keeps the optimum and drops symmetric optimal models.
+        """
+        facts = instance_facts([str(twins_file)])
+        program = lex_leader_program(facts, symmetries(facts), frame)
+        files = [str(twins_file), str(asp_files_dir / "search" / "core.lp"), str(meta_interpreters["bd-tight"])]
+        args = ["--opt-mode=optN", "0"]
+        count, cost = self.optima(ground(files, frame, args))
+        broken_count, broken_cost = self.optima(
+            ground([*files, str(asp_files_dir / "search" / "lex-leader.lp")], frame, args, program=program)
+        )
+        self.assertEqual(cost, broken_cost)
+        self.assertLess(broken_count, count)
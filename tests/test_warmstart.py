@@ -0,0 +1,54 @@
+"""
+Test cases for warm starting frames.
+"""
+
+from pathlib import Path
+from typing import List, Sequence
+from unittest import TestCase
+
+from clingo import Control, Model, Symbol
+
+from apperception_clingo.grounding import ground
+from apperception_clingo.warmstart import add_sign_hints, hint_signatures
+
+asp_dir = Path("src", "apperception_clingo", "asp")
+
+files = [
+    str(Path("tests", "data", "search", "alternating.lp")),
+    str(asp_dir / "search" / "core.lp"),
+    str(asp_dir / "meta-int" / "body-decoupled" / "meta-tight.lp"),
+]
+
+
+class TestWarmStart(TestCase):
+    """
+    Test cases for warm starting frames.
+    """
+
+    def models(self, ctl: Control) -> List[Sequence[Symbol]]:
+        """
+        Return the shown symbols of the models found while solving the control.
+        """
+        models: List[Sequence[Symbol]] = []
+
+        def on_model(model: Model) -> None:
+            models.append(model.symbols(shown=True))
+
+        ctl.solve(on_model=on_model)
+        return models
+
+    def test_add_sign_hints(self) -> None:
+        """
+        Test that the theory found in a smaller frame is found first in a bigger frame.
+        """
+        best = self.models(ground(files, {"causal_max": 2}, ["--opt-mode=opt"]))[-1]
+        theory = [symb for symb in best if any(symb.match(name, arity) for name, arity in hint_signatures)]
+        ctl = ground(files, {"causal_max": 3, "static_max": 2}, ["--opt-mode=opt", "--heuristic=Domain"])
+        hinted = add_sign_hints(ctl, best)
+        self.assertGreater(hinted, 0)
+        self.assertLessEqual(hinted, len(theory))
+        first = self.models(ctl)[0]
+        self.assertEqual(
+            sorted(str(s) for s in first if s.match("rule_head", 2) or s.match("rule_body", 2)),
+            sorted(str(s) for s in best if s.match("rule_head", 2) or s.match("rule_body", 2)),
+        )
@@ -0,0 +1,80 @@
+"""
+Test cases for learning theories on windows of the time horizon.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+from unittest import TestCase
+
+from clingo import Control, Model, Symbol
+
+from apperception_clingo.grounding import asp_files_dir, ground, meta_interpreters
+from apperception_clingo.window import TimedInstance, Windowing, read_instance, validate
+
+instance_file = Path("tests", "data", "search", "alternating_long.lp")
+
+frame = {"gen_vars": 1, "causal_max": 2}
+
+
+class TestWindow(TestCase):
+    """
+    Test cases for learning theories on windows of the time horizon.
+    """
+
+    def theory(self, ctl: Control) -> List[Symbol]:
+        """
+        Return the shown symbols of the optimal model of the control.
+        """
+        theory: List[Symbol] = []
+
+        def on_model(model: Model) -> None:
+            theory[:] = model.symbols(shown=True)
+
+        ctl.solve(on_model=on_model)
+        return theory
+
+    def test_read_instance(self) -> None:
+        """
+        Test splitting an instance by time step, and restricting it to windows.
+        """
+        instance = read_instance([str(instance_file)])
+        self.assertEqual(instance.horizon, 20)
+        self.assertEqual(sorted(instance.timed), list(range(1, 21)))
+        self.assertEqual(len(instance.facts), 8)
+        self.assertEqual(instance.chunks(5), [(1, 5), (5, 9), (9, 13), (13, 17), (17, 20)])
+        self.assertEqual(instance.chunks(30), [(1, 20)])
+        program = instance.program((5, 9))
+        self.assertIn("time(5..9).", program)
+        self.assertIn("#const first_time_point = 5. [override]", program)
+        self.assertIn("senses(s(pred(on,1),obj(a)),5).", program)
+        self.assertNotIn("senses(s(pred(off,1),obj(a)),4).", program)
+        self.assertEqual(TimedInstance([], {}).horizon, 1)
+
+    def test_windowing(self) -> None:
+        """
+        Test that learning on windows is enabled by a window size or a stream.
+        """
+        self.assertFalse(Windowing().enabled)
+        self.assertTrue(Windowing(5).enabled)
+        self.assertTrue(Windowing(stream="-").enabled)
+
+    def test_validate(self) -> None:
+        """
+        Test that a theory learned on the first window is validated chunk by chunk, and that a theory without rules
+        fails.
+        """
+        instance = read_instance([str(instance_file)])
+        for interpreter in ["std", "bd-tight"]:
+            with self.subTest(interpreter=interpreter):
+                files = [str(asp_files_dir / "search" / "core.lp"), str(meta_interpreters[interpreter])]
+                theory = self.theory(ground(files, frame, ["--opt-mode=opt"], program=instance.program((1, 5))))
+                state: Optional[List[Symbol]] = None
+                for window in instance.chunks(5):
+                    validation = validate(files, frame, instance, window, theory, state=state)
+                    assert validation is not None
+                    self.assertEqual(validation.num_incorrect, 0)
+                    state = validation.state
+                assert state is not None
+                self.assertEqual([str(atom) for atom in state], ["s(pred(off,1),obj(a))"])
+                static = [symb for symb in theory if not symb.match("rule_head", 2) and not symb.match("rule_body", 2)]
+                self.assertIsNone(validate(files, frame, instance, (1, 5), static))